@@ -1,26 +1,99 @@
 import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
 
-def linear_gradient_rgba(size, top_rgb, bottom_rgb):
-    """Create vertical linear gradient RGBA image."""
+def gradient_array(size, top_rgb, bottom_rgb) -> np.ndarray:
+    """Vertical linear gradient as an (h, w, 4) uint8 array, built in one pass."""
     w, h = size
-    top = np.array(top_rgb, dtype=np.float32)
-    bottom = np.array(bottom_rgb, dtype=np.float32)
-    arr = np.zeros((h, w, 4), dtype=np.uint8)
+    top = np.asarray(top_rgb, dtype=np.float32)
+    bottom = np.asarray(bottom_rgb, dtype=np.float32)
+    t = np.linspace(0.0, 1.0, h, dtype=np.float32)[:, None]
+    rows = (top * (1 - t) + bottom * t).astype(np.uint8)  # (h, 3)
 
-    for y in range(h):
-        t = y / (h - 1) if h > 1 else 0.0
-        rgb = (top * (1 - t) + bottom * t).astype(np.uint8)
-        arr[y, :, 0:3] = rgb
-        arr[y, :, 3] = 255
+    arr = np.empty((h, w, 4), dtype=np.uint8)
+    arr[:, :, 0:3] = rows[:, None, :]
+    arr[:, :, 3] = 255
+    return arr
 
-    return Image.fromarray(arr)
 
+def linear_gradient_rgba(size, top_rgb, bottom_rgb):
+    """Create vertical linear gradient RGBA image."""
+    return Image.fromarray(gradient_array(size, top_rgb, bottom_rgb))
+
+
+def _clip_region(dst: np.ndarray, src: np.ndarray, x: int, y: int):
+    """Views of dst/src where src (placed at x, y) overlaps dst and has alpha > 0."""
+    H, W = dst.shape[:2]
+    h, w = src.shape[:2]
+    x0, y0 = max(0, x), max(0, y)
+    x1, y1 = min(W, x + w), min(H, y + h)
+    if x0 >= x1 or y0 >= y1:
+        return None
+    patch = src[y0 - y:y1 - y, x0 - x:x1 - x]
+
+    # Shrink to the bounding box of visible pixels; transparent margins are free.
+    alpha = patch[..., 3]
+    rows = np.flatnonzero(alpha.any(axis=1))
+    if rows.size == 0:
+        return None
+    cols = np.flatnonzero(alpha.any(axis=0))
+    r0, r1, c0, c1 = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+    return dst[y0 + r0:y0 + r1, x0 + c0:x0 + c1], patch[r0:r1, c0:c1]
+
+
+def composite_over(dst: np.ndarray, src: np.ndarray, x: int = 0, y: int = 0) -> None:
+    """
+    Alpha-composite src (straight-alpha RGBA) over dst in place at (x, y).
+    Only the visible part of src is touched; no full-canvas copy is made.
+    Matches Image.alpha_composite.
+    """
+    clipped = _clip_region(dst, src, x, y)
+    if clipped is None:
+        return
+    region, patch = clipped
+
+    if region[..., 3].min() == 255:
+        # Opaque destination (e.g. the gradient): integer blend, exact /255 rounding.
+        a = patch[..., 3:4].astype(np.uint16)
+        acc = patch[..., 0:3] * a
+        acc += region[..., 0:3] * (255 - a)
+        acc += 128
+        acc += acc >> 8
+        acc >>= 8
+        region[..., 0:3] = acc
+        return
+
+    sa = patch[..., 3:4].astype(np.float32) * (1.0 / 255.0)
+    da = region[..., 3:4].astype(np.float32) * (1.0 / 255.0)
+    out_a = sa + da * (1.0 - sa)
+    rgb = patch[..., 0:3] * sa + region[..., 0:3] * (da * (1.0 - sa))
+    np.divide(rgb, out_a, out=rgb, where=out_a > 0)
+
+    region[..., 0:3] = np.clip(rgb + 0.5, 0, 255).astype(np.uint8)
+    region[..., 3:4] = np.clip(out_a * 255.0 + 0.5, 0, 255).astype(np.uint8)
+
+
+def paste_over(dst: np.ndarray, src: np.ndarray, x: int = 0, y: int = 0) -> None:
+    """
+    Copy src pixels with alpha > 0 into dst in place (ImageDraw fill semantics:
+    drawn pixels replace the canvas, they are not blended).
+    """
+    clipped = _clip_region(dst, src, x, y)
+    if clipped is None:
+        return
+    region, patch = clipped
+    np.copyto(region, patch, where=patch[..., 3:4] > 0)
 
+
+@lru_cache(maxsize=None)
 def load_font(size_px: int):
     # Linux default path; falls back to default bitmap font if missing.
     try:
@@ -53,34 +126,26 @@ def fit_center(image: Image.Image, canvas_size: int, fill_ratio: float = 0.82) -
     return canvas
 
 
-def add_badge(canvas: Image.Image, text="2", badge_ratio=0.12):
-    """Add red badge at top-right."""
-    W, H = canvas.size
-    out = canvas.copy()
-    d = ImageDraw.Draw(out)
-
+def badge_patch(W: int, H: int, text="2", badge_ratio=0.12):
+    """Render only the badge's bounding box; returns (rgba array, x, y)."""
     r = int(W * badge_ratio)  # badge radius
     cx = int(W * 0.86)
     cy = int(H * 0.16)
 
-    d.ellipse((cx - r, cy - r, cx + r, cy + r), fill=(220, 30, 30, 255))
+    side = 2 * r + 1
+    patch = Image.new("RGBA", (side, side), (0, 0, 0, 0))
+    d = ImageDraw.Draw(patch)
+    d.ellipse((0, 0, 2 * r, 2 * r), fill=(220, 30, 30, 255))
 
     font = load_font(int(r * 1.25))
     bbox = d.textbbox((0, 0), text, font=font)
     tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
-    d.text((cx - tw / 2, cy - th / 2 - int(H * 0.005)), text, fill=(255, 255, 255, 255), font=font)
-    return out
-
+    d.text((r - tw / 2, r - th / 2 - int(H * 0.005)), text, fill=(255, 255, 255, 255), font=font)
+    return np.asarray(patch), cx - r, cy - r
 
-def add_logout_arrow(canvas: Image.Image, arrow_center=(0.46, 0.57), arrow_scale=0.13):
-    """
-    Add a white 'exit' arrow overlay (kept minimal).
-    arrow_center is relative (x,y) on canvas.
-    """
-    W, H = canvas.size
-    out = canvas.copy()
-    d = ImageDraw.Draw(out)
 
+def logout_arrow_patch(W: int, H: int, arrow_center=(0.46, 0.57), arrow_scale=0.13):
+    """Render only the arrow's bounding box; returns (rgba array, x, y)."""
     cx = int(W * arrow_center[0])
     cy = int(H * arrow_center[1])
 
@@ -96,21 +161,80 @@ def add_logout_arrow(canvas: Image.Image, arrow_center=(0.46, 0.57), arrow_scale
         (cx + int(aw * 0.05), cy + int(ah * 0.35)),
         (cx - int(aw * 0.55), cy + int(ah * 0.35)),
     ]
-    d.polygon(pts, fill=(255, 255, 255, 245))
-    return out
+    x0 = min(p[0] for p in pts)
+    y0 = min(p[1] for p in pts)
+    x1 = max(p[0] for p in pts)
+    y1 = max(p[1] for p in pts)
+
+    patch = Image.new("RGBA", (x1 - x0 + 1, y1 - y0 + 1), (0, 0, 0, 0))
+    d = ImageDraw.Draw(patch)
+    d.polygon([(px - x0, py - y0) for px, py in pts], fill=(255, 255, 255, 245))
+    return np.asarray(patch), x0, y0
+
+
+def add_badge(canvas: Image.Image, text="2", badge_ratio=0.12):
+    """Add red badge at top-right."""
+    W, H = canvas.size
+    out = np.array(canvas.convert("RGBA"))
+    patch, x, y = badge_patch(W, H, text, badge_ratio)
+    paste_over(out, patch, x, y)
+    return Image.fromarray(out)
+
+
+def add_logout_arrow(canvas: Image.Image, arrow_center=(0.46, 0.57), arrow_scale=0.13):
+    """
+    Add a white 'exit' arrow overlay (kept minimal).
+    arrow_center is relative (x,y) on canvas.
+    """
+    W, H = canvas.size
+    out = np.array(canvas.convert("RGBA"))
+    patch, x, y = logout_arrow_patch(W, H, arrow_center, arrow_scale)
+    paste_over(out, patch, x, y)
+    return Image.fromarray(out)
 
 
 def put_on_green_gradient(icon_canvas: Image.Image, top=(18, 120, 60), bottom=(85, 205, 125)):
     """Composite icon over green gradient background."""
     W, H = icon_canvas.size
-    bg = linear_gradient_rgba((W, H), top, bottom)
-    out = Image.alpha_composite(bg, icon_canvas.convert("RGBA"))
-    return out
+    bg = gradient_array((W, H), top, bottom)
+    composite_over(bg, np.asarray(icon_canvas.convert("RGBA")))
+    return Image.fromarray(bg)
+
+
+def render_variants(src: Image.Image, size: int, fill: float):
+    """
+    Build every variant from one shared master buffer.
+    The green master is composited in place into the gradient array; each
+    overlay variant costs one copy of the master plus a bounding-box paste.
+    """
+    base = fit_center(src, size, fill_ratio=fill)
+    base_arr = np.asarray(base)
 
+    master = gradient_array((size, size), (18, 120, 60), (85, 205, 125))
+    composite_over(master, base_arr)
 
-def export_png(img: Image.Image, path: Path):
+    badge2 = master.copy()
+    patch, x, y = badge_patch(size, size, "2")
+    paste_over(badge2, patch, x, y)
+
+    logout = master.copy()
+    patch, x, y = logout_arrow_patch(size, size)
+    paste_over(logout, patch, x, y)
+
+    return {
+        "Base": base_arr,
+        "Green": master,
+        "Green_Badge2": badge2,
+        "Green_Logout": logout,
+    }
+
+
+def export_png(img: Image.Image, path: Path, compress_level=None):
     path.parent.mkdir(parents=True, exist_ok=True)
-    img.save(path, "PNG", optimize=True)
+    if compress_level is None:
+        img.save(path, "PNG", optimize=True)
+    else:
+        img.save(path, "PNG", compress_level=compress_level)
 
 
 def export_ico_from_master(master_png: Image.Image, path: Path, sizes):
@@ -125,6 +249,46 @@ def export_ico_from_master(master_png: Image.Image, path: Path, sizes):
     imgs[0].save(path, format="ICO", sizes=[(s, s) for s in sizes])
 
 
+ICO_NAMES = {
+    "Green": "App_Green.ico",
+    "Green_Badge2": "App_Green_Badge2.ico",
+    "Green_Logout": "App_Green_Logout.ico",
+}
+
+
+def render_icon_set(inp: Path, outdir: Path, size: int, fill: float, ico_sizes, png_level=None) -> float:
+    """Render and export all variants for one input logo; returns seconds spent."""
+    t0 = time.perf_counter()
+    src = Image.open(inp).convert("RGBA")
+    variants = render_variants(src, size, fill)
+
+    for name, arr in variants.items():
+        export_png(Image.fromarray(arr), outdir / f"{name}_{size}.png", png_level)
+
+    if ico_sizes:
+        for name, ico_name in ICO_NAMES.items():
+            export_ico_from_master(Image.fromarray(variants[name]), outdir / ico_name, ico_sizes)
+
+    return time.perf_counter() - t0
+
+
+def _render_job(job):
+    inp, outdir, size, fill, ico_sizes, png_level = job
+    return str(inp), render_icon_set(Path(inp), Path(outdir), size, fill, ico_sizes, png_level)
+
+
+def expand_inputs(patterns):
+    """Expand files, directories (*.png inside) and glob patterns."""
+    found = []
+    for pattern in patterns:
+        p = Path(pattern)
+        if p.is_dir():
+            found.extend(sorted(p.glob("*.png")))
+        else:
+            found.extend(Path(m) for m in sorted(glob.glob(pattern)))
+    return found
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", default="icon.png", help="Input icon PNG (prefer 1024x1024+).")
@@ -133,40 +297,40 @@ def main():
     ap.add_argument("--fill", type=float, default=0.82, help="How much the icon fills the canvas (0.7-0.9).")
     ap.add_argument("--no-ico", action="store_true", help="Do not export ICO.")
     ap.add_argument("--ico-sizes", default="256,128,64,48,32", help="Comma sizes for ICO (default: no 16).")
+    ap.add_argument("--png-level", type=int, default=None,
+                    help="zlib level 0-9 for PNGs (faster than the default optimize=True).")
+    ap.add_argument("--batch", nargs="+", metavar="LOGO",
+                    help="Render many logos (files, dirs or globs) into OUTDIR/<name>/ across a process pool.")
+    ap.add_argument("--jobs", type=int, default=0, help="Worker processes for --batch (default: CPU count).")
     args = ap.parse_args()
 
-    inp = Path(args.input)
     outdir = Path(args.outdir)
 
-    src = Image.open(inp).convert("RGBA")
-
-    # Base canvas (transparent)
-    base = fit_center(src, args.size, fill_ratio=args.fill)
-
-    # Variants
-    green_base = put_on_green_gradient(base)
-    green_badge2 = add_badge(green_base, text="2")
-    green_logout = add_logout_arrow(green_base)
-
-    # Save PNGs
-    export_png(base, outdir / f"Base_{args.size}.png")
-    export_png(green_base, outdir / f"Green_{args.size}.png")
-    export_png(green_badge2, outdir / f"Green_Badge2_{args.size}.png")
-    export_png(green_logout, outdir / f"Green_Logout_{args.size}.png")
-
-    # ICO (from master 512; embedded sizes should be <=256 for best compatibility)
+    # ICO (from master; embedded sizes should be <=256 for best compatibility)
+    sizes = []
     if not args.no_ico:
         sizes = [int(x.strip()) for x in args.ico_sizes.split(",") if x.strip()]
         # ICO sizes should not exceed master size
         sizes = [s for s in sizes if s <= args.size]
         if not sizes:
             raise SystemExit("ICO sizes list is empty or larger than --size.")
-        export_ico_from_master(green_base, outdir / "App_Green.ico", sizes)
-        export_ico_from_master(green_badge2, outdir / "App_Green_Badge2.ico", sizes)
-        export_ico_from_master(green_logout, outdir / "App_Green_Logout.ico", sizes)
 
-    print("Done. Output:", outdir.resolve())
+    if args.batch:
+        inputs = expand_inputs(args.batch)
+        if not inputs:
+            raise SystemExit("No input logos matched --batch.")
+        jobs = [(str(p), str(outdir / p.stem), args.size, args.fill, sizes, args.png_level) for p in inputs]
+        t0 = time.perf_counter()
+        workers = args.jobs or min(len(jobs), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for inp, seconds in pool.map(_render_job, jobs):
+                print(f"{seconds * 1000:8.1f} ms  {inp}")
+        print(f"Done: {len(jobs)} icon sets in {time.perf_counter() - t0:.2f}s. Output:", outdir.resolve())
+        return
+
+    seconds = render_icon_set(Path(args.input), outdir, args.size, args.fill, sizes, args.png_level)
+    print(f"Done in {seconds:.2f}s. Output:", outdir.resolve())
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,4 +1,12 @@
-import gsb_login_runtime_template as _t
+import sys
+
+if __name__ == "__main__" and "--status" in sys.argv[1:]:
+    # Durum dosyası HTTP/HTML modülleri yüklenmeden okunur (bkz. gsb_state).
+    import gsb_state
+
+    sys.exit(gsb_state.main(sys.argv[1:]))
+
+import gsb_login_runtime_template as _t  # noqa: E402
 
 _t.ACCOUNT_ID = 1
 
@@ -0,0 +1,193 @@
+import socket
+import sys
+import threading
+import time
+from typing import Any, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError, ReadTimeoutError
+from urllib3.util.retry import Retry
+
+from gsb_breaker import CircuitBreaker
+from gsb_cancel import Cancelled, current
+from gsb_eyeballs import create_connection
+from gsb_latency import LatencyModel
+
+# requests/urllib3 backend'ine özel parçalar: gecikme ölçen ve devre kesiciye
+# danışan HTTPAdapter'lar. Model ve kesici (gsb_latency, gsb_breaker)
+# requests'ten bağımsızdır; gsb_http backend'i de aynılarını kullanır.
+
+
+# --- Bağlantı süresinin ölçülmesi ---
+# urllib3 bağlantıyı gönderen thread'de kurar; süre thread-local'e yazılır
+# ve TimedAdapter.send tarafından alınır.
+_local = threading.local()
+
+
+class _TimedConnectMixin:
+    def _new_conn(self) -> socket.socket:
+        # urllib3 HTTPConnection._new_conn, adres yarıştırmalı (bkz. gsb_eyeballs).
+        try:
+            sock = create_connection(
+                (self._dns_host, self.port),  # type: ignore[attr-defined]
+                self.timeout,  # type: ignore[attr-defined]
+                source_address=self.source_address,  # type: ignore[attr-defined]
+                socket_options=self.socket_options,  # type: ignore[attr-defined]
+            )
+        except socket.gaierror as exc:
+            raise NameResolutionError(self.host, self, exc) from exc  # type: ignore[attr-defined,arg-type]
+        except socket.timeout as exc:
+            raise ConnectTimeoutError(
+                self, f"Connection to {self.host} timed out. (connect timeout={self.timeout})"  # type: ignore[attr-defined]
+            ) from exc
+        except OSError as exc:
+            raise NewConnectionError(self, f"Failed to establish a new connection: {exc}") from exc  # type: ignore[arg-type]
+        sys.audit("http.client.connect", self, self.host, self.port)  # type: ignore[attr-defined]
+        return sock
+
+    def connect(self) -> None:
+        token = current()
+        token.check()
+        t0 = time.perf_counter()
+        super().connect()  # type: ignore[misc]
+        _local.connect = time.perf_counter() - t0
+        # İptal süren okumayı kesebilsin (bkz. gsb_cancel).
+        token.register(self.sock)  # type: ignore[attr-defined]
+
+
+class _TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+def timeout_kind(exc: BaseException) -> str:
+    """"connect"/"read" zaman aşımı mı? urllib3 retry'ları tükenince okuma
+    zaman aşımı requests'te ConnectionError(MaxRetryError) olarak gelir."""
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return "connect"
+    if isinstance(exc, requests.exceptions.ReadTimeout):
+        return "read"
+    reason = getattr(exc.args[0] if exc.args else None, "reason", None)
+    if isinstance(reason, ConnectTimeoutError):
+        return "connect"
+    if isinstance(reason, ReadTimeoutError):
+        return "read"
+    return ""
+
+
+def _timeout_parts(timeout: Any) -> Tuple[Optional[float], Optional[float]]:
+    if isinstance(timeout, tuple):
+        return timeout[0], timeout[1]
+    return timeout, timeout
+
+
+class TimedAdapter(HTTPAdapter):
+    """Her isteğin bağlantı ve yanıt süresini modele yazan HTTPAdapter.
+
+    Zaman aşımına düşen istekler, kullanılan zaman aşımı kadar süren bir
+    ölçüm olarak sayılır; böylece yavaşlayan portalda model sabırlanır.
+    """
+
+    def __init__(self, model: LatencyModel, *args: Any, **kwargs: Any) -> None:
+        self.model = model
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPPool, "https": _TimedHTTPSPool}
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        _local.connect = None
+        url = request.url or ""
+        connect_t, read_t = _timeout_parts(kwargs.get("timeout"))
+        t0 = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+        except requests.RequestException as exc:
+            # İptalle kesilen soket zaman aşımı/portal hatası sayılmaz.
+            current().check()
+            kind = timeout_kind(exc)
+            if kind == "connect" and connect_t is not None:
+                self.model.record_url(url, connect_t, None)
+            elif kind == "read" and read_t is not None:
+                self.model.record_url(url, _local.connect, read_t)
+            raise
+        # Başlıklar gelene kadar geçen süre; gövde daha sonra okunur.
+        connect = _local.connect
+        read = max(0.0, time.perf_counter() - t0 - (connect or 0.0))
+        self.model.record_url(url, connect, read)
+        return response
+
+
+class BreakerAdapter(TimedAdapter):
+    """TimedAdapter + devre kesici. Açık devrede istek hiç gönderilmez;
+    deneme isteği urllib3 retry'ları olmadan tek sefer gönderilir."""
+
+    def __init__(self, model: LatencyModel, breaker: CircuitBreaker, *args: Any, **kwargs: Any) -> None:
+        self.breaker = breaker
+        self._probe_adapter = TimedAdapter(model, max_retries=0)
+        super().__init__(model, *args, **kwargs)
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        url = request.url or ""
+        probe = self.breaker.before_request(url)
+        send = self._probe_adapter.send if probe else super().send
+        try:
+            response = send(request, **kwargs)
+        except Cancelled:
+            if probe:
+                self.breaker.release_probe(url)
+            raise
+        except requests.RequestException as exc:
+            if timeout_kind(exc) or isinstance(exc, requests.exceptions.RetryError):
+                self.breaker.record(url, False, probe)
+            elif probe:
+                # Bağlantı reddi/DNS: büyük olasılıkla GSB ağında değiliz, portal
+                # hatası sayılmaz. Deneme hakkı sonraki isteğe kalır.
+                self.breaker.release_probe(url)
+            raise
+        self.breaker.record(url, response.status_code < 500, probe)
+        return response
+
+    def close(self) -> None:
+        self._probe_adapter.close()
+        super().close()
+
+
+class CancellableRetry(Retry):
+    """urllib3 backoff'u time.sleep ile bekler; bu sürüm iptalde hemen çıkar."""
+
+    def sleep(self, response: Any = None) -> None:
+        delay = None
+        if response is not None and self.respect_retry_after_header:
+            delay = self.get_retry_after(response)
+        current().sleep(self.get_backoff_time() if delay is None else delay)
+
+
+def mount(
+    session: requests.Session,
+    model: LatencyModel,
+    breaker: Optional[CircuitBreaker] = None,
+    **adapter_kwargs: Any,
+) -> TimedAdapter:
+    if breaker is None:
+        adapter = TimedAdapter(model, **adapter_kwargs)
+    else:
+        adapter = BreakerAdapter(model, breaker, **adapter_kwargs)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return adapter
@@ -1,7 +1,8 @@
-import json
 import sys
 from pathlib import Path
 
+from gsb_config import account_path, write_account
+
 
 def base_dir() -> Path:
     if getattr(sys, "frozen", False):
@@ -16,7 +17,7 @@ def cfg_dir() -> Path:
 
 
 def cfg_path(account_id: int) -> Path:
-    return cfg_dir() / f"config_giris{account_id}.json"
+    return account_path(cfg_dir(), account_id)
 
 
 def main() -> None:
@@ -38,8 +39,7 @@ def main() -> None:
         print("TC ve şifre boş olamaz.")
         return
 
-    path = cfg_path(account_id)
-    path.write_text(json.dumps({"username": username, "password": password}, ensure_ascii=False), encoding="utf-8")
+    path = write_account(cfg_dir(), account_id, username, password)
     print(f"✅ Kaydedildi: {path}")
 
 
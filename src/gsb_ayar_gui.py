@@ -1,4 +1,3 @@
-import json
 import subprocess
 import sys
 import tempfile
@@ -10,7 +9,9 @@ from ctypes import wintypes
 import tkinter as tk
 from tkinter import messagebox
 
-from gsb_ui import center_window, run_with_status, show_error, show_info
+from gsb_config import account_path, write_account
+from gsb_layout import load_layout, write_manifest
+from gsb_ui import center_window, get_root, run_with_status, show_error, show_info
 
 from PIL import Image, ImageTk
 
@@ -27,7 +28,7 @@ def gsb_root() -> Path:
     return base_dir()
 
 
-def system_root() -> Path:
+def _probe_system_root() -> Path:
     """User-facing root stays clean.
 
     Preferred layout:
@@ -47,32 +48,23 @@ def system_root() -> Path:
     return sibling
 
 
+def system_root() -> Path:
+    # Yoklama sadece manifest yokken yapılır (bkz. gsb_layout).
+    return Path(load_layout(_probe_system_root)["system_root"])
+
+
 def cfg_dir() -> Path:
-    d = system_root() / "GSB_Dosyalar"
-    d.mkdir(parents=True, exist_ok=True)
-    return d
+    return Path(load_layout(_probe_system_root)["cfg_dir"])
 
 
 def cfg_path(account_id: int) -> Path:
-    return cfg_dir() / f"config_giris{account_id}.json"
+    return account_path(cfg_dir(), account_id)
 
 
 def get_icon_path() -> "Path | None":
     """Find icon.ico or icon.png in standard locations."""
-    candidates = [
-        cfg_dir() / "icons" / "icon.ico",           # primary ICO (GSB_Sistem/GSB_Dosyalar/icons/)
-        cfg_dir() / "icons" / "GSB_Giris.ico",      # fallback ICO
-        cfg_dir() / "icons" / "favicon.png",        # primary PNG
-        cfg_dir() / "icons" / "icon.png",           # alt PNG
-        base_dir().parent / "GSB_Sistem" / "GSB_Dosyalar" / "icons" / "icon.ico",  # Layout A
-        base_dir().parent / "GSB_Sistem" / "GSB_Dosyalar" / "icons" / "favicon.png",
-        base_dir() / "assets" / "icons" / "icon.ico",  # dev env
-        base_dir() / "assets" / "icons" / "icon.png",
-    ]
-    for c in candidates:
-        if c.exists():
-            return c
-    return None
+    icon = load_layout(_probe_system_root).get("icon", "")
+    return Path(icon) if icon else None
 
 
 def create_shortcut(shortcut_name: str, target_path: Path, icon_path: Path) -> None:
@@ -126,7 +118,9 @@ def shortcut_path(shortcut_name: str) -> Path:
 
 
 def main() -> None:
-    root = tk.Tk()
+    # gsb_ui'nin ortak kökü: kayıt/sonuç diyalogları aynı Tcl yorumlayıcısını kullanır.
+    root = get_root()
+    root.deiconify()
     root.title("GSB Bağlantı Ayarları")
     root.resizable(False, False)
     # Daha kompakt (header tamamen kaldırıldı)
@@ -341,13 +335,15 @@ def main() -> None:
             return
 
         def task():
-            path = cfg_path(acc)
-            path.write_text(json.dumps({"username": u, "password": p}, ensure_ascii=False), encoding="utf-8")
+            # Kayıt anında düzeni tazele; runtime'lar bu manifest'i okuyacak.
+            layout = load_layout(_probe_system_root, refresh=True)
+            write_account(cfg_dir(), acc, u, p)
 
             # Seçilen hesap için masaüstüne kısayol oluştur
             sys_root = system_root()
             icons = sys_root / "GSB_Dosyalar" / "icons"
             app = sys_root / "Uygulama"
+            write_manifest(layout, app)
 
             if acc == 1:
                 # 1. hesap: giriş kısayolu her zaman güncellensin (son kayıt geçerli)
@@ -0,0 +1,194 @@
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Optional
+
+from gsb_flight import locked
+from gsb_http import ConnectionError as TransportConnectionError
+from gsb_latency import endpoint_keys
+
+# Portal başına devre kesici (closed -> open -> half-open).
+#
+# Portal art arda 5xx/zaman aşımı verirse devre açılır: o süre boyunca her
+# tıklama portala hiç gitmeden milisaniyeler içinde hata döner. Süre dolunca
+# tek bir süreç "deneme" isteği gönderir (half-open); başarılıysa devre
+# kapanır, değilse bekleme süresi iki katına çıkarak yeniden açılır. Durum
+# exe'ler arasında GSB_Dosyalar\breaker.json ile paylaşılır; oku-değiştir-yaz
+# breaker.json.lock kilidi altında yapılır (hata sayıları kaybolmaz, iki
+# süreç aynı anda devreyi açıp kapatamaz).
+
+BREAKER_NAME = "breaker.json"
+
+# settings.json ile değiştirilebilir (bkz. BREAKER_SETTINGS)
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_OPEN_SECONDS = 30.0
+BREAKER_MAX_OPEN_SECONDS = 300.0
+# Deneme isteği bu süreden uzun sürerse sahipsiz sayılır (çökmüş süreç vb.).
+BREAKER_PROBE_SECONDS = 60.0
+
+BREAKER_SETTINGS = {
+    "breaker_failure_threshold": int,
+    "breaker_open_seconds": float,
+    "breaker_max_open_seconds": float,
+}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(TransportConnectionError):
+    """Devre açık: istek portala gönderilmedi."""
+
+    def __init__(self, host: str, retry_in: float) -> None:
+        self.host = host
+        self.retry_in = retry_in
+        super().__init__(
+            f"Portal ({host}) şu an yanıt vermiyor; art arda hata alındı. "
+            f"Yaklaşık {max(1, int(retry_in + 0.999))} sn sonra tekrar dene."
+        )
+
+
+def _empty() -> Dict[str, Any]:
+    return {"state": CLOSED, "failures": 0, "opened_at": 0.0, "open_seconds": 0.0}
+
+
+class CircuitBreaker:
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        # path yokken (test/araç) durum bellekte tutulur.
+        self._memory: Dict[str, Dict[str, Any]] = {}
+
+    def load(self, path: Path) -> None:
+        self.path = path
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        if self.path is None:
+            return self._memory
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, data: Dict[str, Dict[str, Any]]) -> None:
+        if self.path is None:
+            self._memory = data
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def _file_lock(self) -> ContextManager[None]:
+        return locked(self.path) if self.path is not None else nullcontext()
+
+    def _probe_path(self, host: str) -> Optional[Path]:
+        if self.path is None:
+            return None
+        safe = "".join(c if c.isalnum() or c in "-." else "_" for c in host)
+        return self.path.with_name(f"breaker_{safe}.probe")
+
+    def _claim_probe(self, host: str) -> bool:
+        """Deneme isteğini tek sürece ver (O_EXCL ile dosya oluşturma)."""
+        probe = self._probe_path(host)
+        if probe is None:
+            return True
+        try:
+            if time.time() - probe.stat().st_mtime > BREAKER_PROBE_SECONDS:
+                probe.unlink()
+        except OSError:
+            pass
+        try:
+            probe.parent.mkdir(parents=True, exist_ok=True)
+            os.close(os.open(str(probe), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except OSError:
+            return False
+
+    def _release_probe(self, host: str) -> None:
+        probe = self._probe_path(host)
+        if probe is not None:
+            try:
+                probe.unlink()
+            except OSError:
+                pass
+
+    def release_probe(self, url: str) -> None:
+        self._release_probe(endpoint_keys(url)[0])
+
+    def state(self, host: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._read().get(host) or _empty())
+
+    def _healthy(self, host: str) -> bool:
+        # Sağlıklı yol kilitsiz okunur: her istekte dosya kilidi alınmaz.
+        entry = self.state(host)
+        return entry.get("state") == CLOSED and not entry.get("failures")
+
+    def before_request(self, url: str) -> bool:
+        """İstekten önce çağrılır. Devre açıksa CircuitOpenError fırlatır.
+
+        True dönerse bu istek half-open deneme isteğidir.
+        """
+        host = endpoint_keys(url)[0]
+        if self._healthy(host):
+            return False
+        with self._lock, self._file_lock():
+            data = self._read()
+            entry = data.get(host)
+            if not entry or entry.get("state") == CLOSED:
+                return False
+            now = time.time()
+            retry_at = float(entry.get("opened_at", 0.0)) + float(entry.get("open_seconds", 0.0))
+            if entry.get("state") == OPEN and now < retry_at:
+                raise CircuitOpenError(host, retry_at - now)
+            # Süre doldu (veya başka süreç deniyor): tek deneme isteği.
+            if not self._claim_probe(host):
+                raise CircuitOpenError(host, max(1.0, retry_at - now))
+            entry["state"] = HALF_OPEN
+            data[host] = entry
+            self._write(data)
+            return True
+
+    def record(self, url: str, ok: bool, probe: bool = False) -> None:
+        host = endpoint_keys(url)[0]
+        if ok and self._healthy(host):
+            if probe:
+                self._release_probe(host)
+            return  # sağlıklı yol: dosyaya yazma yok
+        with self._lock, self._file_lock():
+            data = self._read()
+            entry = data.get(host) or _empty()
+            if ok:
+                if probe:
+                    self._release_probe(host)
+                if entry.get("state") == CLOSED and not entry.get("failures"):
+                    return  # sağlıklı yol: dosyaya yazma yok
+                data[host] = _empty()
+                self._write(data)
+                return
+
+            failures = int(entry.get("failures", 0)) + 1
+            entry["failures"] = failures
+            if probe or entry.get("state") == HALF_OPEN:
+                entry["state"] = OPEN
+                entry["opened_at"] = time.time()
+                entry["open_seconds"] = min(
+                    BREAKER_MAX_OPEN_SECONDS, max(BREAKER_OPEN_SECONDS, float(entry.get("open_seconds", 0.0)) * 2)
+                )
+            elif failures >= BREAKER_FAILURE_THRESHOLD:
+                entry["state"] = OPEN
+                entry["opened_at"] = time.time()
+                entry["open_seconds"] = BREAKER_OPEN_SECONDS
+            data[host] = entry
+            self._write(data)
+            if probe:
+                self._release_probe(host)
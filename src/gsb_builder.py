@@ -1,10 +1,26 @@
+import ast
 import getpass
+import hashlib
+import importlib.util
+import json
+import os
+import py_compile
+import shutil
+import statistics
 import subprocess
 import sys
+import tempfile
+import time
+import zipapp
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
 
 from PIL import Image, ImageDraw, ImageFont
 
+from gsb_config import account_path, write_account
+from gsb_layout import probe_layout, write_manifest
+
 DESKTOP = Path.home() / "Desktop"
 
 # Her şey tek klasörde: Desktop\GSB\
@@ -15,327 +31,61 @@ TEMP_DIR = ASSETS_DIR / "temp"
 OUTPUT_DIR = BASE_DIR
 
 LOGO_PNG = ICONS_DIR / "favicon.png"
-
-PORTAL_URL = "https://wifi.gsb.gov.tr"
-LOGIN_PAGE_URL = "https://wifi.gsb.gov.tr/login.html"
-AUTH_URL = "https://wifi.gsb.gov.tr/j_spring_security_check"
-LOGOUT_URL = "https://wifi.gsb.gov.tr/logout"
-
-
-LOGIN_TEMPLATE = '''
-import re
-import socket
-import time
-from typing import Dict, List
-from urllib.parse import urljoin
-
-import requests
-from bs4 import BeautifulSoup
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-
-USERNAME = {username}
-PASSWORD = {password}
-LOGIN_PAGE_URL = {login_page_url}
-AUTH_URL = {auth_url}
-QUOTA_URL = ""
-
-CONNECT_TIMEOUT = 4
-READ_TIMEOUT = 8
-MAX_LOGIN_ATTEMPT = 4
-
-
-def build_session() -> requests.Session:
-    session = requests.Session()
-
-    retries = Retry(
-        total=5,
-        connect=5,
-        read=3,
-        backoff_factor=0.4,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["GET", "POST"],
-    )
-    adapter = HTTPAdapter(max_retries=retries, pool_connections=10, pool_maxsize=10)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-
-    session.trust_env = False
-    session.headers.update(
-        {{
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Connection": "keep-alive",
-        }}
-    )
-    return session
-
-
-def extract_hidden_inputs(html_text: str) -> Dict[str, str]:
-    soup = BeautifulSoup(html_text, "html.parser")
-    data: Dict[str, str] = {{}}
-    for element in soup.select("input[type='hidden'][name]"):
-        data[element.get("name", "")] = element.get("value", "")
-    return data
-
-
-def resolve_auth_url(html_text: str, fallback_url: str) -> str:
-    if AUTH_URL:
-        return AUTH_URL
-
-    soup = BeautifulSoup(html_text, "html.parser")
-    form = soup.find("form")
-    if not form:
-        return urljoin(fallback_url, "/j_spring_security_check")
-
-    action = (form.get("action") or "").strip()
-    if not action:
-        return urljoin(fallback_url, "/j_spring_security_check")
-
-    return urljoin(fallback_url, action)
-
-
-def extract_quota_info(html_text: str) -> str:
-    soup = BeautifulSoup(html_text, "html.parser")
-    plain_text = " ".join(soup.stripped_strings)
-
-    patterns = [
-        r"(kalan\\s*kota[^\\d]{{0,20}}\\d+[\\.,]?\\d*\\s*(?:mb|gb))",
-        r"(kota[^\\d]{{0,20}}\\d+[\\.,]?\\d*\\s*(?:mb|gb))",
-        r"(kullan[ıi]m[^\\d]{{0,20}}\\d+[\\.,]?\\d*\\s*(?:mb|gb))",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, plain_text, flags=re.IGNORECASE)
-        if match:
-            return match.group(1)
-
-    return "Kota bilgisi HTML içinde otomatik bulunamadı."
-
-
-def discover_quota_urls(html_text: str, base_url: str) -> List[str]:
-    soup = BeautifulSoup(html_text, "html.parser")
-    keywords = ("kota", "kalan", "kullanım", "kullanim", "internet", "paket")
-    urls: List[str] = []
-
-    def add_url(raw_url: str) -> None:
-        if not raw_url:
-            return
-        full = urljoin(base_url, raw_url.strip())
-        if full.startswith("javascript:"):
-            return
-        if full not in urls:
-            urls.append(full)
-
-    for link in soup.find_all("a", href=True):
-        label = f"{{link.get_text(' ', strip=True)}} {{link.get('href', '')}}".lower()
-        if any(word in label for word in keywords):
-            add_url(link.get("href", ""))
-
-    for form in soup.find_all("form"):
-        action = form.get("action", "")
-        label = f"{{form.get_text(' ', strip=True)}} {{action}}".lower()
-        if any(word in label for word in keywords):
-            add_url(action)
-
-    for element in soup.find_all(attrs={{"onclick": True}}):
-        onclick = element.get("onclick", "")
-        if any(word in onclick.lower() for word in keywords):
-            match = re.search(r"['\"]([^'\"]+)['\"]", onclick)
-            if match:
-                add_url(match.group(1))
-
-    return urls
-
-
-def print_quota_info(session: requests.Session, login_response_text: str, current_url: str) -> None:
-    print("\\n--- Kota Bilgisi ---")
-    initial = extract_quota_info(login_response_text)
-    print(initial)
-
-    candidate_urls: List[str] = []
-    if QUOTA_URL:
-        candidate_urls.append(QUOTA_URL)
-
-    candidate_urls.extend(discover_quota_urls(login_response_text, current_url))
-
-    if initial == "Kota bilgisi HTML içinde otomatik bulunamadı." and candidate_urls:
-        print("Aday kota sayfaları kontrol ediliyor...")
-
-    for candidate in candidate_urls[:8]:
-        try:
-            quota_resp = session.get(
-                candidate,
-                timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
-                allow_redirects=True,
-            )
-            quota_resp.raise_for_status()
-            parsed = extract_quota_info(quota_resp.text)
-            if parsed != "Kota bilgisi HTML içinde otomatik bulunamadı.":
-                print(f"Kota bulundu ({{candidate}}): {{parsed}}")
-                return
-        except Exception as exc:
-            print(f"Kota adayı okunamadı ({{candidate}}): {{exc}}")
-
-
-def login_once(session: requests.Session) -> bool:
-    start = time.perf_counter()
-
-    login_page = session.get(
-        LOGIN_PAGE_URL,
-        timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
-        allow_redirects=True,
-    )
-    login_page.raise_for_status()
-
-    auth_url = resolve_auth_url(login_page.text, LOGIN_PAGE_URL)
-
-    payload = extract_hidden_inputs(login_page.text)
-    payload.update(
-        {{
-            "j_username": USERNAME,
-            "j_password": PASSWORD,
-            "submit": "Login",
-        }}
-    )
-
-    response = session.post(
-        auth_url,
-        data=payload,
-        timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
-        allow_redirects=True,
-        headers={{"Referer": LOGIN_PAGE_URL, "Content-Type": "application/x-www-form-urlencoded"}},
-    )
-
-    elapsed = time.perf_counter() - start
-
-    body_lower = response.text.lower()
-    login_form_back = "j_spring_security_check" in body_lower or "j_username" in body_lower
-    success = response.status_code in (200, 302, 303) and not login_form_back
-
-    print(f"Durum: {{response.status_code}} | Süre: {{elapsed:.2f}}s | POST: {{auth_url}}")
-    if success:
-        print_quota_info(session, response.text, response.url)
-    return success
-
-
-def dns_precheck(url: str) -> None:
-    host = url.split("//", 1)[-1].split("/", 1)[0]
-    socket.getaddrinfo(host, 443)
-
-
-def fast_login() -> None:
-    try:
-        dns_precheck(LOGIN_PAGE_URL)
-    except Exception:
-        print("⚠️ DNS çözümü başarısız. Bağlı ağda bu normal olabilir, denemeye devam ediliyor...")
-
-    session = build_session()
-
-    for attempt in range(1, MAX_LOGIN_ATTEMPT + 1):
-        try:
-            print(f"Giriş deneniyor ({{attempt}}/{{MAX_LOGIN_ATTEMPT}})...")
-            if login_once(session):
-                print("✅ Giriş başarılı")
-                return
-            print("⚠️ Giriş doğrulanamadı, tekrar denenecek...")
-        except Exception as exc:
-            print(f"❌ Hata: {{exc}}")
-
-        time.sleep(min(0.6 * attempt, 2.0))
-
-    print("⛔ Maksimum deneme sayısına ulaşıldı.")
-
-
-if __name__ == "__main__":
-    fast_login()
-'''
-
-
-LOGOUT_TEMPLATE = '''
-import socket
-import time
-
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-
-PORTAL_URL = {portal_url}
-LOGOUT_URL = {logout_url}
-CONNECT_TIMEOUT = 4
-READ_TIMEOUT = 8
-MAX_ATTEMPT = 4
-
-
-def build_session() -> requests.Session:
-    session = requests.Session()
-
-    retries = Retry(
-        total=5,
-        connect=5,
-        read=3,
-        backoff_factor=0.4,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["GET", "POST"],
-    )
-    adapter = HTTPAdapter(max_retries=retries, pool_connections=10, pool_maxsize=10)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-
-    session.trust_env = False
-    session.headers.update(
-        {{
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Connection": "keep-alive",
-        }}
-    )
-    return session
-
-
-def dns_precheck(url: str) -> None:
-    host = url.split("//", 1)[-1].split("/", 1)[0]
-    socket.getaddrinfo(host, 443)
-
-
-def logout_flow() -> None:
-    try:
-        dns_precheck(PORTAL_URL)
-    except Exception:
-        print("⚠️ DNS çözümü başarısız, yine de çıkış denenecek...")
-
-    session = build_session()
-
-    for attempt in range(1, MAX_ATTEMPT + 1):
-        try:
-            print(f"Çıkış deneniyor ({{attempt}}/{{MAX_ATTEMPT}})...")
-            response = session.get(
-                LOGOUT_URL,
-                timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
-                allow_redirects=True,
-                headers={{"Referer": PORTAL_URL}},
-            )
-            final_url = response.url
-            print(f"Durum: {{response.status_code}} | Final URL: {{final_url}}")
-
-            if response.status_code in (200, 302, 303):
-                print("✅ Çıkış başarılı")
-                return
-
-            print("⚠️ Çıkış doğrulanamadı, tekrar denenecek...")
-        except Exception as exc:
-            print(f"❌ Hata: {{exc}}")
-
-        time.sleep(min(0.6 * attempt, 2.0))
-
-    print("⛔ Çıkış yapılamadı.")
-
-
-if __name__ == "__main__":
-    logout_flow()
-'''
+BUILD_CACHE = TEMP_DIR / "build_cache.json"
+SRC_DIR = Path(__file__).resolve().parent
+
+# Paketlenen gerçek runtime giriş noktaları (src\ altında). Kimlik bilgileri
+# exe'ye gömülmez; çalışma anında GSB_Dosyalar\config_giris*.json'dan okunur.
+LOGIN_ENTRY = {1: SRC_DIR / "GSB_Giriş.py", 2: SRC_DIR / "GSB_Giriş2.py"}
+LOGOUT_ENTRY = SRC_DIR / "gsb_cikis.py"
+
+# Paketleme modları. onefile her açılışta tüm yükü temp'e açar (tıklama ->
+# pencere süresinin çoğu); onedir açılmış halde durur. "lean": runtime'ın
+# kullanmadığı paketler dışarıda, UPX yok (açılışta sıkıştırma çözülmez),
+# Windows dışında binary'ler strip'lenir.
+LEAN_EXCLUDES = ("PIL", "numpy", "setuptools", "pkg_resources", "lib2to3", "pydoc_data", "test")
+BUILD_MODES: Dict[str, List[str]] = {
+    "onefile": ["--onefile"],
+    "onedir": ["--onedir"],
+    "onedir-lean": [
+        "--onedir",
+        "--noupx",
+        *(opt for name in LEAN_EXCLUDES for opt in ("--exclude-module", name)),
+        *([] if sys.platform == "win32" else ["--strip"]),
+    ],
+}
+BUILD_MODE = os.getenv("GSB_BUILD_MODE", "onefile")
+if BUILD_MODE not in BUILD_MODES:
+    BUILD_MODE = "onefile"
+# onedir çıktıları: GSB\GSB_Klasör\<mod>\<exe adı>\<exe>
+ONEDIR_ROOT = BASE_DIR / "GSB_Klasör"
+
+# Her build'den sonra artifact "--version" ile bu kadar kez açılıp kapanır
+# (0 = ölçme); sonuçlar TEMP_DIR\bench.json'da birikir.
+BENCH_RUNS = int(os.getenv("GSB_BENCH_RUNS", "5"))
+BENCH_FILE = TEMP_DIR / "bench.json"
+BENCH_TIMEOUT = 60.0
+
+# Linux kiosklar için tek dosyalık zipapp: runtime + gsb_ui + portal istemcisi
+# optimize edilmiş (-OO) .pyc olarak; kaynak konmaz. zipimport .pyc'yi arşivden
+# doğrudan yükler: açılışta ne derleme ne de temp'e açma var. .pyc'ler
+# derleyen Python sürümüne bağlıdır; __main__ başka sürümde açık hata verir.
+PYZ_PATH = OUTPUT_DIR / "gsb.pyz"
+PYZ_ENTRY = SRC_DIR / "gsb_main.py"
+PYZ_OPTIMIZE = 2
+PYZ_INTERPRETER = "/usr/bin/env python3"
+# Gömülebilen saf-Python bağımlılıklar. C eklentileri zip'ten yüklenemez;
+# atlanırlar (charset_normalizer'ın .py karşılıkları kullanılır).
+PYZ_VENDOR = ("requests", "urllib3", "idna", "certifi", "charset_normalizer", "bs4", "soupsieve")
+PYZ_MAIN = """import sys
+
+if sys.version_info[:2] != {version}:
+    sys.exit("gsb.pyz Python {dotted} ile derlendi; bu Python %d.%d." % sys.version_info[:2])
+
+import gsb_main  # noqa: E402
+
+gsb_main.main()
+"""
 
 
 def ensure_dirs() -> None:
@@ -420,71 +170,528 @@ def create_logout_icon(path: Path) -> None:
     create_themed_icon(path, theme="logout", badge_text=None)
 
 
-def build_exe(script_content: str, exe_name: str, icon_path: Path) -> bool:
-    script_path = TEMP_DIR / f"{exe_name}.py"
-    script_path.write_text(script_content, encoding="utf-8")
+class BuildTarget(NamedTuple):
+    exe_name: str
+    script_path: Path
+    icon_path: Path
+    mode: str = "onefile"
+
+
+class StartupBench(NamedTuple):
+    first_ms: float
+    median_ms: float
+    min_ms: float
+    size_mb: float
+
+
+class BuildResult(NamedTuple):
+    exe_name: str
+    ok: bool
+    cached: bool
+    seconds: float
+    artifact: Path
+    mode: str = "onefile"
+    bench: Optional[StartupBench] = None
+
+
+def dist_dir(target: BuildTarget) -> Path:
+    return OUTPUT_DIR if target.mode == "onefile" else ONEDIR_ROOT / target.mode
+
+
+def artifact_path(target: BuildTarget) -> Path:
+    suffix = ".exe" if sys.platform == "win32" else ""
+    if target.mode == "onefile":
+        return OUTPUT_DIR / f"{target.exe_name}{suffix}"
+    return dist_dir(target) / target.exe_name / f"{target.exe_name}{suffix}"
+
+
+def cache_key(target: BuildTarget) -> str:
+    return target.exe_name if target.mode == "onefile" else f"{target.exe_name}@{target.mode}"
+
+
+def pyinstaller_options(target: BuildTarget) -> List[str]:
+    # Hash'e de giren, hedefe özgü olmayan seçenekler.
+    return [*BUILD_MODES[target.mode], "--noconfirm", "--name", target.exe_name]
+
+
+def _imports(path: Path) -> List[str]:
+    """Dosyanın import ettiği üst düzey modül adları."""
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    except (OSError, SyntaxError, ValueError):
+        return []
+    names: List[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module.split(".")[0])
+    return names
+
+
+def _local_modules(script_path: Path, search_dirs: List[Path]) -> Dict[str, Path]:
+    """Script'in (dolaylı) import ettiği yerel .py dosyalarını bul."""
+    found: Dict[str, Path] = {}
+    queue = [script_path]
+    while queue:
+        path = queue.pop()
+        for name in _imports(path):
+            if name in found:
+                continue
+            for d in search_dirs:
+                candidate = d / f"{name}.py"
+                if candidate.is_file():
+                    found[name] = candidate
+                    queue.append(candidate)
+                    break
+    return found
+
+
+def _pyinstaller_version() -> str:
+    try:
+        from importlib.metadata import version
+
+        return version("pyinstaller")
+    except Exception:
+        return "?"
+
+
+def bundled_distributions(paths: List[Path], local: Set[str]) -> Dict[str, str]:
+    """Dosyaların import ettiği üçüncü parti dağıtımlar (ve bağımlılıkları) -> sürüm.
+
+    Güncellenen bir paket (requests, urllib3, bs4 ...) hash'i değiştirsin ve
+    exe'deki eski kopya "güncel" sayılmasın.
+    """
+    from importlib import metadata
+
+    stdlib = set(getattr(sys, "stdlib_module_names", ()))
+    try:
+        owners = metadata.packages_distributions()
+    except AttributeError:  # Python < 3.10
+        owners = {}
+    queue = sorted(
+        {
+            dist
+            for path in paths
+            for name in _imports(path)
+            if name not in local and name not in stdlib
+            for dist in owners.get(name, [name])
+        }
+    )
+    versions: Dict[str, str] = {}
+    while queue:
+        dist = queue.pop()
+        key = dist.lower().replace("_", "-")
+        if key in versions:
+            continue
+        try:
+            versions[key] = metadata.version(dist)
+            requires = metadata.requires(dist) or []
+        except metadata.PackageNotFoundError:
+            continue
+        for req in requires:
+            # Yalnızca koşulsuz bağımlılıklar (extra/platform işaretli olanlar değil).
+            if ";" in req:
+                continue
+            name = req.split("[")[0].split("(")[0]
+            for sep in "<>=!~ ":
+                name = name.split(sep)[0]
+            queue.append(name.strip())
+    return versions
+
+
+def build_hash(target: BuildTarget) -> str:
+    h = hashlib.sha256()
+    h.update(target.script_path.read_bytes())
+    search_dirs = [target.script_path.parent, SRC_DIR]
+    modules = _local_modules(target.script_path, search_dirs)
+    for name, path in sorted(modules.items()):
+        h.update(b"\0mod:" + name.encode("utf-8") + b"\0")
+        h.update(path.read_bytes())
+    dists = bundled_distributions([target.script_path, *modules.values()], set(modules))
+    for dist, version in sorted(dists.items()):
+        h.update(f"\0dist:{dist}=={version}".encode("utf-8"))
+    h.update(b"\0icon\0")
+    h.update(target.icon_path.read_bytes() if target.icon_path.exists() else b"")
+    h.update(b"\0opts\0" + "\0".join(pyinstaller_options(target)).encode("utf-8"))
+    h.update(f"\0{sys.version}\0{_pyinstaller_version()}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _load_build_cache() -> Dict[str, Dict[str, str]]:
+    try:
+        data = json.loads(BUILD_CACHE.read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_build_cache(cache: Dict[str, Dict[str, str]]) -> None:
+    tmp = BUILD_CACHE.with_name(BUILD_CACHE.name + ".tmp")
+    tmp.write_text(json.dumps(cache, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, BUILD_CACHE)
+
 
+def _artifact_matches(entry: Optional[Dict[str, str]], digest: str, artifact: Path) -> bool:
+    if not entry or entry.get("hash") != digest:
+        return False
+    try:
+        st = artifact.stat()
+    except OSError:
+        return False
+    # Artifact elle değiştirildiyse/yarım kaldıysa yeniden üret.
+    return str(st.st_size) == entry.get("size") and str(st.st_mtime_ns) == entry.get("mtime_ns")
+
+
+def _run_pyinstaller(target: BuildTarget) -> Tuple[bool, float]:
+    # Her hedefin (ve modun) kendi work/spec klasörü var; paralel build'ler çakışmaz.
+    key = cache_key(target).replace("@", "_")
+    work = TEMP_DIR / f"build_{key}"
+    spec = TEMP_DIR / f"spec_{key}"
+    log_path = TEMP_DIR / f"build_{key}.log"
     cmd = [
         sys.executable,
         "-m",
         "PyInstaller",
-        "--onefile",
-        "--name",
-        exe_name,
+        *pyinstaller_options(target),
         "--icon",
-        str(icon_path),
+        str(target.icon_path),
         "--distpath",
-        str(OUTPUT_DIR),
+        str(dist_dir(target)),
         "--workpath",
-        str(TEMP_DIR / f"build_{exe_name}"),
+        str(work),
         "--specpath",
-        str(TEMP_DIR),
-        str(script_path),
+        str(spec),
+        "--paths",
+        str(SRC_DIR),
+        str(target.script_path),
     ]
 
-    print("\nBuild başlatıldı:", " ".join(cmd))
-    result = subprocess.run(cmd)
-    if result.returncode == 0:
-        print(f"✅ EXE hazır: {OUTPUT_DIR / (exe_name + '.exe')}")
-        return True
+    print(f"Build başlatıldı: {target.exe_name} [{target.mode}] (log: {log_path})")
+    t0 = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8", errors="replace") as log:
+        log.write(" ".join(cmd) + "\n\n")
+        log.flush()
+        result = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT)
+    return result.returncode == 0, time.perf_counter() - t0
 
-    print("⛔ Build başarısız.")
-    return False
 
+def _artifact_size(target: BuildTarget, artifact: Path) -> int:
+    if target.mode == "onefile":
+        return artifact.stat().st_size
+    return sum(p.stat().st_size for p in artifact.parent.rglob("*") if p.is_file())
 
-def create_giris(version: int) -> None:
+
+def _time_runs(
+    command: List[str], runs: int, env: Optional[Dict[str, str]] = None, ok_codes: Tuple[int, ...] = (0,)
+) -> Optional[List[float]]:
+    """command'ı runs kez çalıştır; başlatmadan çıkışa süreler (ms) veya None."""
+    samples: List[float] = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        try:
+            result = subprocess.run(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=BENCH_TIMEOUT,
+                env=env,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        if result.returncode not in ok_codes:
+            return None
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def startup_benchmark(target: BuildTarget, runs: int = 0) -> Optional[StartupBench]:
+    """Artifact'i "--version" ile runs kez başlatıp çıkışa kadar geçen süreyi ölç.
+
+    İlk açılış ayrıca raporlanır: build'den hemen sonra dosyalar diskte
+    soğuk olabilir (onefile'da ayrıca temp'e açma). Başarısız açılışta None.
+    """
+    artifact = artifact_path(target)
+    samples = _time_runs([str(artifact), "--version"], runs or BENCH_RUNS)
+    if not samples:
+        return None
+    size_mb = _artifact_size(target, artifact) / (1024 * 1024)
+    return StartupBench(samples[0], statistics.median(samples), min(samples), size_mb)
+
+
+def _record_bench(target: BuildTarget, bench: StartupBench) -> None:
+    try:
+        data = json.loads(BENCH_FILE.read_text(encoding="utf-8"))
+        rows = data if isinstance(data, list) else []
+    except (OSError, ValueError):
+        rows = []
+    rows.append({"exe": target.exe_name, "mode": target.mode, "ts": time.time(), **bench._asdict()})
+    tmp = BENCH_FILE.with_name(BENCH_FILE.name + ".tmp")
+    tmp.write_text(json.dumps(rows[-200:], ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, BENCH_FILE)
+
+
+def build_targets(targets: List[BuildTarget], jobs: int = 0) -> List[BuildResult]:
+    """Değişmeyen hedefleri atla, kalanları paralel PyInstaller süreçlerinde üret.
+
+    Yeni üretilen her artifact'in açılış süresi ölçülür (BENCH_RUNS).
+    """
+    cache = _load_build_cache()
+    results: List[BuildResult] = []
+    todo: List[Tuple[BuildTarget, str]] = []
+    # Yeni üretilenler: (results içindeki sıra, hedef)
+    built: List[Tuple[int, BuildTarget]] = []
+
+    for target in targets:
+        t0 = time.perf_counter()
+        digest = build_hash(target)
+        artifact = artifact_path(target)
+        if _artifact_matches(cache.get(cache_key(target)), digest, artifact):
+            seconds = time.perf_counter() - t0
+            results.append(BuildResult(target.exe_name, True, True, seconds, artifact, target.mode))
+        else:
+            todo.append((target, digest))
+
+    if todo:
+        jobs = jobs or min(len(todo), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            futures = {pool.submit(_run_pyinstaller, target): (target, digest) for target, digest in todo}
+            for future, (target, digest) in futures.items():
+                ok, seconds = future.result()
+                artifact = artifact_path(target)
+                if ok and artifact.exists():
+                    st = artifact.stat()
+                    cache[cache_key(target)] = {
+                        "hash": digest,
+                        "size": str(st.st_size),
+                        "mtime_ns": str(st.st_mtime_ns),
+                    }
+                    if target.mode != "onefile":
+                        # onedir exe kendi klasöründe; manifest'i yanında bulsun.
+                        write_manifest(probe_layout(lambda: BASE_DIR), artifact.parent)
+                else:
+                    ok = False
+                    cache.pop(cache_key(target), None)
+                results.append(BuildResult(target.exe_name, ok, False, seconds, artifact, target.mode))
+                if ok:
+                    built.append((len(results) - 1, target))
+        _save_build_cache(cache)
+
+        # Ölçüm build'ler bittikten sonra sırayla: paralel build CPU'yu paylaşmasın.
+        if BENCH_RUNS > 0:
+            for i, target in built:
+                bench = startup_benchmark(target)
+                if bench is not None:
+                    _record_bench(target, bench)
+                results[i] = results[i]._replace(bench=bench)
+
+    print("\n--- Build özeti ---")
+    for r in results:
+        state = "önbellek" if r.cached else ("✅ hazır" if r.ok else "⛔ başarısız")
+        print(f"{r.exe_name:14s} {r.mode:12s} {state:12s} {r.seconds:7.1f}s  {r.artifact}")
+        if r.bench is not None:
+            print(
+                f"{'':14s} açılış: ilk {r.bench.first_ms:.0f} ms, medyan {r.bench.median_ms:.0f} ms, "
+                f"en iyi {r.bench.min_ms:.0f} ms ({r.bench.size_mb:.1f} MB)"
+            )
+    hits = sum(1 for r in results if r.cached)
+    print(f"Önbellek isabeti: {hits}/{len(results)}")
+    return results
+
+
+def build_exe(script_path: Path, exe_name: str, icon_path: Path, mode: str = "") -> bool:
+    target = BuildTarget(exe_name, script_path, icon_path, mode or BUILD_MODE)
+    return all(r.ok for r in build_targets([target]))
+
+
+def compare_modes(target: BuildTarget, runs: int = 0) -> List[Tuple[str, Optional[StartupBench]]]:
+    """Hedefi her modda üret (önbellekte varsa atlanır) ve açılış sürelerini karşılaştır."""
+    variants = [target._replace(mode=mode) for mode in BUILD_MODES]
+    by_mode = {r.mode: r for r in build_targets(variants)}
+    rows: List[Tuple[str, Optional[StartupBench]]] = []
+    for v in variants:
+        r = by_mode[v.mode]
+        # Önbellekten gelenler bu çalıştırmada ölçülmedi.
+        bench = r.bench if r.bench is not None or not r.ok else startup_benchmark(v, runs)
+        rows.append((v.mode, bench))
+    print(f"\n--- Açılış karşılaştırması: {target.exe_name} ---")
+    for mode, bench in sorted(rows, key=lambda row: row[1].median_ms if row[1] else float("inf")):
+        if bench is None:
+            print(f"{mode:12s} ölçülemedi")
+            continue
+        print(
+            f"{mode:12s} medyan {bench.median_ms:7.0f} ms  ilk {bench.first_ms:7.0f} ms  "
+            f"en iyi {bench.min_ms:7.0f} ms  {bench.size_mb:6.1f} MB"
+        )
+    return rows
+
+
+def _compile_into(source: Path, target: Path, arcname: str) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    py_compile.compile(str(source), cfile=str(target), dfile=arcname, doraise=True, optimize=PYZ_OPTIMIZE)
+
+
+def _stage_package(name: str, stage: Path) -> None:
+    """Kurulu paketi stage'e .pyc (+ veri dosyaları) olarak kopyala."""
+    spec = importlib.util.find_spec(name)
+    if spec is None or not spec.origin:
+        raise RuntimeError(f"{name} kurulu değil (--vendor)")
+    if spec.submodule_search_locations is None:
+        origin = Path(spec.origin)
+        files = [(origin, Path(origin.name))]
+    else:
+        root = Path(next(iter(spec.submodule_search_locations)))
+        files = [
+            (path, Path(name) / path.relative_to(root))
+            for path in root.rglob("*")
+            if path.is_file() and "__pycache__" not in path.parts
+        ]
+    for path, rel in files:
+        if path.suffix == ".py":
+            _compile_into(path, stage / rel.with_suffix(".pyc"), rel.as_posix())
+        elif path.suffix not in (".so", ".pyd", ".pyc"):
+            # cacert.pem vb. (importlib.resources zip'ten okur)
+            (stage / rel).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(path, stage / rel)
+
+
+def build_pyz(vendor: bool = False, compressed: bool = False) -> Optional[Path]:
+    """Runtime'ı tek dosyalık .pyz olarak paketle (Linux kiosklar)."""
+    t0 = time.perf_counter()
+    modules = _local_modules(PYZ_ENTRY, [SRC_DIR])
+    modules[PYZ_ENTRY.stem] = PYZ_ENTRY
+    TEMP_DIR.mkdir(parents=True, exist_ok=True)
+    try:
+        with tempfile.TemporaryDirectory(dir=TEMP_DIR) as tmp:
+            stage = Path(tmp)
+            for name, path in sorted(modules.items()):
+                _compile_into(path, stage / f"{name}.pyc", path.name)
+            if vendor:
+                for name in PYZ_VENDOR:
+                    _stage_package(name, stage)
+            major, minor = sys.version_info[:2]
+            main_py = PYZ_MAIN.format(version=(major, minor), dotted=f"{major}.{minor}")
+            (stage / "__main__.py").write_text(main_py, encoding="utf-8")
+            tmp_target = PYZ_PATH.with_name(PYZ_PATH.name + ".tmp")
+            zipapp.create_archive(stage, tmp_target, interpreter=PYZ_INTERPRETER, compressed=compressed)
+            os.replace(tmp_target, PYZ_PATH)
+    except (OSError, RuntimeError, py_compile.PyCompileError) as exc:
+        print(f"⛔ .pyz oluşturulamadı: {exc}")
+        return None
+    size_mb = PYZ_PATH.stat().st_size / (1024 * 1024)
+    extra = f", {len(PYZ_VENDOR)} paket gömülü" if vendor else ""
+    print(
+        f"✅ {PYZ_PATH} ({len(modules)} modül{extra}, {size_mb:.1f} MB, "
+        f"{time.perf_counter() - t0:.1f}s)"
+    )
+    return PYZ_PATH
+
+
+def pyz_benchmark(pyz: Path, runs: int = 0) -> Dict[str, Dict[str, Optional[float]]]:
+    """.pyz ile kaynaktan çalıştırmanın açılış sürelerini karşılaştır (medyan ms).
+
+    Kaynak iki kez ölçülür: __pycache__ ile ve her açılışta derleyerek
+    (boş PYTHONPYCACHEPREFIX; yeni kopyalanmış kaynak ağacı gibi).
+    """
+    runs = runs or BENCH_RUNS or 5
+    commands = {"giris --version": ["giris", "--version"], "status": ["status"]}
+    table: Dict[str, Dict[str, Optional[float]]] = {}
+    with tempfile.TemporaryDirectory() as empty:
+        no_cache = dict(os.environ, PYTHONPYCACHEPREFIX=empty, PYTHONDONTWRITEBYTECODE="1")
+        variants = (
+            (".pyz", [sys.executable, str(pyz)], None),
+            ("kaynak", [sys.executable, str(PYZ_ENTRY)], None),
+            ("kaynak, pycache yok", [sys.executable, str(PYZ_ENTRY)], no_cache),
+        )
+        for label, args in commands.items():
+            row: Dict[str, Optional[float]] = {}
+            for variant, base, env in variants:
+                # status: 1 = oturum kapalı (ölçüm için geçerli)
+                samples = _time_runs(base + args, runs, env, ok_codes=(0, 1))
+                row[variant] = statistics.median(samples) if samples else None
+            table[label] = row
+
+    print(f"\n--- Açılış: .pyz ve kaynak (medyan, {runs} çalıştırma) ---")
+    names = [variant for variant, _, _ in variants]
+    print(f"{'':18s}" + "".join(f"{name:>22s}" for name in names))
+    for label, row in table.items():
+        cells = "".join(f"{row[n]:19.0f} ms" if row[n] is not None else f"{'hata':>22s}" for n in names)
+        print(f"{label:18s}{cells}")
+    return table
+
+
+def create_pyz() -> None:
+    vendor = input("Bağımlılıklar (requests, bs4, ...) gömülsün mü? (e/h): ").strip().lower() == "e"
+    write_layout_manifest()
+    pyz = build_pyz(vendor=vendor)
+    if pyz is not None:
+        pyz_benchmark(pyz)
+
+
+def write_layout_manifest() -> None:
+    # Runtime exe'ler OUTPUT_DIR'de; GSB_Dosyalar'ı yoklamadan bulsunlar.
+    write_manifest(probe_layout(lambda: BASE_DIR), OUTPUT_DIR)
+
+
+def save_credentials(version: int) -> bool:
+    """Hesap bilgisini config deposuna yaz; build gerekmez."""
+    print(f"--- {version}. hesap ---")
     tc = input("TC/username gir: ").strip()
     sifre = getpass.getpass("Şifre gir (gizli): ").strip()
 
     if not tc or not sifre:
         print("⛔ TC ve şifre boş olamaz.")
-        return
+        return False
+
+    t0 = time.perf_counter()
+    path = write_account(ASSETS_DIR, version, tc, sifre)
+    print(f"✅ Kaydedildi: {path} ({(time.perf_counter() - t0) * 1000:.1f} ms)")
+    return True
 
+
+def giris_target(version: int) -> BuildTarget:
     exe_name = "GSB_Giriş" if version == 1 else "GSB_Giriş2"
     icon_path = ICONS_DIR / ("GSB_Giris.ico" if version == 1 else "GSB_Giris2.ico")
     create_login_icon(icon_path, with_badge_two=(version == 2))
-
-    script_content = LOGIN_TEMPLATE.format(
-        username=repr(tc),
-        password=repr(sifre),
-        login_page_url=repr(LOGIN_PAGE_URL),
-        auth_url=repr(AUTH_URL),
-    )
-
-    build_exe(script_content, exe_name, icon_path)
+    return BuildTarget(exe_name, LOGIN_ENTRY[version], icon_path, BUILD_MODE)
 
 
-def create_cikis() -> None:
+def cikis_target() -> BuildTarget:
     exe_name = "GSB_Çıkış"
     icon_path = ICONS_DIR / "GSB_Cikis.ico"
     create_logout_icon(icon_path)
+    return BuildTarget(exe_name, LOGOUT_ENTRY, icon_path, BUILD_MODE)
 
-    script_content = LOGOUT_TEMPLATE.format(
-        portal_url=repr(PORTAL_URL),
-        logout_url=repr(LOGOUT_URL),
-    )
 
-    build_exe(script_content, exe_name, icon_path)
+def create_giris(version: int) -> None:
+    if not account_path(ASSETS_DIR, version).exists() and not save_credentials(version):
+        return
+    write_layout_manifest()
+    build_targets([giris_target(version)])
+
+
+def create_cikis() -> None:
+    write_layout_manifest()
+    build_targets([cikis_target()])
+
+
+def create_all() -> None:
+    write_layout_manifest()
+    build_targets([giris_target(1), giris_target(2), cikis_target()])
+
+
+def choose_mode() -> None:
+    global BUILD_MODE
+    modes = list(BUILD_MODES)
+    for i, mode in enumerate(modes, 1):
+        print(f"{i}) {mode}" + (" (seçili)" if mode == BUILD_MODE else ""))
+    choice = input("Mod: ").strip()
+    if choice.isdigit() and 1 <= int(choice) <= len(modes):
+        BUILD_MODE = modes[int(choice) - 1]
+        print(f"Paketleme modu: {BUILD_MODE}")
+    else:
+        print("Geçersiz seçim.")
 
 
 def menu() -> None:
@@ -495,7 +702,12 @@ def menu() -> None:
         print("1) GSB_Giriş oluştur")
         print("2) GSB_Giriş2 oluştur")
         print("3) GSB_Çıkış oluştur")
-        print("4) Çık")
+        print("4) Hepsini oluştur (paralel)")
+        print("5) Hesap bilgisi güncelle (build yok)")
+        print(f"6) Paketleme modu (şu an: {BUILD_MODE})")
+        print("7) Modların açılış süresini karşılaştır (GSB_Giriş)")
+        print("8) Linux .pyz oluştur (giriş/çıkış/durum, açılış ölçümü)")
+        print("9) Çık")
         choice = input("Seçim: ").strip()
 
         if choice == "1":
@@ -505,6 +717,21 @@ def menu() -> None:
         elif choice == "3":
             create_cikis()
         elif choice == "4":
+            create_all()
+        elif choice == "5":
+            version = input("Hesap (1/2): ").strip()
+            if version in {"1", "2"}:
+                save_credentials(int(version))
+            else:
+                print("Geçersiz seçim.")
+        elif choice == "6":
+            choose_mode()
+        elif choice == "7":
+            write_layout_manifest()
+            compare_modes(giris_target(1))
+        elif choice == "8":
+            create_pyz()
+        elif choice == "9":
             print("Çıkılıyor...")
             return
         else:
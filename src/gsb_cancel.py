@@ -0,0 +1,99 @@
+import socket
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Uçtaki isteği beklemeden durdurma (durum penceresindeki "İptal").
+#
+# Worker thread jetonu activate() ile etkinleştirir; HTTP katmanları
+# (gsb_http, gsb_adapters) açtıkları soketleri current() jetonuna kaydeder.
+# cancel() kayıtlı soketleri shutdown() ile keser: bloklu connect/recv
+# hemen hata döner, retry beklemeleri (sleep) jetonun olayında beklediği
+# için anında biter ve Cancelled yükselir.
+
+
+class Cancelled(BaseException):
+    """İşlem iptal edildi.
+
+    asyncio.CancelledError gibi BaseException'dan türer: yol üstündeki
+    "except Exception" blokları (kota yoklama vb.) iptali yutmaz.
+    """
+
+
+def _abort(sock: socket.socket) -> None:
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+
+class CancelToken:
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._sockets: "weakref.WeakSet[socket.socket]" = weakref.WeakSet()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            sockets = list(self._sockets)
+        for sock in sockets:
+            _abort(sock)
+
+    def check(self) -> None:
+        if self._event.is_set():
+            raise Cancelled()
+
+    def sleep(self, seconds: float) -> None:
+        """time.sleep gibi, ama iptalde hemen Cancelled yükseltir."""
+        if self._event.wait(max(0.0, seconds)):
+            raise Cancelled()
+
+    def register(self, sock: Optional[socket.socket]) -> None:
+        if sock is None:
+            return
+        with self._lock:
+            if not self._event.is_set():
+                self._sockets.add(sock)
+                return
+        _abort(sock)
+
+    def unregister(self, sock: Optional[socket.socket]) -> None:
+        with self._lock:
+            self._sockets.discard(sock)
+
+    @contextmanager
+    def activate(self) -> Iterator["CancelToken"]:
+        """Bu thread'deki HTTP çağrıları bu jetonla iptal edilebilir olsun."""
+        previous = getattr(_local, "token", None)
+        _local.token = self
+        try:
+            yield self
+        finally:
+            _local.token = previous
+
+
+class _NeverCancelled(CancelToken):
+    """Etkin jeton yokken: kayıt tutmaz, iptal edilemez."""
+
+    def cancel(self) -> None:
+        pass
+
+    def register(self, sock: Optional[socket.socket]) -> None:
+        pass
+
+
+_local = threading.local()
+NEVER = _NeverCancelled()
+
+
+def current() -> CancelToken:
+    return getattr(_local, "token", None) or NEVER
+
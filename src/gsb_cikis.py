@@ -1,65 +1,97 @@
 import socket
+import sys
 import time
-
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-
+from typing import Any, Tuple
+from urllib.parse import urlsplit
+
+import gsb_breaker
+import gsb_eyeballs
+import gsb_latency
+import gsb_transport
+from gsb_breaker import BREAKER_NAME, BREAKER_SETTINGS, CircuitBreaker, CircuitOpenError
+from gsb_cancel import CancelToken, current
+from gsb_config import apply_settings, read_settings
+from gsb_eyeballs import ADDRESS_SETTINGS, ADDRESSES, ADDRESSES_NAME
+from gsb_latency import LATENCY_NAME, LIMIT_SETTINGS, LatencyModel
+from gsb_layout import cfg_dir
+from gsb_metrics import LOGOUT_DURATION, LOGOUT_OUTCOMES, RETRIES
+from gsb_metrics import flush as flush_metrics
+from gsb_metrics import serve_from_env as serve_metrics
+from gsb_portal import DEFAULT as DEFAULT_PORTAL
+from gsb_portal import PortalProfile, load_profile
+from gsb_state import update_state
+from gsb_transport import TRANSPORT_SETTINGS, HTTPSession
+from gsb_transport import build_session as build_http_session
 from gsb_ui import run_with_status, show_error, show_info, show_rich_info
 
-PORTAL_URL = "https://wifi.gsb.gov.tr/"
-LOGOUT_URL = "https://wifi.gsb.gov.tr/logout"
+# Uçlar ve imzalar portal profilinden (bkz. gsb_portal, "portal_profile" ayarı)
+PORTAL = DEFAULT_PORTAL
+PORTAL_URL = PORTAL.portal_url
+LOGOUT_URL = PORTAL.logout_url
 
+# Ölçüm yokken kullanılan zaman aşımları; sonrası gsb_latency.
 CONNECT_TIMEOUT = 4
 READ_TIMEOUT = 8
 MAX_ATTEMPT = 4
 
+# "requests" veya "lite" (stdlib http.client; bkz. gsb_http / gsb_transport)
+HTTP_BACKEND = "requests"
+
+LATENCY = LatencyModel()
+BREAKER = CircuitBreaker()
+
+# settings.json'da değiştirilebilen sabitler
+RUNTIME_SETTINGS = {
+    "portal_url": str,
+    "logout_url": str,
+    "connect_timeout": float,
+    "read_timeout": float,
+    "max_attempt": int,
+    "http_backend": str,
+}
+
+
+def _looks_like_login_page(response: Any) -> bool:
+    return PORTAL.is_login_response(response)
+
+
+def use_profile(profile: PortalProfile) -> None:
+    global PORTAL, PORTAL_URL, LOGOUT_URL
+    PORTAL = profile
+    PORTAL_URL = profile.portal_url
+    LOGOUT_URL = profile.logout_url
+
+
+def build_session() -> HTTPSession:
+    return build_http_session(HTTP_BACKEND, LATENCY, BREAKER)
 
-def _looks_like_login_page(html_text: str, url: str = "") -> bool:
-    body = (html_text or "").lower()
-    url_l = (url or "").lower()
-    return (
-        "j_spring_security_check" in body
-        or "j_username" in body
-        or "name=\"j_username\"" in body
-        or "login.html" in url_l
-        or "/login" in url_l
-    )
-
-
-def build_session() -> requests.Session:
-    session = requests.Session()
-
-    retries = Retry(
-        total=5,
-        connect=5,
-        read=3,
-        backoff_factor=0.4,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["GET", "POST"],
-    )
-    adapter = HTTPAdapter(max_retries=retries, pool_connections=10, pool_maxsize=10)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-
-    session.trust_env = False
-    session.headers.update(
-        {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Connection": "keep-alive",
-        }
-    )
-    return session
+
+def request_timeout(url: str) -> Tuple[float, float]:
+    return LATENCY.timeout(url, (CONNECT_TIMEOUT, READ_TIMEOUT))
 
 
 def dns_precheck(url: str) -> None:
-    host = url.split("//", 1)[-1].split("/", 1)[0]
-    socket.getaddrinfo(host, 443)
+    # Port içeren URL'lerde (yerel simülatör) host yalnızca adres kısmıdır.
+    socket.getaddrinfo(urlsplit(url).hostname or "", 443)
 
 
 def do_logout():
+    start = time.perf_counter()
+    outcome = "cancelled"
+    try:
+        ok, msg, outcome = _do_logout()
+    finally:
+        LOGOUT_OUTCOMES.inc(outcome=outcome)
+        LOGOUT_DURATION.observe(time.perf_counter() - start)
+    # Anlık durum (--status): oturum yoksa da kapalı sayılır.
+    if outcome in ("success", "no_session"):
+        update_state(cfg_dir(), "logout", logged_in=False, error="")
+    else:
+        update_state(cfg_dir(), "logout", error=msg)
+    return ok, msg
+
+
+def _do_logout():
     try:
         try:
             dns_precheck(LOGOUT_URL)
@@ -73,52 +105,83 @@ def do_logout():
         for attempt in range(1, MAX_ATTEMPT + 1):
             resp = session.get(
                 LOGOUT_URL,
-                timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                timeout=request_timeout(LOGOUT_URL),
                 allow_redirects=True,
                 headers={"Referer": PORTAL_URL},
             )
 
             last_info = f"HTTP {resp.status_code} | final: {resp.url}"
-            url_l = resp.url.lower()
 
             if resp.status_code not in (200, 302, 303):
-                time.sleep(min(0.6 * attempt, 2.0))
+                RETRIES.inc(kind="attempt")
+                current().sleep(LATENCY.retry_sleep(attempt, LOGOUT_URL))
                 continue
 
             # Net logout sayfası/hinti
-            if "logout=1" in url_l or "cikisson" in url_l or "cikis" in url_l:
-                return True, "Çıkış başarılı."
+            if PORTAL.logout_confirmed(resp.url):
+                return True, "Çıkış başarılı.", "success"
 
             # Login sayfasına düştüysek: ya çıkış yapıldı ya da zaten giriş yok.
-            if _looks_like_login_page(resp.text, resp.url):
+            if _looks_like_login_page(resp):
                 # Bu durumda kullanıcıya net bilgi verelim.
-                return False, "Çıkış yapılamadı: Aktif oturum bulunamadı (zaten çıkış yapılmış olabilir)."
+                return (
+                    False,
+                    "Çıkış yapılamadı: Aktif oturum bulunamadı (zaten çıkış yapılmış olabilir).",
+                    "no_session",
+                )
 
             # Son kontrol: portal ana sayfası login'e düşüyorsa (oturum yok)
             try:
-                check = session.get(PORTAL_URL, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), allow_redirects=True)
-                if _looks_like_login_page(check.text, check.url):
-                    return True, "Çıkış başarılı."
+                check = session.get(PORTAL_URL, timeout=request_timeout(PORTAL_URL), allow_redirects=True)
+                if _looks_like_login_page(check):
+                    return True, "Çıkış başarılı.", "success"
             except Exception:
                 pass
 
-            time.sleep(min(0.6 * attempt, 2.0))
+            RETRIES.inc(kind="attempt")
+            current().sleep(LATENCY.retry_sleep(attempt, LOGOUT_URL))
 
-        return False, f"Çıkış yapılamadı: Sistem beklenen yanıtı vermedi. ({last_info})"
+        return False, f"Çıkış yapılamadı: Sistem beklenen yanıtı vermedi. ({last_info})", "portal_error"
+    except CircuitOpenError as exc:
+        return False, f"Çıkış yapılamadı: {exc}", "circuit_open"
     except Exception as exc:  # noqa: BLE001
-        return False, f"Çıkış yapılamadı: Sistem hatası ({exc})."
+        return False, f"Çıkış yapılamadı: Sistem hatası ({exc}).", "portal_unreachable"
 
 
-def main() -> None:
-    result = run_with_status("GSB Çıkış", "Çıkış yapılıyor...", do_logout)
-    if not result:
-        return
+def load_settings() -> None:
+    settings = read_settings(cfg_dir())
+    use_profile(load_profile(cfg_dir(), str(settings.get("portal_profile") or "")))
+    apply_settings(sys.modules[__name__], settings, RUNTIME_SETTINGS)
+    apply_settings(gsb_latency, settings, LIMIT_SETTINGS)
+    apply_settings(gsb_breaker, settings, BREAKER_SETTINGS)
+    apply_settings(gsb_transport, settings, TRANSPORT_SETTINGS)
+    apply_settings(gsb_eyeballs, settings, ADDRESS_SETTINGS)
+    LATENCY.load(cfg_dir() / LATENCY_NAME)
+    ADDRESSES.load(cfg_dir() / ADDRESSES_NAME)
+    BREAKER.load(cfg_dir() / BREAKER_NAME)
 
-    ok, msg = result
-    if ok:
-        show_rich_info("GSB Çıkış", "✅ Çıkış yapıldı", msg)
-    else:
-        show_error("GSB Çıkış", f"⛔ {msg}")
+
+def main() -> None:
+    if "--version" in sys.argv[1:]:
+        # Builder'ın açılış ölçümü: import'lar yüklendi, UI/ağ yok.
+        print(f"GSB_Çıkış (Python {sys.version.split()[0]})")
+        sys.exit(0)
+    load_settings()
+    serve_metrics(cfg_dir())
+    try:
+        result = run_with_status("GSB Çıkış", "Çıkış yapılıyor...", do_logout, cancel=CancelToken())
+        if not result:
+            return
+
+        ok, msg = result
+        if ok:
+            show_rich_info("GSB Çıkış", "✅ Çıkış yapıldı", msg)
+        else:
+            show_error("GSB Çıkış", f"⛔ {msg}")
+    finally:
+        LATENCY.save()
+        ADDRESSES.save()
+        flush_metrics(cfg_dir())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Config deposu: hesap bilgileri ve ayarlar GSB_Dosyalar altında düz JSON
+# dosyalarıdır. Exe'ler bunları çalışma anında okur; bilgi değişikliği için
+# yeniden build gerekmez.
+SETTINGS_NAME = "settings.json"
+
+
+def account_path(cfg_dir: Path, account_id: int) -> Path:
+    return cfg_dir / f"config_giris{account_id}.json"
+
+
+def _write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def read_account(cfg_dir: Path, account_id: int) -> Optional[Dict[str, str]]:
+    data = _read_json(account_path(cfg_dir, account_id))
+    if data and data.get("username") and data.get("password"):
+        return {"username": str(data["username"]), "password": str(data["password"])}
+    return None
+
+
+def write_account(cfg_dir: Path, account_id: int, username: str, password: str) -> Path:
+    path = account_path(cfg_dir, account_id)
+    _write_json_atomic(path, {"username": username, "password": password})
+    return path
+
+
+def read_settings(cfg_dir: Path) -> Dict[str, Any]:
+    """settings.json (varsa). Bilinmeyen anahtarlar yok sayılır."""
+    return _read_json(cfg_dir / SETTINGS_NAME) or {}
+
+
+def write_settings(cfg_dir: Path, settings: Dict[str, Any]) -> Path:
+    path = cfg_dir / SETTINGS_NAME
+    _write_json_atomic(path, settings)
+    return path
+
+
+_TRUE_WORDS = ("1", "true", "yes", "on")
+_FALSE_WORDS = ("0", "false", "no", "off")
+
+
+def _parse_bool(value: Any) -> bool:
+    """JSON bool, 0/1 veya "true/false, yes/no, on/off" (büyük/küçük harf fark etmez).
+
+    bool("false") True olduğundan bool() kullanılmaz; tanınmayan değer ValueError.
+    """
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        word = value.strip().lower()
+        if word in _TRUE_WORDS:
+            return True
+        if word in _FALSE_WORDS:
+            return False
+    raise ValueError(f"mantıksal değer değil: {value!r}")
+
+
+def apply_settings(module: Any, settings: Dict[str, Any], keys: Dict[str, type]) -> None:
+    """settings içindeki izinli anahtarları modül sabitlerine uygula.
+
+    keys: {"connect_timeout": float, ...}; modüldeki sabit adı anahtarın büyük
+    harfli halidir (CONNECT_TIMEOUT). Tipi uymayan değerler atlanır (sabit
+    varsayılanında kalır).
+    """
+    for key, cast in keys.items():
+        if key not in settings:
+            continue
+        try:
+            value = _parse_bool(settings[key]) if cast is bool else cast(settings[key])
+        except (TypeError, ValueError):
+            continue
+        setattr(module, key.upper(), value)
@@ -0,0 +1,113 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+# Öğrenilmiş uç noktalar (ör. kota sayfası), portal profili başına.
+#
+# Kotayı veren adres, istek yöntemi ve alan düzeni (hangi desenin eşleştiği)
+# isabet/ıska sayılarıyla saklanır; sonraki çalıştırma önce bunları dener,
+# sayfa taraması (discover_quota_urls) ancak hepsi ıskalarsa yapılır. Art
+# arda DEMOTE_MISSES kez ıskalayan adres taramanın arkasına düşer, FORGET_MISSES
+# kez ıskalayan silinir. Bir isabet ıska serisini sıfırlar.
+
+DEMOTE_MISSES = 3
+FORGET_MISSES = 10
+
+# Bu kadar eski kayıtlar (portal değişmiş olabilir) yok sayılır.
+STALE_SECONDS = 30 * 24 * 3600.0
+
+
+class Endpoint(NamedTuple):
+    url: str
+    method: str
+    layout: int  # eşleşen alan deseninin sırası
+    hits: int
+    misses: int  # art arda ıska
+    updated: float
+
+    @property
+    def demoted(self) -> bool:
+        return self.misses >= DEMOTE_MISSES
+
+
+class EndpointBook:
+    """profil -> tür ("quota") -> öğrenilmiş uç noktalar."""
+
+    def __init__(self) -> None:
+        self.path: Optional[Path] = None
+        self._lock = threading.Lock()
+        self._rows: Dict[str, Dict[str, Dict[str, Endpoint]]] = {}
+
+    def load(self, path: Path) -> None:
+        self.path = path
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        rows: Dict[str, Dict[str, Dict[str, Endpoint]]] = {}
+        for profile, kinds in (data or {}).items():
+            for kind, items in (kinds or {}).items():
+                for item in items or []:
+                    try:
+                        ep = Endpoint(
+                            str(item["url"]),
+                            str(item.get("method") or "GET"),
+                            int(item.get("layout") or 0),
+                            int(item.get("hits") or 0),
+                            int(item.get("misses") or 0),
+                            float(item["updated"]),
+                        )
+                    except (TypeError, ValueError, KeyError, AttributeError):
+                        continue
+                    if now - ep.updated <= STALE_SECONDS:
+                        rows.setdefault(profile, {}).setdefault(kind, {})[ep.url] = ep
+        with self._lock:
+            self._rows = rows
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            data: Dict[str, Any] = {
+                profile: {kind: [ep._asdict() for ep in items.values()] for kind, items in kinds.items()}
+                for profile, kinds in self._rows.items()
+            }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def ranked(self, profile: str, kind: str) -> List[Endpoint]:
+        """Denenecek sıra: düşürülmemişler, en çok isabet ve en yeni önce."""
+        with self._lock:
+            items = list((self._rows.get(profile) or {}).get(kind, {}).values())
+        return sorted(items, key=lambda ep: (ep.demoted, ep.misses, -ep.hits, -ep.updated))
+
+    def hit(self, profile: str, kind: str, url: str, method: str = "GET", layout: int = 0) -> Endpoint:
+        with self._lock:
+            items = self._rows.setdefault(profile, {}).setdefault(kind, {})
+            old = items.get(url)
+            ep = Endpoint(url, method, layout, (old.hits if old else 0) + 1, 0, time.time())
+            items[url] = ep
+            return ep
+
+    def miss(self, profile: str, kind: str, url: str) -> Optional[Endpoint]:
+        """Iskayı say; FORGET_MISSES'e ulaşan adres silinir (None döner)."""
+        with self._lock:
+            items = (self._rows.get(profile) or {}).get(kind)
+            if not items or url not in items:
+                return None
+            old = items[url]
+            if old.misses + 1 >= FORGET_MISSES:
+                del items[url]
+                return None
+            ep = old._replace(misses=old.misses + 1, updated=time.time())
+            items[url] = ep
+            return ep
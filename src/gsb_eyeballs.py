@@ -0,0 +1,297 @@
+import errno
+import json
+import os
+import selectors
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from gsb_cancel import current
+from gsb_flight import locked
+from gsb_metrics import HEDGES
+
+# Happy Eyeballs (RFC 8305): portal host'u birden çok IPv4/IPv6 adresine
+# çözüldüğünde bağlantı denemeleri sırayla değil, aralıklı başlatılarak
+# yarıştırılır. İlk deneme CONNECTION_ATTEMPT_DELAY içinde bağlanmazsa bir
+# sonraki adres de denenir; ilk bağlanan kazanır, diğerleri kapatılır. Ölü
+# (blackhole) bir ilk adres böylece 4 s connect zaman aşımı yerine ~250 ms'ye
+# mal olur.
+#
+# Adres geçmişi (son kazanan, adres başına hatalar) addresses.json'da
+# saklanır: son kazanan önce, yakın zamanda hata veren adresler en sona
+# konur; sonraki çalıştırmalar ölü adresi hiç beklemez. Aynı anda kaydeden
+# exe'lerin kayıtları host başına birleştirilir. İki backend de
+# (gsb_adapters, gsb_http) bağlantıyı create_connection() ile kurar.
+
+ADDRESSES_NAME = "addresses.json"
+
+# settings.json ile değiştirilebilir (bkz. ADDRESS_SETTINGS)
+CONNECTION_ATTEMPT_DELAY = 0.25
+ADDRESS_FAILURE_SECONDS = 60.0
+ADDRESS_FAILURE_MAX_SECONDS = 3600.0
+
+ADDRESS_SETTINGS = {
+    "connection_attempt_delay": float,
+    "address_failure_seconds": float,
+    "address_failure_max_seconds": float,
+}
+
+# Bu kadar eski kayıtlar (ağ değişmiş olabilir) yok sayılır.
+STALE_SECONDS = 7 * 24 * 3600.0
+
+_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY, getattr(errno, "WSAEWOULDBLOCK", -1)}
+
+
+class AddressStat(NamedTuple):
+    failures: int
+    penalty_until: float
+    updated: float
+
+
+def _read_book(path: Path) -> Optional[Tuple[Dict[str, Tuple[str, float]], Dict[str, Dict[str, AddressStat]]]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    winners: Dict[str, Tuple[str, float]] = {}
+    stats: Dict[str, Dict[str, AddressStat]] = {}
+    if not isinstance(data, dict):
+        return winners, stats
+    for host, row in (data.get("hosts") or {}).items():
+        try:
+            if row.get("winner"):
+                winners[host] = (str(row["winner"]), float(row["won"]))
+            stats[host] = {
+                ip: AddressStat(int(v[0]), float(v[1]), float(v[2])) for ip, v in (row.get("addresses") or {}).items()
+            }
+        except (TypeError, ValueError, KeyError, IndexError, AttributeError):
+            continue
+    return winners, stats
+
+
+class AddressBook:
+    """host -> son kazanan adres ve adres başına hata geçmişi."""
+
+    def __init__(self) -> None:
+        self.path: Optional[Path] = None
+        self._lock = threading.Lock()
+        self._winners: Dict[str, Tuple[str, float]] = {}
+        self._stats: Dict[str, Dict[str, AddressStat]] = {}
+
+    def load(self, path: Path) -> None:
+        self.path = path
+        book = _read_book(path)
+        if book is None:
+            return
+        with self._lock:
+            self._winners, self._stats = book
+
+    def save(self) -> None:
+        """Diske yaz; başka exe'lerin kayıtları kaybolmasın diye host başına birleştir.
+
+        Oku-birleştir-yaz addresses.json.lock kilidi altında yapılır; kazanan ve
+        adres kayıtlarında daha yeni olan kalır.
+        """
+        if self.path is None:
+            return
+        try:
+            with locked(self.path):
+                winners, stats = _read_book(self.path) or ({}, {})
+                with self._lock:
+                    for host, (ip, won) in self._winners.items():
+                        if host not in winners or won >= winners[host][1]:
+                            winners[host] = (ip, won)
+                    for host, rows in self._stats.items():
+                        merged = stats.setdefault(host, {})
+                        for ip, stat in rows.items():
+                            old = merged.get(ip)
+                            if old is None or stat.updated >= old.updated:
+                                merged[ip] = stat
+                    for host, (ip, won) in list(winners.items()):
+                        # Kazanan sonradan hata verdiyse artık kazanan değildir.
+                        stat = (stats.get(host) or {}).get(ip)
+                        if stat is not None and stat.failures and stat.updated > won:
+                            del winners[host]
+                    self._winners, self._stats = winners, stats
+                    data = self._dump(time.time())
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                tmp.write_text(json.dumps(data), encoding="utf-8")
+                os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def _dump(self, now: float) -> Dict[str, Any]:
+        hosts: Dict[str, Any] = {}
+        for host in set(self._winners) | set(self._stats):
+            winner = self._winners.get(host)
+            addresses = {
+                ip: list(s) for ip, s in (self._stats.get(host) or {}).items() if now - s.updated <= STALE_SECONDS
+            }
+            row: Dict[str, Any] = {"addresses": addresses}
+            if winner and now - winner[1] <= STALE_SECONDS:
+                row.update(winner=winner[0], won=winner[1])
+            if addresses or "winner" in row:
+                hosts[host] = row
+        return {"hosts": hosts}
+
+    def succeeded(self, host: str, ip: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._winners[host] = (ip, now)
+            # Silmek yerine sıfırla: save() diskteki eski hata kaydını geri getirmesin.
+            self._stats.setdefault(host, {})[ip] = AddressStat(0, 0.0, now)
+
+    def failed(self, host: str, ip: str) -> None:
+        now = time.time()
+        with self._lock:
+            rows = self._stats.setdefault(host, {})
+            old = rows.get(ip)
+            failures = 1 if old is None or now - old.updated > STALE_SECONDS else old.failures + 1
+            penalty = min(ADDRESS_FAILURE_MAX_SECONDS, ADDRESS_FAILURE_SECONDS * 2 ** (failures - 1))
+            rows[ip] = AddressStat(failures, now + penalty, now)
+            if self._winners.get(host, ("",))[0] == ip:
+                del self._winners[host]
+
+    def order(self, host: str, infos: Sequence[Tuple[Any, ...]]) -> List[Tuple[Any, ...]]:
+        """RFC 8305 §4 sırası: aileler dönüşümlü (ilk gelen aile önce), son
+        kazanan en başta, cezalı adresler en sonda."""
+        families: Dict[int, List[Tuple[Any, ...]]] = {}
+        for info in infos:
+            families.setdefault(info[0], []).append(info)
+        queues = list(families.values())
+        interleaved: List[Tuple[Any, ...]] = []
+        while any(queues):
+            for q in queues:
+                if q:
+                    interleaved.append(q.pop(0))
+        now = time.time()
+        with self._lock:
+            winner = self._winners.get(host, ("",))[0]
+            stats = dict(self._stats.get(host) or {})
+
+        def rank(item: Tuple[int, Tuple[Any, ...]]) -> Tuple[int, int]:
+            idx, info = item
+            ip = info[4][0]
+            stat = stats.get(ip)
+            if stat is not None and stat.penalty_until > now:
+                return 2, idx
+            return (0 if ip == winner else 1), idx
+
+        return [info for _, info in sorted(enumerate(interleaved), key=rank)]
+
+
+ADDRESSES = AddressBook()
+
+
+def _numeric_timeout(timeout: object) -> Optional[float]:
+    # urllib3/http.client "varsayılan" nesneleri sayı değildir: süresiz.
+    return float(timeout) if isinstance(timeout, (int, float)) else None
+
+
+def create_connection(
+    address: Tuple[str, int],
+    timeout: object = socket._GLOBAL_DEFAULT_TIMEOUT,  # type: ignore[attr-defined]
+    source_address: Optional[Tuple[str, int]] = None,
+    socket_options: Optional[Sequence[Tuple[int, int, Any]]] = None,
+    book: Optional[AddressBook] = None,
+) -> socket.socket:
+    """socket.create_connection yerine: adresleri yarıştırır.
+
+    Denemeler etkin iptal jetonuna (gsb_cancel) bağlanmadan önce kaydedilir.
+    Hiçbiri zamanında bağlanmazsa socket.timeout, hepsi hata verirse son
+    hata yükselir.
+    """
+    token = current()
+    token.check()
+    book = ADDRESSES if book is None else book
+    host, port = address
+    limit = _numeric_timeout(timeout)
+    infos = book.order(host, socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM))
+    deadline = None if limit is None else time.monotonic() + limit
+
+    selector = selectors.DefaultSelector()
+    pending: Dict[socket.socket, Tuple[str, float]] = {}
+    winner: Optional[socket.socket] = None
+    error: Optional[OSError] = None
+    next_start = time.monotonic()
+    try:
+        while (infos or pending) and winner is None:
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                break
+            if infos and (not pending or now >= next_start):
+                family, kind, proto, _, addr = infos.pop(0)
+                sock = socket.socket(family, kind, proto)
+                token.register(sock)
+                if pending:
+                    HEDGES.inc(kind="connect")
+                try:
+                    for opt in socket_options or ():
+                        sock.setsockopt(*opt)
+                    if source_address:
+                        sock.bind(source_address)
+                    sock.setblocking(False)
+                    code = sock.connect_ex(addr)
+                except OSError as exc:
+                    code, error = -1, exc
+                if code == 0:
+                    winner = sock
+                    book.succeeded(host, addr[0])
+                    break
+                if code in _IN_PROGRESS:
+                    pending[sock] = (addr[0], now)
+                    selector.register(sock, selectors.EVENT_WRITE)
+                else:
+                    if code != -1:
+                        error = OSError(code, os.strerror(code))
+                    book.failed(host, addr[0])
+                    token.unregister(sock)
+                    sock.close()
+                next_start = time.monotonic() + CONNECTION_ATTEMPT_DELAY
+                continue
+
+            wait = CONNECTION_ATTEMPT_DELAY
+            if infos:
+                wait = min(wait, max(0.0, next_start - now))
+            if deadline is not None:
+                wait = min(wait, max(0.0, deadline - now))
+            events = selector.select(wait)
+            # İptalde kesilen denemeler adrese hata yazılmaz.
+            token.check()
+            for key, _ in events:
+                sock = key.fileobj  # type: ignore[assignment]
+                ip, _started = pending.pop(sock)
+                selector.unregister(sock)
+                code = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if code == 0 and winner is None:
+                    winner = sock
+                    book.succeeded(host, ip)
+                    continue
+                if code:
+                    error = OSError(code, os.strerror(code))
+                    book.failed(host, ip)
+                token.unregister(sock)
+                sock.close()
+                # RFC 8305 §5: bir deneme hata verince sıradaki beklemeden başlar.
+                next_start = time.monotonic()
+    finally:
+        now = time.monotonic()
+        for sock, (ip, started) in pending.items():
+            # Kazanandan en az bir aralık önce başlayıp hâlâ bağlanamamış
+            # adres (blackhole) cezalandırılır; yeni başlamış olanlar değil.
+            if not token.cancelled and (winner is None or now - started >= CONNECTION_ATTEMPT_DELAY):
+                book.failed(host, ip)
+            token.unregister(sock)
+            sock.close()
+        selector.close()
+
+    if winner is None:
+        token.check()
+        if deadline is not None and time.monotonic() >= deadline:
+            raise socket.timeout("timed out")
+        raise error or OSError(f"{host}: adres bulunamadı")
+    winner.settimeout(limit if limit is not None else socket.getdefaulttimeout())
+    return winner
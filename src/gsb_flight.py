@@ -0,0 +1,216 @@
+import json
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, NamedTuple, Optional
+
+from gsb_cancel import current
+
+# Süreçler arası single-flight: aynı hesapla aynı anda iki giriş yapılmaz.
+#
+# İlk süreç (lider) hesap başına bir dosya kilidi alır ve işi yapar; sonucu
+# küçük bir JSON dosyasına yazar. Kilidi alamayan süreç (takipçi) ağa hiç
+# çıkmadan liderin sonucunu bekler ve onu kullanır. Lider çökerse kilit
+# işletim sistemi tarafından bırakılır; takipçi kilidi alıp işi kendisi yapar.
+#
+# Lider kilidi alınca <anahtar>.flight.json'a uçuş kimliğini ve kapsamını
+# (ör. kimlik bilgisi özeti) yazar; sonuç da aynı kimlikle yazılır. Takipçi
+# yalnızca beklediği uçuşun sonucunu kabul eder: az önce bitmiş bir uçuşun
+# ya da başka kapsamın (farklı hesap bilgileri) sonucu paylaşılmaz.
+
+RUN_DIR_NAME = "run"
+POLL_SECONDS = 0.05
+WAIT_SECONDS = 120.0
+# Kısa oku-birleştir-yaz bölümleri (bkz. locked) için en uzun bekleme.
+LOCK_WAIT_SECONDS = 5.0
+
+
+class FlightResult(NamedTuple):
+    value: Any
+    shared: bool  # True: sonuç başka bir süreçten geldi
+
+
+class FlightError(RuntimeError):
+    """Lider süreç hata ile bitti; takipçiye aynı mesaj iletilir."""
+
+
+class FlightTimeout(TimeoutError):
+    pass
+
+
+class FileLock:
+    """Süreçler arası, bloklamayan dosya kilidi (Windows: msvcrt, diğer: fcntl)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> bool:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if sys.platform == "win32":
+                import msvcrt
+
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def wait(self, timeout: float) -> bool:
+        """Kilidi en fazla timeout saniye bekleyerek al."""
+        deadline = time.monotonic() + timeout
+        while not self.acquire():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(POLL_SECONDS)
+        return True
+
+    def release(self) -> None:
+        fd, self._fd = self._fd, None
+        if fd is None:
+            return
+        try:
+            if sys.platform == "win32":
+                import msvcrt
+
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+@contextmanager
+def locked(path: Path, timeout: float = LOCK_WAIT_SECONDS) -> Iterator[None]:
+    """path üzerinde süreçler arası oku-birleştir-yaz bölümü (<ad>.lock).
+
+    Kilit zamanında alınamazsa (asılı kalmış bir süreç) kilitsiz devam edilir:
+    bu dosyalar yardımcıdır, yazılmamaları akışı durdurmamalı.
+    """
+    lock = FileLock(path.with_name(f"{path.name}.lock"))
+    try:
+        held = lock.wait(timeout)
+    except OSError:
+        held = False
+    try:
+        yield
+    finally:
+        if held:
+            lock.release()
+
+
+def _read_json(path: Path) -> Optional[dict]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _write_json(path: Path, data: dict) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class SingleFlight:
+    def __init__(self, run_dir: Path, key: str) -> None:
+        self.lock = FileLock(run_dir / f"{key}.lock")
+        self.flight_path = run_dir / f"{key}.flight.json"
+        self.result_path = run_dir / f"{key}.result.json"
+
+    def _lead(self, fn: Callable[[], Any], scope: str) -> Any:
+        flight = uuid.uuid4().hex
+        try:
+            _write_json(self.flight_path, {"flight": flight, "scope": scope, "started": time.time()})
+            try:
+                value = fn()
+            except Exception as exc:
+                # İptal (gsb_cancel.Cancelled) buraya düşmez: sonuç yazılmaz,
+                # bekleyen takipçi kilidi alıp işi kendisi yapar.
+                error = str(exc) or type(exc).__name__
+                _write_json(self.result_path, {"flight": flight, "finished": time.time(), "error": error})
+                raise
+            # Sonuç kilit bırakılmadan önce yazılır.
+            _write_json(self.result_path, {"flight": flight, "finished": time.time(), "value": value})
+            return value
+        finally:
+            self.lock.release()
+
+    def _running_flight(self, scope: str) -> Optional[str]:
+        """Kilidi tutan uçuşun kimliği.
+
+        None: lider işaretini henüz yazmadı (görünen işaret bitmiş bir
+        uçuşun). "": uçuş başka kapsamda, sonucu paylaşılmaz.
+        """
+        marker = _read_json(self.flight_path)
+        flight = str((marker or {}).get("flight") or "")
+        if not flight or (_read_json(self.result_path) or {}).get("flight") == flight:
+            return None
+        return flight if str(marker.get("scope") or "") == scope else ""
+
+    def _result_of(self, flight: Optional[str]) -> Optional[dict]:
+        if not flight:
+            return None
+        result = _read_json(self.result_path)
+        return result if result and result.get("flight") == flight else None
+
+    def run(
+        self,
+        fn: Callable[[], Any],
+        on_wait: Optional[Callable[[], None]] = None,
+        wait_seconds: float = WAIT_SECONDS,
+        scope: str = "",
+    ) -> FlightResult:
+        if self.lock.acquire():
+            return FlightResult(self._lead(fn, scope), False)
+
+        if on_wait is not None:
+            on_wait()
+        flight: Optional[str] = None
+        deadline = time.monotonic() + wait_seconds
+        while time.monotonic() < deadline:
+            if flight is None:
+                flight = self._running_flight(scope)
+            result = self._result_of(flight)
+            if result is not None:
+                if "error" in result:
+                    raise FlightError(str(result["error"]))
+                return FlightResult(result.get("value"), True)
+            if self.lock.acquire():
+                # Beklenen uçuş son kontrolden sonra bitmiş olabilir; yoksa
+                # lider sonuç yazmadan çöktü ya da uçuş başka kapsamdaydı.
+                result = self._result_of(flight)
+                if result is not None and "error" not in result:
+                    self.lock.release()
+                    return FlightResult(result.get("value"), True)
+                return FlightResult(self._lead(fn, scope), False)
+            current().sleep(POLL_SECONDS)
+        raise FlightTimeout("Devam eden diğer işlem zamanında bitmedi.")
+
+
+def single_flight(
+    cfg_dir: Path,
+    key: str,
+    fn: Callable[[], Any],
+    on_wait: Optional[Callable[[], None]] = None,
+    wait_seconds: float = WAIT_SECONDS,
+    scope: str = "",
+) -> FlightResult:
+    """key başına tek uçuş; sonuç yalnızca aynı scope'taki takipçilerle paylaşılır."""
+    return SingleFlight(cfg_dir / RUN_DIR_NAME, key).run(fn, on_wait, wait_seconds, scope)
@@ -0,0 +1,242 @@
+import argparse
+import re
+import sqlite3
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Kota geçmişi: her girişte ve (isteğe bağlı) arka plan örnekleyicide okunan
+# kota/oturum bilgisi ve gecikme GSB_Dosyalar\history.sqlite3'e yazılır.
+#
+# Satırlar bellekte biriktirilip tek transaction'da eklenir (giriş yolunda
+# disk yazımı yok). Eski veri seyreltilir: 7 günden eski örneklerden saatte
+# bir, 90 günden eskilerden günde bir satır kalır; böylece aylarca örnekleme
+# sonrası da dosya küçük kalır.
+
+HISTORY_NAME = "history.sqlite3"
+
+# (bu süreden eski, kova genişliği) — her kovada hesap başına son satır kalır
+DOWNSAMPLE_RULES = ((7 * 86400, 3600), (90 * 86400, 86400))
+COMPACT_EVERY_SECONDS = 86400.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    account INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    remaining_mb REAL,
+    total_mb REAL,
+    login_at REAL,
+    expires_at REAL,
+    latency_ms REAL,
+    source TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_account_ts ON samples (account, ts);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+class QuotaSample(NamedTuple):
+    account: int
+    ts: float
+    remaining_mb: Optional[float]
+    total_mb: Optional[float]
+    login_at: Optional[float]
+    expires_at: Optional[float]
+    latency_ms: Optional[float]
+    source: str  # "login" | "sampler"
+
+
+class UsageRow(NamedTuple):
+    period: str  # "2026-10-19" veya "2026-W42"
+    used_mb: float
+    remaining_mb: Optional[float]  # dönemin son okuması
+    samples: int
+
+
+def _to_mb(value: str, unit: str) -> Optional[float]:
+    m = re.search(r"[0-9]+(?:[.,][0-9]+)?", value or "")
+    if not m:
+        return None
+    number = float(m.group(0).replace(",", "."))
+    return number * 1024 if unit.upper() == "GB" else number
+
+
+def quota_values(fields: Dict[str, str]) -> Tuple[Optional[float], Optional[float]]:
+    """Kota alanlarından (kalan MB, toplam MB)."""
+    remaining = total = None
+    for key, value in fields.items():
+        m = re.match(r"toplam\s+(kalan\s+)?kota\s*\(\s*(mb|gb)\s*\)", key.strip().lower())
+        if not m:
+            continue
+        if m.group(1):
+            remaining = _to_mb(value, m.group(2))
+        else:
+            total = _to_mb(value, m.group(2))
+    return remaining, total
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fresh = not path.exists()
+    conn = sqlite3.connect(str(path), timeout=5.0)
+    if fresh:
+        # Sadece tablo yokken ayarlanabilir; seyreltme sonrası boş sayfalar geri verilir.
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class HistoryBuffer:
+    """Örnekleri bellekte toplayıp flush() ile toplu ekler (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._rows: List[QuotaSample] = []
+
+    def add(self, sample: QuotaSample) -> None:
+        with self._lock:
+            self._rows.append(sample)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows)
+
+    def flush(self, cfg_dir: Path) -> int:
+        with self._lock:
+            rows, self._rows = self._rows, []
+        if not rows:
+            return 0
+        try:
+            conn = connect(cfg_dir / HISTORY_NAME)
+            try:
+                with conn:
+                    conn.executemany("INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                maybe_compact(conn)
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            # Geçmiş yazılamaması girişi etkilememeli; satırlar sonraki flush'a kalır.
+            with self._lock:
+                self._rows[:0] = rows
+            return 0
+        return len(rows)
+
+
+def compact(conn: sqlite3.Connection, now: Optional[float] = None) -> int:
+    """Eski örnekleri seyrelt: her (hesap, kova) için son satır kalır."""
+    now = time.time() if now is None else now
+    removed = 0
+    with conn:
+        for age, bucket in DOWNSAMPLE_RULES:
+            cutoff = now - age
+            cur = conn.execute(
+                "DELETE FROM samples WHERE ts < ? AND rowid NOT IN ("
+                " SELECT MAX(rowid) FROM samples WHERE ts < ?"
+                " GROUP BY account, CAST(ts / ? AS INTEGER))",
+                (cutoff, cutoff, bucket),
+            )
+            removed += cur.rowcount
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('compacted_at', ?)", (str(now),))
+    if removed:
+        # execute() yalnızca ilk sayfayı geri verir; executescript adımları sonuna kadar yürütür.
+        conn.executescript("PRAGMA incremental_vacuum;")
+    return removed
+
+
+def maybe_compact(conn: sqlite3.Connection) -> None:
+    row = conn.execute("SELECT value FROM meta WHERE key = 'compacted_at'").fetchone()
+    last = float(row[0]) if row else 0.0
+    if time.time() - last >= COMPACT_EVERY_SECONDS:
+        compact(conn)
+
+
+def _period_key(ts: float, period: str) -> str:
+    day = datetime.fromtimestamp(ts).date()
+    if period == "week":
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    return day.isoformat()
+
+
+def usage(
+    conn: sqlite3.Connection, account: int, period: str = "day", since: Optional[float] = None
+) -> List[UsageRow]:
+    """Dönem başına kullanım: ardışık okumalarda kalan kotadaki düşüşlerin toplamı.
+
+    Kalan kota artarsa (yeni paket/sıfırlama) o aralık kullanım sayılmaz.
+    """
+    since = 0.0 if since is None else since
+    # Dönemin ilk düşüşü için bir önceki okuma da gerekir.
+    prev = conn.execute(
+        "SELECT remaining_mb FROM samples WHERE account = ? AND ts < ? AND remaining_mb IS NOT NULL"
+        " ORDER BY ts DESC LIMIT 1",
+        (account, since),
+    ).fetchone()
+    last = prev[0] if prev else None
+    rows: Dict[str, List[float]] = {}
+    order: List[str] = []
+    for ts, remaining in conn.execute(
+        "SELECT ts, remaining_mb FROM samples WHERE account = ? AND ts >= ? AND remaining_mb IS NOT NULL"
+        " ORDER BY ts",
+        (account, since),
+    ):
+        key = _period_key(ts, period)
+        if key not in rows:
+            rows[key] = [0.0, remaining, 0]
+            order.append(key)
+        entry = rows[key]
+        if last is not None and remaining < last:
+            entry[0] += last - remaining
+        entry[1] = remaining
+        entry[2] += 1
+        last = remaining
+    return [UsageRow(k, round(rows[k][0], 1), rows[k][1], int(rows[k][2])) for k in order]
+
+
+def accounts(conn: sqlite3.Connection) -> List[int]:
+    return [row[0] for row in conn.execute("SELECT DISTINCT account FROM samples ORDER BY account")]
+
+
+def _since(days: int) -> float:
+    start = date.today() - timedelta(days=days)
+    return datetime(start.year, start.month, start.day).timestamp()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from gsb_layout import cfg_dir
+
+    ap = argparse.ArgumentParser(prog="gsb_history", description="Hesap başına kota kullanımı")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_usage = sub.add_parser("usage", help="günlük/haftalık kullanım")
+    p_usage.add_argument("--account", type=int, action="append", help="hesap (varsayılan: hepsi)")
+    p_usage.add_argument("--period", choices=("day", "week"), default="day")
+    p_usage.add_argument("--days", type=int, default=30, help="kaç gün geriye")
+    sub.add_parser("compact", help="eski örnekleri şimdi seyrelt")
+    ap.add_argument("--db", type=Path, default=None, help="veritabanı yolu")
+    args = ap.parse_args(argv)
+
+    conn = connect(args.db or cfg_dir() / HISTORY_NAME)
+    try:
+        if args.cmd == "compact":
+            print(f"{compact(conn)} satır silindi.")
+            return 0
+        for account in args.account or accounts(conn):
+            print(f"Hesap {account}:")
+            rows = usage(conn, account, args.period, _since(args.days))
+            if not rows:
+                print("  (veri yok)")
+            for row in rows:
+                left = f"{row.remaining_mb:10.1f} MB kaldı" if row.remaining_mb is not None else ""
+                print(f"  {row.period:10s} {row.used_mb:10.1f} MB kullanıldı {left}  ({row.samples} örnek)")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
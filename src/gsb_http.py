@@ -0,0 +1,450 @@
+import http.client
+import socket
+import time
+import zlib
+from datetime import timedelta, timezone
+from email.utils import parsedate_to_datetime
+from http.cookies import SimpleCookie
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import urlencode, urljoin, urlsplit
+
+import gsb_cancel
+import gsb_eyeballs
+from gsb_cancel import Cancelled
+from gsb_metrics import RETRIES
+
+# Portal akışı için minimal HTTP istemcisi (http.client + ssl).
+#
+# requests/urllib3/idna/charset_normalizer/certifi yüklemeden tek host'a
+# keep-alive, çerez, yönlendirme, form POST ve zaman aşımı sağlar. Arayüz
+# requests.Session'ın kullandığımız kısmıyla aynıdır (get/post, headers,
+# hooks, trust_env); gsb_transport backend seçimini yapar. Sertifikalar
+# işletim sisteminin deposundan doğrulanır (certifi yok).
+
+MAX_REDIRECTS = 10
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+TimeoutArg = Union[None, float, Tuple[Optional[float], Optional[float]]]
+
+
+# requests ile aynı adlarda, ama ondan bağımsız hata sınıfları.
+class RequestException(IOError):
+    pass
+
+
+class ConnectionError(RequestException):  # noqa: A001
+    pass
+
+
+class Timeout(RequestException):
+    pass
+
+
+class ConnectTimeout(ConnectionError, Timeout):
+    pass
+
+
+class NewConnectionError(ConnectionError):
+    """Bağlantı kurulamadı (istek hiç gönderilmedi)."""
+
+
+class ReadTimeout(Timeout):
+    pass
+
+
+class TooManyRedirects(RequestException):
+    pass
+
+
+class RetryError(RequestException):
+    pass
+
+
+class HTTPError(RequestException):
+    pass
+
+
+class Request(NamedTuple):
+    method: str
+    url: str
+    headers: Dict[str, str]
+    body: Optional[bytes]
+
+
+class Response:
+    def __init__(
+        self, request: Request, status_code: int, reason: str, headers: http.client.HTTPMessage, content: bytes
+    ) -> None:
+        self.request = request
+        self.url = request.url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.elapsed = timedelta(0)
+        self.history: List["Response"] = []
+        self.raw = None
+        self._text: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def encoding(self) -> str:
+        ctype = self.headers.get("Content-Type", "")
+        for part in ctype.split(";")[1:]:
+            key, _, value = part.strip().partition("=")
+            if key.lower() == "charset" and value:
+                return value.strip("\"' ")
+        return ""
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            enc = self.encoding
+            try:
+                self._text = self.content.decode(enc or "utf-8")
+            except (LookupError, UnicodeDecodeError):
+                self._text = self.content.decode(enc if enc and enc.lower() != "utf-8" else "latin-1", "replace")
+        return self._text
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise HTTPError(f"{self.status_code} {self.reason} for url: {self.url}")
+
+
+def _timeout_parts(timeout: TimeoutArg) -> Tuple[Optional[float], Optional[float]]:
+    if isinstance(timeout, tuple):
+        return timeout[0], timeout[1]
+    return timeout, timeout
+
+
+def _decode_body(data: bytes, encoding: str) -> bytes:
+    """Content-Encoding'i aç; yarım/bozuk gövde ConnectionError olur (tekrar denenir)."""
+    encoding = (encoding or "").strip().lower()
+    try:
+        if encoding in ("gzip", "x-gzip"):
+            return _decompress(data, 16 + zlib.MAX_WBITS)
+        if encoding == "deflate":
+            try:
+                return _decompress(data, zlib.MAX_WBITS)
+            except zlib.error:
+                return _decompress(data, -zlib.MAX_WBITS)
+    except (zlib.error, EOFError) as exc:
+        raise ConnectionError(f"Bozuk {encoding} gövdesi: {exc}") from exc
+    return data
+
+
+def _decompress(data: bytes, wbits: int) -> bytes:
+    # zlib.decompress kesik akışı her zaman yakalamaz; eof ile doğrula.
+    obj = zlib.decompressobj(wbits)
+    out = obj.decompress(data) + obj.flush()
+    if not obj.eof:
+        raise EOFError("sıkıştırılmış akış yarıda kesildi")
+    return out
+
+
+def _cookie_expires(morsel: Any) -> Optional[float]:
+    """Max-Age (öncelikli) veya Expires'tan son geçerlilik zamanı."""
+    if morsel["max-age"]:
+        try:
+            return time.time() + int(morsel["max-age"])
+        except ValueError:
+            pass
+    if morsel["expires"]:
+        try:
+            when = parsedate_to_datetime(morsel["expires"])
+            if when.tzinfo is None:
+                when = when.replace(tzinfo=timezone.utc)
+            return when.timestamp()
+        except (TypeError, ValueError, IndexError):
+            pass
+    return None
+
+
+class _CookieJar:
+    """Tek portal için yeterli çerez deposu: (domain, path, ad) -> değer."""
+
+    def __init__(self) -> None:
+        self._cookies: Dict[Tuple[str, str, str], Tuple[str, Optional[float]]] = {}
+
+    def extract(self, host: str, headers: http.client.HTTPMessage) -> None:
+        for raw in headers.get_all("Set-Cookie") or []:
+            jar = SimpleCookie()
+            try:
+                jar.load(raw)
+            except Exception:
+                continue
+            for name, morsel in jar.items():
+                domain = (morsel["domain"] or host).lstrip(".").lower()
+                path = morsel["path"] or "/"
+                expires = _cookie_expires(morsel)
+                key = (domain, path, name)
+                if expires is not None and expires <= time.time():
+                    self._cookies.pop(key, None)
+                else:
+                    self._cookies[key] = (morsel.value, expires)
+
+    def header_for(self, host: str, path: str) -> str:
+        now = time.time()
+        pairs = []
+        for (domain, cpath, name), (value, expires) in list(self._cookies.items()):
+            if expires is not None and expires <= now:
+                del self._cookies[(domain, cpath, name)]
+                continue
+            if (host == domain or host.endswith("." + domain)) and path.startswith(cpath):
+                pairs.append(f"{name}={value}")
+        return "; ".join(pairs)
+
+
+class LiteSession:
+    """requests.Session yerine geçen küçük oturum.
+
+    max_retries: bağlantı hatası/zaman aşımı ve status_forcelist yanıtlarında
+    toplam en fazla kaç kez yeniden deneneceği (backoff_factor * 2^(n-1)
+    bekleme). connect_retries/read_retries urllib3 Retry(connect=, read=)
+    gibi bu toplamın içinde ayrı sınırlardır: bağlantı kurulamaması connect,
+    istek gönderildikten sonraki hata/zaman aşımı read bütçesinden düşer.
+    Verilmezse max_retries kullanılır. Her yeniden deneme
+    gsb_retries_total{kind="transport"} sayacına yazılır.
+    model/breaker verilirse gecikme modeli ve devre kesici requests
+    backend'indeki adapter'larla aynı şekilde beslenir.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 0,
+        backoff_factor: float = 0.0,
+        status_forcelist: Tuple[int, ...] = (),
+        model: Any = None,
+        breaker: Any = None,
+        connect_retries: Optional[int] = None,
+        read_retries: Optional[int] = None,
+    ) -> None:
+        self.headers: Dict[str, str] = {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+        self.hooks: Dict[str, List[Callable[..., Any]]] = {"response": []}
+        self.trust_env = False  # proxy/env desteği yok; uyumluluk için
+        self.max_retries = max_retries
+        self.connect_retries = max_retries if connect_retries is None else connect_retries
+        self.read_retries = max_retries if read_retries is None else read_retries
+        self.backoff_factor = backoff_factor
+        self.status_forcelist = tuple(status_forcelist)
+        self.model = model
+        self.breaker = breaker
+        self.cookies = _CookieJar()
+        self._conns: Dict[Tuple[str, str, int], http.client.HTTPConnection] = {}
+
+    # --- requests.Session arayüzü ---
+    def get(self, url: str, **kwargs: Any) -> Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, data: Any = None, **kwargs: Any) -> Response:
+        return self.request("POST", url, data=data, **kwargs)
+
+    def close(self) -> None:
+        for conn in self._conns.values():
+            conn.close()
+        self._conns.clear()
+
+    def __enter__(self) -> "LiteSession":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        data: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: TimeoutArg = None,
+        allow_redirects: bool = True,
+    ) -> Response:
+        body: Optional[bytes] = None
+        extra = dict(headers or {})
+        if isinstance(data, dict):
+            body = urlencode(data).encode("utf-8")
+            if not any(k.lower() == "content-type" for k in extra):
+                extra["Content-Type"] = "application/x-www-form-urlencoded"
+        elif isinstance(data, str):
+            body = data.encode("utf-8")
+        elif data is not None:
+            body = bytes(data)
+
+        start = time.perf_counter()
+        history: List[Response] = []
+        response = self._send(method.upper(), url, body, extra, timeout)
+        while allow_redirects and response.status_code in REDIRECT_CODES and response.headers.get("Location"):
+            if len(history) >= MAX_REDIRECTS:
+                raise TooManyRedirects(f"{MAX_REDIRECTS} yönlendirmeden fazla: {url}")
+            history.append(response)
+            url = urljoin(response.url, response.headers["Location"])
+            if response.status_code == 303 or (response.status_code in (301, 302) and method.upper() == "POST"):
+                method, body = "GET", None
+                extra = {k: v for k, v in extra.items() if k.lower() not in ("content-type", "content-length")}
+            response = self._send(method.upper(), url, body, extra, timeout)
+        response.history = history
+        response.elapsed = timedelta(seconds=time.perf_counter() - start)
+        for hook in self.hooks.get("response", []):
+            response = hook(response) or response
+        return response
+
+    # --- iç kısım ---
+    def _merged_headers(self, extra: Dict[str, str]) -> Dict[str, str]:
+        merged: Dict[str, Tuple[str, str]] = {k.lower(): (k, v) for k, v in self.headers.items()}
+        for k, v in extra.items():
+            merged[k.lower()] = (k, v)
+        return {k: v for k, v in merged.values() if v is not None}
+
+    def _connection(self, scheme: str, host: str, port: int, connect_t: Optional[float]) -> Tuple[Any, Optional[float]]:
+        key = (scheme, host, port)
+        conn = self._conns.get(key)
+        if conn is not None and conn.sock is not None:
+            return conn, None
+        if scheme == "https":
+            import ssl
+
+            conn = http.client.HTTPSConnection(host, port, timeout=connect_t, context=ssl.create_default_context())
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=connect_t)
+        # Adresler yarıştırılır (gsb_eyeballs); soketler bağlanmadan önce iptal
+        # jetonuna kaydedilir (bkz. gsb_cancel).
+        conn._create_connection = gsb_eyeballs.create_connection  # type: ignore[attr-defined]
+        t0 = time.perf_counter()
+        try:
+            conn.connect()
+        except socket.timeout as exc:
+            conn.close()
+            raise ConnectTimeout(f"{host}:{port} bağlantı zaman aşımı ({connect_t} s)") from exc
+        except OSError as exc:
+            conn.close()
+            raise NewConnectionError(f"{host}:{port} bağlantı hatası: {exc}") from exc
+        # HTTPS'te TLS sarmalı yeni bir soket nesnesi; onu da kaydet.
+        gsb_cancel.current().register(conn.sock)
+        self._conns[key] = conn
+        return conn, time.perf_counter() - t0
+
+    def _send(self, method: str, url: str, body: Optional[bytes], extra: Dict[str, str], timeout: TimeoutArg) -> Response:
+        probe = self.breaker.before_request(url) if self.breaker is not None else False
+        if probe:
+            budget = {"total": 0, "connect": 0, "read": 0}
+        else:
+            budget = {"total": self.max_retries, "connect": self.connect_retries, "read": self.read_retries}
+        connect_t, read_t = _timeout_parts(timeout)
+        while True:
+            try:
+                response = self._send_once(method, url, body, extra, connect_t, read_t)
+            except Cancelled:
+                if self.breaker is not None and probe:
+                    self.breaker.release_probe(url)
+                raise
+            except (Timeout, ConnectionError) as exc:
+                if gsb_cancel.current().cancelled:
+                    # Soket iptal ile kesildi: portal hatası sayılmaz.
+                    if self.breaker is not None and probe:
+                        self.breaker.release_probe(url)
+                    raise Cancelled() from exc
+                timed_out = isinstance(exc, Timeout)
+                kind = "connect" if isinstance(exc, (ConnectTimeout, NewConnectionError)) else "read"
+                if self._retry(budget, kind):
+                    continue
+                if self.breaker is not None:
+                    if timed_out:
+                        self.breaker.record(url, False, probe)
+                    elif probe:
+                        # Bağlantı reddi/DNS portal hatası sayılmaz (bkz. gsb_adapters).
+                        self.breaker.release_probe(url)
+                raise
+            if response.status_code in self.status_forcelist and method in ("GET", "POST"):
+                if self._retry(budget, "status"):
+                    continue
+                if self.breaker is not None:
+                    self.breaker.record(url, False, probe)
+                raise RetryError(f"{url}: çok fazla hata yanıtı (HTTP {response.status_code})")
+            if self.breaker is not None:
+                self.breaker.record(url, response.status_code < 500, probe)
+            return response
+
+    def _retry(self, budget: Dict[str, int], kind: str) -> bool:
+        """Bütçede yer varsa harca, say ve bekle; yoksa False."""
+        if budget["total"] <= 0 or budget.get(kind, 1) <= 0:
+            return False
+        budget["total"] -= 1
+        if kind in budget:
+            budget[kind] -= 1
+        RETRIES.inc(kind="transport")
+        self._backoff(self.max_retries - budget["total"])
+        return True
+
+    def _backoff(self, attempt: int) -> None:
+        if self.backoff_factor and attempt > 1:
+            gsb_cancel.current().sleep(self.backoff_factor * (2 ** (attempt - 1)))
+
+    def _send_once(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        extra: Dict[str, str],
+        connect_t: Optional[float],
+        read_t: Optional[float],
+    ) -> Response:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise RequestException(f"Desteklenmeyen adres: {url}")
+        host = parts.hostname or ""
+        port = parts.port or (443 if scheme == "https" else 80)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+        headers = self._merged_headers(extra)
+        cookie = self.cookies.header_for(host.lower(), parts.path or "/")
+        if cookie:
+            headers["Cookie"] = cookie
+        request = Request(method, url, headers, body)
+
+        # Bekleyen keep-alive bağlantısı sunucu tarafından kapatılmış olabilir:
+        # yeniden kullanılan bağlantıda bir kez yeni bağlantıyla tekrar dene.
+        for reused_try in (True, False):
+            try:
+                conn, connect_s = self._connection(scheme, host, port, connect_t)
+            except ConnectTimeout:
+                if self.model is not None and connect_t is not None:
+                    self.model.record_url(url, connect_t, None)
+                raise
+            reused = connect_s is None
+            if conn.sock is not None:
+                conn.sock.settimeout(read_t)
+                if reused:
+                    gsb_cancel.current().register(conn.sock)
+            t0 = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                raw = conn.getresponse()
+                ttfb = time.perf_counter() - t0
+                content = _decode_body(raw.read(), raw.getheader("Content-Encoding", ""))
+            except socket.timeout as exc:
+                self._drop(scheme, host, port)
+                if self.model is not None and read_t is not None:
+                    self.model.record_url(url, connect_s, read_t)
+                raise ReadTimeout(f"{host} okuma zaman aşımı ({read_t} s)") from exc
+            except (http.client.HTTPException, OSError) as exc:
+                self._drop(scheme, host, port)
+                if reused and reused_try:
+                    continue
+                raise ConnectionError(f"{host}: {exc}") from exc
+            break
+
+        if raw.will_close:
+            self._drop(scheme, host, port)
+        if self.model is not None:
+            self.model.record_url(url, connect_s, ttfb)
+        self.cookies.extract(host.lower(), raw.msg)
+        return Response(request, raw.status, raw.reason, raw.msg, content)
+
+    def _drop(self, scheme: str, host: str, port: int) -> None:
+        conn = self._conns.pop((scheme, host, port), None)
+        if conn is not None:
+            conn.close()
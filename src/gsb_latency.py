@@ -0,0 +1,179 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+from gsb_flight import locked
+
+# Portal gecikmesinden öğrenilen zaman aşımları.
+#
+# Her uç için bağlantı (host başına) ve yanıt (host+path başına) süresinin
+# EWMA ortalaması ve sapması tutulur (TCP RTO hesabı gibi: srtt + 4*rttvar).
+# Portal sağlıklıyken zaman aşımları tabana iner, hatalar çabuk görünür;
+# yavaş olduğu biliniyorsa tavana kadar sabırlı davranılır. Model
+# çalıştırmalar arasında GSB_Dosyalar\latency.json'da saklanır; aynı anda
+# kaydeden exe'lerin ölçümleri uç başına birleştirilir.
+
+LATENCY_NAME = "latency.json"
+
+# settings.json ile değiştirilebilir (bkz. LIMIT_SETTINGS)
+CONNECT_TIMEOUT_FLOOR = 1.0
+CONNECT_TIMEOUT_CEILING = 10.0
+READ_TIMEOUT_FLOOR = 2.5
+READ_TIMEOUT_CEILING = 30.0
+RETRY_SLEEP_FLOOR = 0.2
+RETRY_SLEEP_CEILING = 3.0
+
+LIMIT_SETTINGS = {
+    "connect_timeout_floor": float,
+    "connect_timeout_ceiling": float,
+    "read_timeout_floor": float,
+    "read_timeout_ceiling": float,
+    "retry_sleep_floor": float,
+    "retry_sleep_ceiling": float,
+}
+
+ALPHA = 0.125  # srtt ağırlığı
+BETA = 0.25  # rttvar ağırlığı
+DEVIATIONS = 4.0
+# Bu kadar eski ölçümler (ağ değişmiş olabilir) yok sayılır.
+STALE_SECONDS = 7 * 24 * 3600.0
+
+
+class LatencyStat(NamedTuple):
+    srtt: float
+    rttvar: float
+    samples: int
+    updated: float
+
+    def update(self, sample: float, now: float) -> "LatencyStat":
+        rttvar = (1 - BETA) * self.rttvar + BETA * abs(self.srtt - sample)
+        srtt = (1 - ALPHA) * self.srtt + ALPHA * sample
+        return LatencyStat(srtt, rttvar, self.samples + 1, now)
+
+    def bound(self) -> float:
+        return self.srtt + DEVIATIONS * self.rttvar
+
+
+def _first_stat(sample: float, now: float) -> LatencyStat:
+    return LatencyStat(sample, sample / 2.0, 1, now)
+
+
+def _clamp(value: float, floor: float, ceiling: float) -> float:
+    return max(floor, min(ceiling, value))
+
+
+def endpoint_keys(url: str) -> Tuple[str, str]:
+    """(host, host+path): bağlantı host'a, yanıt süresi uca bağlıdır."""
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    return host, host + (parts.path or "/")
+
+
+def _read_stats(path: Path) -> Optional[Dict[str, Dict[str, LatencyStat]]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    stats: Dict[str, Dict[str, LatencyStat]] = {"connect": {}, "read": {}}
+    if not isinstance(data, dict):
+        return stats
+    for kind in stats:
+        for key, row in (data.get(kind) or {}).items():
+            try:
+                stats[kind][key] = LatencyStat(*(float(v) for v in row[:2]), int(row[2]), float(row[3]))
+            except (TypeError, ValueError, IndexError):
+                continue
+    return stats
+
+
+class LatencyModel:
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, LatencyStat]] = {"connect": {}, "read": {}}
+
+    def load(self, path: Path) -> None:
+        self.path = path
+        stats = _read_stats(path)
+        if stats is None:
+            return
+        with self._lock:
+            self._stats = stats
+
+    def save(self) -> None:
+        """Diske yaz; başka exe'lerin ölçümleri kaybolmasın diye uç başına birleştir.
+
+        Oku-birleştir-yaz latency.json.lock kilidi altında yapılır; her uç için
+        daha yeni ölçüm (updated) kazanır.
+        """
+        if self.path is None:
+            return
+        try:
+            with locked(self.path):
+                on_disk = _read_stats(self.path) or {}
+                with self._lock:
+                    for kind, rows in self._stats.items():
+                        merged = on_disk.setdefault(kind, {})
+                        for key, stat in rows.items():
+                            old = merged.get(key)
+                            if old is None or stat.updated >= old.updated:
+                                merged[key] = stat
+                    self._stats = {kind: dict(on_disk.get(kind) or {}) for kind in ("connect", "read")}
+                    data = {kind: {k: list(s) for k, s in rows.items()} for kind, rows in self._stats.items()}
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                tmp.write_text(json.dumps(data), encoding="utf-8")
+                os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def record(self, kind: str, key: str, seconds: float) -> None:
+        now = time.time()
+        with self._lock:
+            rows = self._stats[kind]
+            old = rows.get(key)
+            if old is None or now - old.updated > STALE_SECONDS:
+                rows[key] = _first_stat(seconds, now)
+            else:
+                rows[key] = old.update(seconds, now)
+
+    def record_url(self, url: str, connect: Optional[float], read: Optional[float]) -> None:
+        host, endpoint = endpoint_keys(url)
+        if connect is not None:
+            self.record("connect", host, connect)
+        if read is not None:
+            self.record("read", endpoint, read)
+            # Hiç görülmemiş uçlar için host geneli
+            self.record("read", host + " *", read)
+
+    def _stat(self, kind: str, *keys: str) -> Optional[LatencyStat]:
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                stat = self._stats[kind].get(key)
+                if stat is not None and now - stat.updated <= STALE_SECONDS:
+                    return stat
+        return None
+
+    def timeout(self, url: str, default: Tuple[float, float]) -> Tuple[float, float]:
+        """(connect, read) zaman aşımı. Ölçüm yoksa default kullanılır."""
+        host, endpoint = endpoint_keys(url)
+        conn = self._stat("connect", host)
+        read = self._stat("read", endpoint, host + " *")
+        connect_t = (
+            _clamp(conn.bound(), CONNECT_TIMEOUT_FLOOR, CONNECT_TIMEOUT_CEILING) if conn else float(default[0])
+        )
+        read_t = _clamp(read.bound(), READ_TIMEOUT_FLOOR, READ_TIMEOUT_CEILING) if read else float(default[1])
+        return connect_t, read_t
+
+    def retry_sleep(self, attempt: int, url: str) -> float:
+        """Denemeler arası bekleme: portal hızlıysa kısa, yavaşsa uzun."""
+        host, endpoint = endpoint_keys(url)
+        read = self._stat("read", endpoint, host + " *")
+        if read is None:
+            return min(0.6 * attempt, 2.0)
+        return _clamp(read.srtt * attempt, RETRY_SLEEP_FLOOR, RETRY_SLEEP_CEILING)
@@ -0,0 +1,161 @@
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Kurulum düzeni (sistem kökü, config, ikonlar, uygulama klasörü) bir kez çözülür
+# ve exe'nin yanındaki küçük bir manifest'e yazılır. Sonraki çalıştırmalar
+# dosya sistemini yoklamak yerine sadece bu dosyayı okur.
+MANIFEST_NAME = "gsb_layout.json"
+MANIFEST_VERSION = 1
+
+ICON_NAMES = ("icon.ico", "GSB_Giris.ico", "favicon.png", "icon.png")
+
+_cache: Optional[Dict[str, str]] = None
+
+
+def zipapp_path() -> Optional[Path]:
+    """.pyz içinden çalışıyorsak arşivin yolu (__file__ arşivin içini gösterir)."""
+    here = Path(__file__).resolve().parent
+    return here if here.is_file() else None
+
+
+def packaged() -> bool:
+    return bool(getattr(sys, "frozen", False)) or zipapp_path() is not None
+
+
+def exe_dir() -> Path:
+    if getattr(sys, "frozen", False):
+        return Path(sys.executable).resolve().parent
+    archive = zipapp_path()
+    if archive is not None:
+        return archive.parent
+    return Path(__file__).resolve().parent
+
+
+def manifest_path(base: Optional[Path] = None) -> Path:
+    return (base or exe_dir()) / MANIFEST_NAME
+
+
+def probe_system_root() -> Path:
+    """Runtime exe'leri (veya .pyz) için GSB_Dosyalar'ı içeren klasörü bul."""
+    if packaged():
+        exe = exe_dir()
+        # Preferred layout:
+        # - Desktop\GSB\GSB.exe
+        # - Desktop\GSB_Sistem\Uygulama\(GSB_Giris.exe, ...)
+        # - Desktop\GSB_Sistem\GSB_Dosyalar\config_*.json
+        candidates = [
+            exe.parent,  # ...\GSB_Sistem\Uygulama içindeyiz
+            exe,  # doğrudan ...\GSB_Sistem (veya eski düzen) içindeyiz
+            exe.parent / "GSB_Sistem",  # Desktop\GSB yanındaki Desktop\GSB_Sistem
+        ]
+        for root in candidates:
+            if (root / "GSB_Dosyalar").is_dir():
+                return root
+        return exe
+
+    # Source run: this file lives in ...\GSB_Dosyalar\src\
+    return Path(__file__).resolve().parents[2]
+
+
+def probe_icon(system_root: Path) -> Optional[Path]:
+    base = exe_dir()
+    dirs: List[Path] = [
+        system_root / "GSB_Dosyalar" / "icons",
+        base / "icons",
+        base / "GSB_Dosyalar" / "icons",
+        base.parent / "GSB_Sistem" / "GSB_Dosyalar" / "icons",
+        base.parent / "assets" / "icons",  # dev env
+    ]
+    for d in dirs:
+        for name in ICON_NAMES:
+            p = d / name
+            if p.is_file():
+                return p
+    return None
+
+
+def probe_layout(probe_root: Callable[[], Path] = probe_system_root) -> Dict[str, str]:
+    root = probe_root()
+    cfg = root / "GSB_Dosyalar"
+    try:
+        cfg.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        pass
+    icon = probe_icon(root)
+    return {
+        "version": str(MANIFEST_VERSION),
+        "system_root": str(root),
+        "cfg_dir": str(cfg),
+        "icons_dir": str(cfg / "icons"),
+        "app_dir": str(root / "Uygulama"),
+        "icon": str(icon) if icon else "",
+    }
+
+
+def read_manifest(base: Optional[Path] = None) -> Optional[Dict[str, str]]:
+    try:
+        data = json.loads(manifest_path(base).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != str(MANIFEST_VERSION):
+        return None
+    if not data.get("system_root") or not data.get("cfg_dir"):
+        return None
+    return {k: str(v) for k, v in data.items()}
+
+
+def write_manifest(layout: Dict[str, str], base: Optional[Path] = None) -> bool:
+    path = manifest_path(base)
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(layout, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+        return True
+    except OSError:
+        # exe klasörü yazılabilir olmayabilir; manifest sadece hızlandırma içindir.
+        return False
+
+
+def load_layout(probe_root: Callable[[], Path] = probe_system_root, refresh: bool = False) -> Dict[str, str]:
+    """Manifest'ten düzeni oku; yoksa (veya refresh=True ise) yokla ve yaz.
+
+    Manifest'teki yolların hâlâ geçerli olduğu burada kontrol edilmez; çağıran
+    taraf bir dosyayı bulamazsa refresh=True ile tekrar çağırır.
+    """
+    global _cache
+    if _cache is not None and not refresh:
+        return _cache
+
+    if not refresh:
+        data = read_manifest()
+        if data is not None:
+            _cache = data
+            return data
+
+    layout = probe_layout(probe_root)
+    write_manifest(layout)
+    _cache = layout
+    return layout
+
+
+def pin_layout(system_root: Path) -> Dict[str, str]:
+    """Bu süreç için düzeni system_root'a sabitle; manifest yazılmaz.
+
+    Yük testi gibi araçlar gerçek GSB_Dosyalar'a dokunmadan çalışsın diye.
+    """
+    global _cache
+    _cache = probe_layout(lambda: system_root)
+    return _cache
+
+
+def cfg_dir() -> Path:
+    return Path(load_layout()["cfg_dir"])
+
+
+def icon_path(refresh: bool = False) -> Optional[Path]:
+    icon = load_layout(refresh=refresh).get("icon", "")
+    return Path(icon) if icon else None
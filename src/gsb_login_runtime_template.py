@@ -1,110 +1,161 @@
-import json
+import hashlib
 import os
 import re
 import socket
 import sys
+import threading
 import time
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from urllib.parse import urljoin
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
 
-import requests
 from bs4 import BeautifulSoup
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
+import gsb_breaker
+import gsb_eyeballs
+import gsb_http
+import gsb_latency
+import gsb_transport
+import gsb_wifi
+from gsb_breaker import BREAKER_NAME, BREAKER_SETTINGS, CircuitBreaker, CircuitOpenError
+from gsb_cancel import Cancelled, CancelToken, current
+from gsb_config import apply_settings, read_account, read_settings
+from gsb_eyeballs import ADDRESS_SETTINGS, ADDRESSES, ADDRESSES_NAME
+from gsb_flight import RUN_DIR_NAME, FileLock, FlightError, FlightTimeout, single_flight
+from gsb_history import HistoryBuffer, QuotaSample, quota_values
+from gsb_latency import LATENCY_NAME, LIMIT_SETTINGS, LatencyModel
+from gsb_layout import load_layout
+from gsb_metrics import LOGIN_ATTEMPTS, LOGIN_DURATION, LOGIN_OUTCOMES, RETRIES
+from gsb_metrics import flush as flush_metrics
+from gsb_metrics import serve_from_env as serve_metrics
+from gsb_portal import DEFAULT as DEFAULT_PORTAL
+from gsb_portal import PortalProfile, load_profile, response_encoding
+from gsb_progress import ProgressChannel
+from gsb_scheduler import Scheduler
+from gsb_state import main as state_main
+from gsb_state import cached_quota, format_age, read_state, sample_fields, update_state
+from gsb_session import SessionTimes, read_sessions, record_session, session_times
+from gsb_transport import TRANSPORT_SETTINGS, HTTPSession, request_errors
+from gsb_transport import build_session as build_http_session
 from gsb_ui import run_with_status, show_error, show_info, show_rich_info
+from gsb_wifi import WIFI_NAME, WIFI_SETTINGS, SSIDCache, start_link_watcher
 
-# Builder tarafından replace edilir: 1 veya 2
+# Giriş script'leri (GSB_Giriş.py / GSB_Giriş2.py) tarafından ayarlanır: 1 veya 2
 ACCOUNT_ID = 1
 
-PORTAL_URL = "https://wifi.gsb.gov.tr"
-LOGIN_PAGE_URL = "https://wifi.gsb.gov.tr/login.html"
-AUTH_URL = ""  # boşsa form action'dan bulunur
+# Portal uçları, form alanları ve imzalar profilden gelir (bkz. gsb_portal).
+# settings.json'da "portal_profile": "<ad>" GSB_Dosyalar\portals\<ad>.json'u
+# seçer; portal_url vb. anahtarlar profilin de üzerine yazar.
+PORTAL = DEFAULT_PORTAL
+PORTAL_URL = PORTAL.portal_url
+LOGIN_PAGE_URL = PORTAL.login_page_url
+AUTH_URL = PORTAL.auth_url  # boşsa form action'dan bulunur
 
+# Ölçüm yokken (ilk çalıştırma) kullanılan zaman aşımları; sonrası gsb_latency.
 CONNECT_TIMEOUT = 4
 READ_TIMEOUT = 8
 MAX_LOGIN_ATTEMPT = 4
 
-# SSID kontrolü sadece "ön bilgilendirme" içindir; portal erişimi asıl doğrulamadır.
-WIFI_SSID_HINTS = ("GSBWIFI",)
-
-
-def build_session() -> requests.Session:
-    session = requests.Session()
-
-    retries = Retry(
-        total=5,
-        connect=5,
-        read=3,
-        backoff_factor=0.4,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["GET", "POST"],
-    )
-    adapter = HTTPAdapter(max_retries=retries, pool_connections=10, pool_maxsize=10)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-
-    session.trust_env = False
-    session.headers.update(
-        {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Connection": "keep-alive",
-        }
-    )
-    return session
+# "requests" veya "lite" (stdlib http.client; bkz. gsb_http / gsb_transport)
+HTTP_BACKEND = "requests"
+
+LATENCY = LatencyModel()
+BREAKER = CircuitBreaker()
+# Kota geçmişi (bkz. gsb_history); girişte biriktirilir, sonuç gösterildikten sonra yazılır.
+HISTORY = HistoryBuffer()
+WIFI = SSIDCache()
+
+# --watch: oturum bitişinden bu kadar önce yeniden giriş; portal uzatmazsa
+# RETRY aralıklarıyla bitişten sonra GRACE süresine kadar denenir.
+RELOGIN_LEAD_SECONDS = 120.0
+RELOGIN_RETRY_SECONDS = 30.0
+RELOGIN_GRACE_SECONDS = 600.0
+WATCH_RESCAN_SECONDS = 60.0
+# --watch: kota sayfasını bu aralıkla örnekleyip geçmişe yaz (0 = kapalı)
+HISTORY_SAMPLE_SECONDS = 0.0
+# --watch: ağ gelince (bağlanma, DHCP, uykudan dönüş) GSB SSID'sindeysek
+# beklemeden giriş yap. Olay patlamaları DEBOUNCE içinde tek işe toplanır;
+# portal WARM süresince (IP/DNS hazır olana kadar) yoklanır.
+LINK_LOGIN = True
+LINK_DEBOUNCE_SECONDS = 1.0
+LINK_WARM_SECONDS = 30.0
+LINK_WARM_RETRY_SECONDS = 0.5
+
+# settings.json'da değiştirilebilen sabitler
+RUNTIME_SETTINGS = {
+    "portal_url": str,
+    "login_page_url": str,
+    "auth_url": str,
+    "connect_timeout": float,
+    "read_timeout": float,
+    "max_login_attempt": int,
+    "http_backend": str,
+    "relogin_lead_seconds": float,
+    "relogin_retry_seconds": float,
+    "history_sample_seconds": float,
+    "link_login": bool,
+    "link_debounce_seconds": float,
+    "link_warm_seconds": float,
+}
+
+
+def build_session() -> HTTPSession:
+    return build_http_session(HTTP_BACKEND, LATENCY, BREAKER)
+
+
+def request_timeout(url: str) -> Tuple[float, float]:
+    return LATENCY.timeout(url, (CONNECT_TIMEOUT, READ_TIMEOUT))
 
 
 def app_base_dir() -> Path:
-    # PyInstaller onefile'da kullanıcıya görünen exe klasörü
-    if getattr(sys, "frozen", False):
-        exe_dir = Path(sys.executable).resolve().parent
-        # Preferred layout:
-        # - Desktop\GSB\GSB.exe
-        # - Desktop\GSB_Sistem\Uygulama\(GSB_Giris.exe, ...)
-        # - Desktop\GSB_Sistem\GSB_Dosyalar\config_*.json
-
-        # 1) If we're inside ...\GSB_Sistem\Uygulama
-        if (exe_dir.parent / "GSB_Dosyalar").exists():
-            return exe_dir.parent
-
-        # 2) If we're directly inside ...\GSB_Sistem
-        if (exe_dir / "GSB_Dosyalar").exists():
-            return exe_dir
-
-        # 3) If we're next to Desktop\GSB, look for Desktop\GSB_Sistem
-        sibling = exe_dir.parent / "GSB_Sistem"
-        if (sibling / "GSB_Dosyalar").exists():
-            return sibling
-
-        # 4) Backward-compatible legacy layout (GSB_Dosyalar next to EXE or parent)
-        if (exe_dir / "GSB_Dosyalar").exists():
-            return exe_dir
-        if (exe_dir.parent / "GSB_Dosyalar").exists():
-            return exe_dir.parent
-
-        return exe_dir
-
-    # Source run: this file lives in ...\GSB_Dosyalar\src\
-    return Path(__file__).resolve().parents[2]
+    # Düzen bir kez çözülüp manifest'e yazılır (bkz. gsb_layout); her tıklamada
+    # exists()/mkdir ile yoklamayız.
+    return Path(load_layout()["system_root"])
 
 
-def config_path() -> Path:
+def config_path(refresh: bool = False) -> Path:
     # Config'i exe'nin yanındaki GSB_Dosyalar altında tutuyoruz
-    base = app_base_dir()
-    cfg_dir = base / "GSB_Dosyalar"
-    cfg_dir.mkdir(parents=True, exist_ok=True)
+    cfg_dir = Path(load_layout(refresh=refresh)["cfg_dir"])
     return cfg_dir / f"config_giris{ACCOUNT_ID}.json"
 
 
-def read_credentials() -> Optional[Dict[str, str]]:
+def load_credentials() -> Optional[Dict[str, str]]:
     path = config_path()
-    if path.exists():
-        data = json.loads(path.read_text(encoding="utf-8"))
-        if data.get("username") and data.get("password"):
-            return {"username": str(data["username"]), "password": str(data["password"])}
+    if not path.exists():
+        # Manifest eskimiş olabilir (klasör taşınmış vb.): düzeni bir kez yeniden çöz.
+        path = config_path(refresh=True)
+    return read_account(path.parent, ACCOUNT_ID)
+
+
+def load_settings() -> None:
+    # GSB_Dosyalar\settings.json sabitlerin üzerine yazar (rebuild gerekmez).
+    cfg_dir = config_path().parent
+    settings = read_settings(cfg_dir)
+    use_profile(load_profile(cfg_dir, str(settings.get("portal_profile") or "")))
+    apply_settings(sys.modules[__name__], settings, RUNTIME_SETTINGS)
+    apply_settings(gsb_latency, settings, LIMIT_SETTINGS)
+    apply_settings(gsb_breaker, settings, BREAKER_SETTINGS)
+    apply_settings(gsb_transport, settings, TRANSPORT_SETTINGS)
+    apply_settings(gsb_eyeballs, settings, ADDRESS_SETTINGS)
+    apply_settings(gsb_wifi, settings, WIFI_SETTINGS)
+    LATENCY.load(cfg_dir / LATENCY_NAME)
+    ADDRESSES.load(cfg_dir / ADDRESSES_NAME)
+    BREAKER.load(cfg_dir / BREAKER_NAME)
+    WIFI.load(cfg_dir / WIFI_NAME)
+
+
+def use_profile(profile: PortalProfile) -> None:
+    global PORTAL, PORTAL_URL, LOGIN_PAGE_URL, AUTH_URL
+    PORTAL = profile
+    PORTAL_URL = profile.portal_url
+    LOGIN_PAGE_URL = profile.login_page_url
+    AUTH_URL = profile.auth_url
+
+
+def read_credentials() -> Optional[Dict[str, str]]:
+    creds = load_credentials()
+    if creds:
+        return creds
 
     show_error(
         "GSB Giriş",
@@ -128,75 +179,42 @@ def resolve_auth_url(html_text: str, fallback_url: str) -> str:
     soup = BeautifulSoup(html_text, "html.parser")
     form = soup.find("form")
     if not form:
-        return urljoin(fallback_url, "/j_spring_security_check")
+        return urljoin(fallback_url, PORTAL.form_action)
 
     action = (form.get("action") or "").strip()
     if not action:
-        return urljoin(fallback_url, "/j_spring_security_check")
+        return urljoin(fallback_url, PORTAL.form_action)
 
     return urljoin(fallback_url, action)
 
 
 def dns_precheck(url: str) -> None:
-    host = url.split("//", 1)[-1].split("/", 1)[0]
-    socket.getaddrinfo(host, 443)
-
-
-def _run_hidden(argv: List[str], timeout: float = 3.0) -> Tuple[int, str, str]:
-    import subprocess
-
-    creationflags = 0
-    startupinfo = None
-    try:
-        creationflags = subprocess.CREATE_NO_WINDOW
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-        startupinfo.wShowWindow = 0
-    except Exception:
-        pass
-
-    p = subprocess.run(
-        argv,
-        capture_output=True,
-        text=True,
-        timeout=timeout,
-        creationflags=creationflags,
-        startupinfo=startupinfo,
-    )
-    return p.returncode, p.stdout or "", p.stderr or ""
+    # Port içeren URL'lerde (yerel simülatör) host yalnızca adres kısmıdır.
+    socket.getaddrinfo(urlsplit(url).hostname or "", 443)
 
 
 def get_wifi_ssid() -> str:
-    if sys.platform != "win32":
-        return ""
-    try:
-        code, out, _ = _run_hidden(["netsh", "wlan", "show", "interfaces"], timeout=2.5)
-        if code != 0:
-            return ""
-        ssid = ""
-        for line in out.splitlines():
-            line_s = line.strip()
-            # SSID satırı (BSSID değil)
-            if line_s.lower().startswith("ssid") and not line_s.lower().startswith("bssid"):
-                parts = line_s.split(":", 1)
-                if len(parts) == 2:
-                    ssid = parts[1].strip()
-                    break
-        return ssid
-    except Exception:
-        return ""
+    # Önbellekli (bkz. gsb_wifi); bilinmiyorsa "" (Windows'ta bağlı değil sayılır).
+    return WIFI.ssid() or ""
 
 
-def preflight_check() -> Tuple[bool, str]:
+def preflight_check(
+    progress: Optional[ProgressChannel] = None, session: Optional[HTTPSession] = None
+) -> Tuple[bool, str]:
+    progress = progress or ProgressChannel(echo=False)
+
+    progress.publish("Ön kontrol", "WiFi")
     ssid = get_wifi_ssid()
     if sys.platform == "win32" and not ssid:
         return False, "WiFi bağlantısı bulunamadı. Önce GSB WiFi ağına bağlan."
 
     # SSID doğru ağa işaret ediyorsa DNS hatası bloklamamalı.
-    ssid_ok = bool(ssid and any(h.lower() in ssid.lower() for h in WIFI_SSID_HINTS))
+    # SSID kontrolü sadece "ön bilgilendirme" içindir; portal erişimi asıl doğrulamadır.
+    ssid_ok = PORTAL.ssid_matches(ssid)
 
     # DNS + portal erişimi (asıl doğrulama)
     dns_ok = True
+    progress.publish("Ön kontrol", "DNS")
     try:
         dns_precheck(LOGIN_PAGE_URL)
     except Exception:
@@ -206,32 +224,38 @@ def preflight_check() -> Tuple[bool, str]:
             return False, "Portal DNS çözümlenemedi. GSB WiFi ağına bağlı olmayabilirsin" + hint
         # SSID doğru — DNS geçici sorun olabilir, HTTP deneyelim.
 
+    progress.publish("Ön kontrol", "portal")
     try:
-        s = build_session()
-        r = s.get(LOGIN_PAGE_URL, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), allow_redirects=True)
+        # Girişin oturumu verilirse aynı (keep-alive) bağlantı girişte de kullanılır.
+        s = session or build_session()
+        r = s.get(LOGIN_PAGE_URL, timeout=request_timeout(LOGIN_PAGE_URL), allow_redirects=True)
         if r.status_code not in (200, 302, 303):
             return False, f"Portal erişimi başarısız (HTTP {r.status_code})."
+    except CircuitOpenError:
+        raise
     except Exception as exc:
         hint = f" (SSID: {ssid})" if ssid else ""
         return False, f"Portal erişilemiyor. GSB WiFi'a bağlı olmayabilirsin{hint}. ({exc})"
 
     # SSID uyarısı (bloklamaz)
-    if ssid and not any(h.lower() in ssid.lower() for h in WIFI_SSID_HINTS):
+    if ssid and not ssid_ok:
         return True, f"Bağlı ağ: {ssid} (GSB WiFi olmayabilir)"
 
     return True, ""
 
 
-def _looks_like_login_page(html_text: str, url: str = "") -> bool:
-    body = (html_text or "").lower()
-    url_l = (url or "").lower()
-    return (
-        "j_spring_security_check" in body
-        or "j_username" in body
-        or "name=\"j_username\"" in body
-        or "login.html" in url_l
-        or "/login" in url_l
-    )
+def _looks_like_login_page(response: Any) -> bool:
+    # Gövde çözülmeden ham byte'larda aranır (bkz. gsb_portal.response_encoding).
+    return PORTAL.is_login_response(response)
+
+
+def _response_html(response: Any) -> str:
+    """Gövdeyi çöz. Karakter kümesi BOM/başlık/<meta>'dan biliniyorsa
+    requests'in charset tahmini (charset_normalizer) atlanır."""
+    encoding = response_encoding(response)
+    if encoding and not isinstance(response, gsb_http.Response):
+        response.encoding = encoding
+    return response.text
 
 
 def _extract_error_message(html_text: str) -> str:
@@ -264,20 +288,9 @@ def _extract_error_message(html_text: str) -> str:
     # Form çevresindeki metinlerde de hata olabilir
     text = " ".join(soup.stripped_strings)
     text_l = text.lower()
-    keywords = (
-        "hatalı",
-        "yanlış",
-        "geçersiz",
-        "başarısız",
-        "kilitl",
-        "deneme",
-        "invalid",
-        "failed",
-        "error",
-    )
-    if any(k in text_l for k in keywords):
+    if PORTAL.error_snippet is not None and "error" in PORTAL.text_signals(text_l):
         # En olası hata cümlesini yakalamaya çalış
-        for m in re.finditer(r"[^.]{0,120}(hatalı|yanlış|geçersiz|başarısız|invalid|failed|error)[^.]{0,120}", text_l):
+        for m in PORTAL.error_snippet.finditer(text_l):
             snippet = text[m.start() : m.end()].strip()
             snippet = re.sub(r"\s+", " ", snippet)
             if 6 <= len(snippet) <= 260:
@@ -298,19 +311,7 @@ def _guess_login_failure_reason(html_text: str) -> str:
         text = (html_text or "").lower()
 
     # Çok genel ama kullanıcı açısından faydalı mesajlar
-    invalid_hints = (
-        "hatalı",
-        "yanlış",
-        "geçersiz",
-        "invalid",
-        "başarısız",
-        "failed",
-        "kullanıcı",
-        "şifre",
-        "sifre",
-    )
-
-    if any(h in text for h in invalid_hints):
+    if "credential" in PORTAL.text_signals(text):
         return "Giriş yapılamadı: TC/şifre yanlış olabilir."
 
     return "Giriş doğrulanamadı: GSB WiFi ağına bağlı olmayabilirsin veya sistem geçici olarak yanıt vermiyor olabilir."
@@ -347,16 +348,8 @@ def _extract_quota_info(html_text: str) -> str:
 
     if fields:
         # Kullanıcıya kısa ama faydalı özet
-        preferred_order = [
-            "Toplam Kalan Kota (MB)",
-            "Toplam Kota (MB)",
-            "Kalan Kota Zamanı",
-            "Sona Erme Tarihi",
-            "Oturum Süresi",
-            "Login Zamanı",
-        ]
         lines: List[str] = []
-        for k in preferred_order:
+        for k in PORTAL.detail_labels:
             if k in fields:
                 lines.append(f"{k}: {fields[k]}")
 
@@ -423,8 +416,7 @@ def _extract_quota_fields(html_text: str) -> Dict[str, str]:
 
 def _quota_headline_and_details(html_text: str) -> Tuple[str, str]:
     fields = _extract_quota_fields(html_text)
-    remaining = fields.get("Toplam Kalan Kota (MB)") or fields.get("Toplam Kalan Kota (GB)")
-    unit = "MB" if "Toplam Kalan Kota (MB)" in fields else ("GB" if "Toplam Kalan Kota (GB)" in fields else "")
+    remaining, unit = PORTAL.remaining_quota(fields)
     if remaining:
         headline = f"Kalan Kota: {remaining} {unit}".strip()
     else:
@@ -433,15 +425,7 @@ def _quota_headline_and_details(html_text: str) -> Tuple[str, str]:
         headline = "Kalan Kota" if not quota_summary else "Kota Bilgileri"
 
     details_lines: List[str] = []
-    order = [
-        "Toplam Kalan Kota (MB)",
-        "Toplam Kota (MB)",
-        "Kalan Kota Zamanı",
-        "Sona Erme Tarihi",
-        "Oturum Süresi",
-        "Login Zamanı",
-    ]
-    for k in order:
+    for k in PORTAL.detail_labels:
         if k in fields:
             details_lines.append(f"{k}: {fields[k]}")
 
@@ -456,7 +440,6 @@ def _quota_headline_and_details(html_text: str) -> Tuple[str, str]:
 
 def _discover_quota_urls(html_text: str, base_url: str) -> List[str]:
     soup = BeautifulSoup(html_text or "", "html.parser")
-    keywords = ("kota", "kalan", "kullanım", "kullanim", "internet", "paket")
     urls: List[str] = []
 
     def add_url(raw_url: str) -> None:
@@ -469,19 +452,19 @@ def _discover_quota_urls(html_text: str, base_url: str) -> List[str]:
             urls.append(full)
 
     for link in soup.find_all("a", href=True):
-        label = f"{link.get_text(' ', strip=True)} {link.get('href', '')}".lower()
-        if any(word in label for word in keywords):
+        label = f"{link.get_text(' ', strip=True)} {link.get('href', '')}"
+        if "quota" in PORTAL.link_kinds(label):
             add_url(link.get("href", ""))
 
     for form in soup.find_all("form"):
         action = form.get("action", "")
-        label = f"{form.get_text(' ', strip=True)} {action}".lower()
-        if any(word in label for word in keywords):
+        label = f"{form.get_text(' ', strip=True)} {action}"
+        if "quota" in PORTAL.link_kinds(label):
             add_url(action)
 
     for element in soup.find_all(attrs={"onclick": True}):
         onclick = element.get("onclick", "")
-        if any(word in onclick.lower() for word in keywords):
+        if "quota" in PORTAL.link_kinds(onclick):
             match = re.search(r"['\"]([^'\"]+)['\"]", onclick)
             if match:
                 add_url(match.group(1))
@@ -505,33 +488,59 @@ def _extract_name_info(html_text: str) -> str:
     return ""
 
 
-def login_once(session: requests.Session, username: str, password: str) -> Tuple[bool, str, str]:
+def login_once(
+    session: HTTPSession,
+    username: str,
+    password: str,
+    progress: Optional[ProgressChannel] = None,
+    info: Optional[Dict[str, str]] = None,
+    account_id: Optional[int] = None,
+    on_confirmed: Optional[Callable[[], None]] = None,
+) -> Tuple[bool, str, str]:
+    """Tek giriş denemesi.
+
+    info verilirse sonuç kategorisi ("outcome") ve kota bilgisinin okunduğu
+    sayfa ("quota_html", oturum bitişi için) yazılır. on_confirmed, POST
+    yanıtı giriş formuna dönmediği anda (doğrulama ve kota sorgusundan önce)
+    çağrılır; GUI onayı bu noktada gösterebilir.
+    """
+    progress = progress or ProgressChannel(echo=False)
+    info = info if info is not None else {}
     start = time.perf_counter()
 
-    login_page = session.get(LOGIN_PAGE_URL, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), allow_redirects=True)
+    progress.publish("Giriş sayfası")
+    login_page = session.get(LOGIN_PAGE_URL, timeout=request_timeout(LOGIN_PAGE_URL), allow_redirects=True)
     if login_page.status_code not in (200, 302, 303):
+        info["outcome"] = "portal_error"
         return False, "", f"Giriş sayfası alınamadı (HTTP {login_page.status_code})."
 
     # Bazı durumlarda zaten giriş yapılmış olur ve login formu dönmez.
-    if not _looks_like_login_page(login_page.text, login_page.url):
-        # Zaten giriş yapılmış olabilir; isim/kota varsa göster.
+    # Sınıflandırma ham byte'larda yapılır; gövde yalnızca gereken dalda
+    # (gizli alanlar, hata mesajı, kota) çözülür.
+    if not _looks_like_login_page(login_page):
         # Zaten giriş yapılmış olabilir; kota ekranını öne çıkar.
-        headline, details = _quota_headline_and_details(login_page.text)
+        login_html = _response_html(login_page)
+        headline, details = _quota_headline_and_details(login_html)
+        info["quota_html"] = login_html
         if details:
             details = "Zaten giriş yapılmış görünüyor.\n" + details
         else:
             details = "Zaten giriş yapılmış görünüyor."
+        info["outcome"] = "already_logged_in"
         return True, headline, details
 
-    auth_url = resolve_auth_url(login_page.text, LOGIN_PAGE_URL)
+    login_html = _response_html(login_page)
+    auth_url = resolve_auth_url(login_html, LOGIN_PAGE_URL)
 
-    payload = extract_hidden_inputs(login_page.text)
-    payload.update({"j_username": username, "j_password": password, "submit": "Login"})
+    payload = extract_hidden_inputs(login_html)
+    payload.update(PORTAL.credentials(username, password))
 
+    progress.publish("Giriş isteği")
+    LOGIN_ATTEMPTS.inc(account=str(account_id or ACCOUNT_ID))
     response = session.post(
         auth_url,
         data=payload,
-        timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+        timeout=request_timeout(auth_url),
         allow_redirects=True,
         headers={"Referer": LOGIN_PAGE_URL, "Content-Type": "application/x-www-form-urlencoded"},
     )
@@ -539,38 +548,56 @@ def login_once(session: requests.Session, username: str, password: str) -> Tuple
     elapsed = time.perf_counter() - start
 
     if response.status_code not in (200, 302, 303):
+        info["outcome"] = "portal_error"
         return False, "", f"Giriş isteği başarısız (HTTP {response.status_code})."
 
-    if _looks_like_login_page(response.text, response.url):
-        real_msg = _extract_error_message(response.text)
+    if _looks_like_login_page(response):
+        info["outcome"] = "credential_error"
+        html = _response_html(response)
+        real_msg = _extract_error_message(html)
         if real_msg:
             return False, "", real_msg
-        return False, "", _guess_login_failure_reason(response.text)
+        return False, "", _guess_login_failure_reason(html)
+
+    if on_confirmed is not None:
+        on_confirmed()
 
+    # Kota okumak için gövde ancak burada (bir kez) çözülür.
+    html = _response_html(response)
     # Son bir doğrulama: portal ana sayfası login'e düşüyorsa giriş olmamıştır.
-    headline, details = _quota_headline_and_details(response.text)
+    headline, details = _quota_headline_and_details(html)
+    if details:
+        info["quota_html"] = html
 
     # Gerekirse portal ana sayfasından tekrar dene
     try:
-        check = session.get(PORTAL_URL, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), allow_redirects=True)
-        if _looks_like_login_page(check.text, check.url):
-            real_msg = _extract_error_message(response.text)
+        progress.publish("Doğrulama")
+        check = session.get(PORTAL_URL, timeout=request_timeout(PORTAL_URL), allow_redirects=True)
+        if _looks_like_login_page(check):
+            info["outcome"] = "credential_error"
+            real_msg = _extract_error_message(html)
             if real_msg:
                 return False, "", real_msg
-            return False, "", _guess_login_failure_reason(response.text)
+            return False, "", _guess_login_failure_reason(html)
+        check_html = _response_html(check) if not details else ""
         if not details:
-            headline, details = _quota_headline_and_details(check.text)
+            headline, details = _quota_headline_and_details(check_html)
+            if details:
+                info["quota_html"] = check_html
 
         # Kota linkleri varsa 2-3 tanesini yokla (çok uzatmadan)
         if not details:
-            candidates = _discover_quota_urls(check.text, check.url)
+            candidates = _discover_quota_urls(check_html, check.url)
             for candidate in candidates[:3]:
+                progress.publish("Kota sorgusu", candidate)
                 try:
-                    qr = session.get(candidate, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), allow_redirects=True)
+                    qr = session.get(candidate, timeout=request_timeout(candidate), allow_redirects=True)
                     if qr.status_code in (200, 302, 303):
-                        headline, details2 = _quota_headline_and_details(qr.text)
+                        qr_html = _response_html(qr)
+                        headline, details2 = _quota_headline_and_details(qr_html)
                         if details2:
                             details = details2
+                            info["quota_html"] = qr_html
                             break
                 except Exception:
                     continue
@@ -578,54 +605,495 @@ def login_once(session: requests.Session, username: str, password: str) -> Tuple
         # doğrulama başarısız olsa da POST başarılı görünüyorsa kullanıcıyı bloklamayalım
         pass
 
+    info["outcome"] = "success"
     msg = f"Giriş başarılı (\u2248 {elapsed:.1f}s)."
     if details:
         msg = msg + "\n" + details
     return True, headline, msg
 
 
-def main() -> None:
+def _quota_sample(account_id: int, quota_html: str, seconds: float, source: str) -> Optional[QuotaSample]:
+    fields = _extract_quota_fields(quota_html)
+    if not fields:
+        return None
+    times = session_times(fields)
+    remaining, total = quota_values(fields)
+    return QuotaSample(
+        account_id, time.time(), remaining, total, times.login_at, times.expires_at, seconds * 1000, source
+    )
+
+
+def _record_login(account_id: int, quota_html: str, seconds: float, headline: str = "") -> None:
+    """Kota alanlarından oturum bitişini sessions.json'a (--watch için), kota
+    okumasını geçmiş tamponuna, son durumu state.json'a (--status) yaz."""
+    cfg_dir = config_path().parent
     try:
-        dns_precheck(LOGIN_PAGE_URL)
+        sample = _quota_sample(account_id, quota_html, seconds, "login") if quota_html else None
+        if sample is None:
+            update_state(cfg_dir, "login", account=account_id, logged_in=True, error="")
+            return
+        record_session(cfg_dir, account_id, SessionTimes(sample.login_at, sample.expires_at))
+        HISTORY.add(sample)
+        update_state(cfg_dir, "login", quota_headline=headline, error="", **sample_fields(sample))
     except Exception:
-        # DNS sorun olsa bile denemeye devam
         pass
 
-    creds = read_credentials()
-    if not creds:
-        return
 
-    session = build_session()
+def sample_quota(session: HTTPSession, account_id: int, source: str = "sampler") -> Optional[QuotaSample]:
+    """Portal ana sayfasından (giriş yapmadan) kota okuması; oturum yoksa None.
 
-    def task() -> Tuple[bool, str, str]:
-        ok_pf, msg_pf = preflight_check()
+    Okunan durum (oturum yok / kota) state.json'a da yazılır.
+    """
+    start = time.perf_counter()
+    cfg_dir = config_path().parent
+    page = session.get(PORTAL_URL, timeout=request_timeout(PORTAL_URL), allow_redirects=True)
+    if page.status_code != 200:
+        update_state(cfg_dir, source, error=f"Portal HTTP {page.status_code}")
+        return None
+    if _looks_like_login_page(page):
+        update_state(cfg_dir, source, logged_in=False, error="")
+        return None
+    html = _response_html(page)
+    if not _extract_quota_fields(html):
+        for candidate in _discover_quota_urls(html, page.url)[:3]:
+            qr = session.get(candidate, timeout=request_timeout(candidate), allow_redirects=True)
+            if qr.status_code != 200:
+                continue
+            qr_html = _response_html(qr)
+            if _extract_quota_fields(qr_html):
+                html = qr_html
+                break
+    sample = _quota_sample(account_id, html, time.perf_counter() - start, source)
+    if sample is not None:
+        headline, _ = _quota_headline_and_details(html)
+        update_state(cfg_dir, source, quota_headline=headline, error="", **sample_fields(sample))
+    return sample
+
+
+def perform_login(
+    session: HTTPSession,
+    creds: Dict[str, str],
+    progress: Optional[ProgressChannel] = None,
+    account_id: Optional[int] = None,
+    on_confirmed: Optional[Callable[[], None]] = None,
+) -> Tuple[bool, str, str]:
+    progress = progress or ProgressChannel(echo=False)
+    account_id = account_id or ACCOUNT_ID
+    account = str(account_id)
+    info: Dict[str, str] = {}
+    start = time.perf_counter()
+    try:
+        ok_pf, msg_pf = preflight_check(progress, session)
         if not ok_pf:
+            info["outcome"] = "portal_unreachable"
             return False, "", msg_pf
 
         warning = msg_pf.strip()
         last_reason = ""
         for attempt in range(1, MAX_LOGIN_ATTEMPT + 1):
-            ok, headline, details_or_reason = login_once(session, creds["username"], creds["password"])
+            progress.publish("Giriş denemesi", f"{attempt}/{MAX_LOGIN_ATTEMPT}")
+            if attempt > 1:
+                RETRIES.inc(kind="attempt")
+            ok, headline, details_or_reason = login_once(
+                session, creds["username"], creds["password"], progress, info, account_id, on_confirmed
+            )
             if ok:
+                _record_login(account_id, info.get("quota_html", ""), time.perf_counter() - start, headline)
                 if warning:
                     # uyarıyı en üste ekle (bloklamaz)
                     details_or_reason = f"Not: {warning}\n{details_or_reason}"
                 return True, headline, details_or_reason
             last_reason = details_or_reason
-            time.sleep(min(0.6 * attempt, 2.0))
+            progress.publish("Bekleme", f"deneme {attempt} başarısız")
+            current().sleep(LATENCY.retry_sleep(attempt, LOGIN_PAGE_URL))
         return False, "", last_reason or "Giriş yapılamadı: Maksimum deneme sayısına ulaşıldı."
+    except CircuitOpenError as exc:
+        # Portal çökük biliniyor: beklemeden cevap ver.
+        info["outcome"] = "circuit_open"
+        return False, "", str(exc)
+    except Cancelled:
+        info["outcome"] = "cancelled"
+        raise
+    except request_errors():
+        info["outcome"] = "portal_unreachable"
+        raise
+    finally:
+        progress.finish()
+        LOGIN_OUTCOMES.inc(account=account, outcome=info.get("outcome", "other"))
+        LOGIN_DURATION.observe(time.perf_counter() - start, account=account)
+
+
+def perform_login_shared(
+    session: HTTPSession,
+    creds: Dict[str, str],
+    progress: Optional[ProgressChannel] = None,
+    account_id: Optional[int] = None,
+    on_confirmed: Optional[Callable[[], None]] = None,
+) -> Tuple[bool, str, str]:
+    """Aynı hesapla süren başka bir giriş varsa ağa çıkmadan onun sonucunu al.
+
+    Çift tıklama / iki kez açılan exe aynı hesabı portalda yarıştırmasın
+    (kilitlenme riski); bkz. gsb_flight.
+    """
+    progress = progress or ProgressChannel(echo=False)
+    account_id = account_id or ACCOUNT_ID
+
+    def on_wait() -> None:
+        progress.publish("Bekleniyor", "devam eden giriş")
+
+    # Hesap bilgileri değiştiyse süren girişin sonucu bu çağrıya ait değildir.
+    scope = hashlib.sha256(f"{creds['username']}\0{creds['password']}".encode("utf-8")).hexdigest()[:16]
+    try:
+        flight = single_flight(
+            config_path().parent,
+            f"login{account_id}",
+            lambda: list(perform_login(session, creds, progress, account_id, on_confirmed)),
+            on_wait,
+            scope=scope,
+        )
+    except (FlightError, FlightTimeout) as exc:
+        progress.finish()
+        return False, "", f"Devam eden giriş başarısız: {exc}"
+    if flight.shared:
+        progress.finish()
+        LOGIN_OUTCOMES.inc(account=str(account_id), outcome="joined")
+    ok, headline, details_or_reason = flight.value
+    if not ok and not flight.shared:
+        update_state(config_path().parent, "login", account=account_id, error=details_or_reason)
+    return bool(ok), headline, details_or_reason
+
+
+def run_headless() -> int:
+    """UI olmadan giriş yap; faz izini stderr'e yaz (GSB_TRACE gerekmez)."""
+    load_settings()
+    creds = load_credentials()
+    if not creds:
+        print("Kullanıcı bilgisi bulunamadı.", file=sys.stderr)
+        return 2
+
+    progress = ProgressChannel(echo=True)
+    try:
+        ok, headline, details_or_reason = perform_login_shared(build_session(), creds, progress)
+    finally:
+        LATENCY.save()
+        ADDRESSES.save()
+        flush_metrics(config_path().parent)
+        HISTORY.flush(config_path().parent)
+    print(("✅ " + (headline or "Giriş yapıldı")) if ok else f"⛔ {details_or_reason}")
+    print("--- Faz izi ---\n" + progress.format_trace(), file=sys.stderr)
+    return 0 if ok else 1
+
+
+def run_refresh() -> int:
+    """--status --refresh'in arka plan yarısı: durumu portaldan yeniden oku."""
+    load_settings()
+    cfg_dir = config_path().parent
+    account_id = int(read_state(cfg_dir).get("account") or ACCOUNT_ID)
+    try:
+        reading = sample_quota(build_session(), account_id, "refresh")
+        if reading is not None:
+            HISTORY.add(reading)
+    except Exception as exc:  # noqa: BLE001
+        update_state(cfg_dir, "refresh", error=f"Portal erişilemiyor ({exc})")
+        return 1
+    finally:
+        LATENCY.save()
+        ADDRESSES.save()
+        HISTORY.flush(cfg_dir)
+    return 0
+
+
+def run_watch() -> int:
+    """Yerleşik mod: oturum bitmeden önce hesapları arka planda yeniden giriş yaptır.
+
+    Oturum bitişleri sessions.json'dan okunur (GUI girişleri de buraya yazar)
+    ve min-heap zamanlayıcıda tutulur; böylece indirme ortasında portal
+    oturumu düşmez. Ağ olaylarında (bağlanma, uykudan dönüş) GSB ağındaysak
+    son kullanılan hesapla hemen giriş yapılır (LINK_LOGIN). Aynı anda tek
+    izleyici çalışır.
+    """
+    load_settings()
+    cfg_dir = config_path().parent
+    lock = FileLock(cfg_dir / RUN_DIR_NAME / "watch.lock")
+    if not lock.acquire():
+        print("İzleyici zaten çalışıyor.", file=sys.stderr)
+        return 3
+    serve_metrics(cfg_dir)
+
+    scheduler = Scheduler()
+    # Kapanışta (Ctrl+C) süren yeniden girişleri beklemeden keser.
+    shutdown = CancelToken()
+    # hesap -> zamanlanmış oturum bitişi
+    tracked: Dict[int, float] = {}
+    # Ağ olayı işi: aynı anda tek kopya; patlamanın ilk olayının zamanı
+    link_busy = threading.Lock()
+    link_since: List[float] = []
+
+    def relogin(account_id: int, expires_at: float) -> None:
+        creds = read_account(cfg_dir, account_id)
+        if creds:
+            progress = ProgressChannel()
+            try:
+                with shutdown.activate():
+                    ok, _, reason = perform_login_shared(build_session(), creds, progress, account_id)
+                if not ok:
+                    print(f"[gsb] hesap {account_id}: {reason}", file=sys.stderr)
+            except Cancelled:
+                return
+            except Exception as exc:  # noqa: BLE001
+                print(f"[gsb] hesap {account_id}: {exc}", file=sys.stderr)
+            finally:
+                LATENCY.save()
+                ADDRESSES.save()
+                flush_metrics(cfg_dir)
+                HISTORY.flush(cfg_dir)
+
+        entry = read_sessions(cfg_dir).get(str(account_id)) or {}
+        new_expiry = float(entry.get("expires_at") or 0.0)
+        now = time.time()
+        if new_expiry > expires_at + 1:
+            plan(account_id, new_expiry)
+        elif creds and now < expires_at + RELOGIN_GRACE_SECONDS:
+            # Portal oturum hâlâ açık dedi (uzatmadı) veya giriş başarısız:
+            # bitişe kadar/sonrasında kısa aralıklarla tekrar dene.
+            scheduler.schedule(account_id, now + RELOGIN_RETRY_SECONDS, lambda: relogin(account_id, expires_at))
+        else:
+            tracked.pop(account_id, None)
+
+    def plan(account_id: int, expires_at: float) -> None:
+        tracked[account_id] = expires_at
+        when = max(time.time(), expires_at - RELOGIN_LEAD_SECONDS)
+        scheduler.schedule(account_id, when, lambda: relogin(account_id, expires_at))
+
+    def rescan() -> None:
+        now = time.time()
+        for key, entry in read_sessions(cfg_dir).items():
+            try:
+                account_id, expires_at = int(key), float(entry.get("expires_at") or 0.0)
+            except (TypeError, ValueError):
+                continue
+            if expires_at > now - RELOGIN_GRACE_SECONDS and tracked.get(account_id) != expires_at:
+                plan(account_id, expires_at)
+        scheduler.schedule("rescan", now + WATCH_RESCAN_SECONDS, rescan)
+
+    def sample() -> None:
+        # Portal oturumu cihaza bağlı: en son giriş yapılan hesabın kotası görünür.
+        now = time.time()
+        sessions = read_sessions(cfg_dir)
+        live = [
+            (float(entry.get("updated") or 0.0), key)
+            for key, entry in sessions.items()
+            if float(entry.get("expires_at") or 0.0) > now
+        ]
+        if live:
+            try:
+                reading = sample_quota(build_session(), int(max(live)[1]))
+                if reading is not None:
+                    HISTORY.add(reading)
+                    HISTORY.flush(cfg_dir)
+            except Exception as exc:  # noqa: BLE001
+                print(f"[gsb] kota örneği alınamadı: {exc}", file=sys.stderr)
+        scheduler.schedule("sample", now + HISTORY_SAMPLE_SECONDS, sample)
+
+    def latest_account() -> int:
+        # Portal oturumu cihaza bağlı: en son giriş yapılan hesap yeniden girer.
+        sessions = read_sessions(cfg_dir)
+        recent = [(float(entry.get("updated") or 0.0), key) for key, entry in sessions.items()]
+        try:
+            return int(max(recent)[1]) if recent else ACCOUNT_ID
+        except ValueError:
+            return ACCOUNT_ID
+
+    def warm_portal() -> Optional[HTTPSession]:
+        """IP/DNS gelene kadar bekle, sonra giriş sayfasını önceden çek.
+
+        DNS yoklaması ağ hazır olmadan portala istek atıp devre kesiciyi
+        açmamak içindir; dönen oturumun açık bağlantısı girişte kullanılır.
+        """
+        deadline = time.monotonic() + LINK_WARM_SECONDS
+        while True:
+            try:
+                dns_precheck(LOGIN_PAGE_URL)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    return None
+                current().sleep(LINK_WARM_RETRY_SECONDS)
+        session = build_session()
+        try:
+            session.get(LOGIN_PAGE_URL, timeout=request_timeout(LOGIN_PAGE_URL), allow_redirects=True)
+        except CircuitOpenError:
+            return None
+        except request_errors():
+            # Giriş akışı kendi denemelerini ve hata mesajını üretir.
+            pass
+        return session
+
+    def link_up() -> None:
+        if not link_busy.acquire(blocking=False):
+            # Süren iş bitince bir kez daha bak (ağ o arada yine değişmiş).
+            scheduler.schedule("link", time.time() + LINK_DEBOUNCE_SECONDS, link_up)
+            return
+        try:
+            since = link_since.pop() if link_since else time.time()
+            link_since.clear()
+            ssid = WIFI.ssid()
+            if ssid is not None and not PORTAL.ssid_matches(ssid):
+                return
+            account_id = latest_account()
+            creds = read_account(cfg_dir, account_id)
+            if not creds:
+                return
+            try:
+                with shutdown.activate():
+                    session = warm_portal()
+                    if session is None:
+                        return
+                    ok, _, reason = perform_login_shared(session, creds, ProgressChannel(), account_id)
+            except Cancelled:
+                return
+            except Exception as exc:  # noqa: BLE001
+                print(f"[gsb] ağ değişti, hesap {account_id}: {exc}", file=sys.stderr)
+                return
+            finally:
+                LATENCY.save()
+                ADDRESSES.save()
+                flush_metrics(cfg_dir)
+                HISTORY.flush(cfg_dir)
+            if not ok:
+                print(f"[gsb] ağ değişti, hesap {account_id}: {reason}", file=sys.stderr)
+                return
+            print(f"[gsb] ağ değişti, hesap {account_id} giriş yaptı ({time.time() - since:.1f} s)", file=sys.stderr)
+            entry = read_sessions(cfg_dir).get(str(account_id)) or {}
+            expires_at = float(entry.get("expires_at") or 0.0)
+            if expires_at > time.time() and tracked.get(account_id) != expires_at:
+                plan(account_id, expires_at)
+        finally:
+            link_busy.release()
+
+    def on_link_change() -> None:
+        # Bağlantı gelince (bkz. start_link_watcher) SSID önbelleği beklemeden düşsün.
+        WIFI.invalidate()
+        if LINK_LOGIN:
+            now = time.time()
+            if not link_since:
+                link_since.append(now)
+            scheduler.schedule("link", now + LINK_DEBOUNCE_SECONDS, link_up)
+
+    start_link_watcher(on_link_change)
+    rescan()
+    if HISTORY_SAMPLE_SECONDS > 0:
+        scheduler.schedule("sample", time.time() + HISTORY_SAMPLE_SECONDS, sample)
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.stop()
+        shutdown.cancel()
+        HISTORY.flush(cfg_dir)
+        lock.release()
+    return 0
+
 
-    result = run_with_status("GSB Giriş", "Giriş yapılıyor...", task)
-    if not result:
+def main() -> None:
+    if "--version" in sys.argv[1:]:
+        # Builder'ın açılış ölçümü (gsb_builder.startup_benchmark): import'lar
+        # yüklendi, UI/ağ yok.
+        print(f"{Path(sys.argv[0]).stem} (Python {sys.version.split()[0]})")
+        sys.exit(0)
+    if "--status" in sys.argv[1:]:
+        sys.exit(state_main(sys.argv[1:]))
+    if "--refresh-state" in sys.argv[1:]:
+        sys.exit(run_refresh())
+    if "--headless" in sys.argv[1:]:
+        sys.exit(run_headless())
+    if "--watch" in sys.argv[1:]:
+        sys.exit(run_watch())
+
+    load_settings()
+    serve_metrics(config_path().parent)
+    try:
+        dns_precheck(LOGIN_PAGE_URL)
+    except Exception:
+        # DNS sorun olsa bile denemeye devam
+        pass
+
+    creds = read_credentials()
+    if not creds:
         return
 
-    ok, headline, details_or_reason = result
-    if ok:
+    session = build_session()
+    progress = ProgressChannel()
+    # "İptal" soketleri keser; worker bu jetonla çalışır (bkz. gsb_cancel).
+    cancel = CancelToken()
+
+    # Giriş ayrı thread'de sürer: POST onaylanınca durum penceresi kapanır ve
+    # son bilinen kota (yaşıyla) hemen gösterilir; doğrulama ve güncel kota
+    # arka planda tamamlanıp aynı pencereyi günceller.
+    confirmed = threading.Event()
+    finished = threading.Event()
+    outcome: Dict[str, Any] = {}
+    # task() bunu döndürürse giriş onaylandı ama sonuç henüz yok.
+    early: Tuple[bool, str, str] = (True, "", "")
+
+    def login() -> None:
+        try:
+            with cancel.activate():
+                outcome["result"] = perform_login_shared(session, creds, progress, on_confirmed=confirmed.set)
+        except BaseException as exc:  # noqa: BLE001
+            outcome["error"] = exc
+        finally:
+            finished.set()
+            confirmed.set()
+
+    def task() -> Tuple[bool, str, str]:
+        threading.Thread(target=login, name="gsb-login", daemon=True).start()
+        while not confirmed.wait(0.1):
+            cancel.check()
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome.get("result", early)
+
+    def quota_line(headline: str) -> str:
         # Sadece 2 bilgi: giriş + kalan kota (koyu, ortalı UI)
-        quota_line = headline.strip() if headline else "Kalan Kota: bulunamadı"
-        show_rich_info("GSB Giriş", "✅ Giriş yapıldı", quota_line)
-    else:
-        show_error("GSB Giriş", f"⛔ {details_or_reason}")
+        return headline.strip() if headline else "Kalan Kota: bulunamadı"
+
+    def final() -> Tuple[bool, str, str]:
+        finished.wait()
+        if "error" in outcome:
+            return False, "⛔ Giriş doğrulanamadı", str(outcome["error"])
+        ok, headline, details_or_reason = outcome["result"]
+        if ok:
+            return True, "✅ Giriş yapıldı", quota_line(headline)
+        return False, f"⛔ {details_or_reason}", ""
+
+    try:
+        result = run_with_status("GSB Giriş", "Giriş yapılıyor...", task, progress=progress, cancel=cancel)
+        if not result:
+            return
+        if result is not early:
+            ok, headline, details_or_reason = result
+            if ok:
+                show_rich_info("GSB Giriş", "✅ Giriş yapıldı", quota_line(headline))
+            else:
+                show_error("GSB Giriş", f"⛔ {details_or_reason}")
+            return
+
+        cached = cached_quota(config_path().parent, ACCOUNT_ID)
+        if cached is not None:
+            stale = f"{cached[0]} ({format_age(time.time() - cached[1])}, güncelleniyor...)"
+        else:
+            stale = "Kalan Kota: güncelleniyor..."
+        show_rich_info("GSB Giriş", "✅ Giriş yapıldı", stale, pending=final)
+        # Pencere erken kapansa da giriş kayıtları (sessions/state/geçmiş) yazılsın.
+        finished.wait()
+    finally:
+        # Metrik/gecikme dosyaları sonuç gösterildikten sonra yazılır (giriş yolunun dışında).
+        LATENCY.save()
+        ADDRESSES.save()
+        flush_metrics(config_path().parent)
+        HISTORY.flush(config_path().parent)
 
 
 if __name__ == "__main__":
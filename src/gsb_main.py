@@ -0,0 +1,41 @@
+import sys
+from typing import List, Optional
+
+# Tek giriş noktası (Linux .pyz paketi; bkz. gsb_builder.build_pyz).
+#
+#   python gsb.pyz giris [--headless|--watch|--version]
+#   python gsb.pyz giris2
+#   python gsb.pyz cikis
+#   python gsb.pyz status [--json] [--refresh]
+#
+# Komut verilmezse "giris" sayılır; "--refresh-state" gibi bayraklar bu
+# yüzden doğrudan runtime'a gider (gsb_state.spawn_refresh arşivi yeniden
+# böyle çalıştırır). Modüller komuta göre geç import edilir: status
+# HTTP/HTML modüllerini hiç yüklemez.
+
+COMMANDS = ("giris", "giris2", "cikis", "status")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = list(sys.argv[1:] if argv is None else argv)
+    command = args.pop(0) if args and args[0] in COMMANDS else "giris"
+    sys.argv = [sys.argv[0], *args]
+
+    if command == "status":
+        import gsb_state
+
+        sys.exit(gsb_state.main(args))
+    if command == "cikis":
+        import gsb_cikis
+
+        gsb_cikis.main()
+        return
+
+    import gsb_login_runtime_template as runtime
+
+    runtime.ACCOUNT_ID = 2 if command == "giris2" else 1
+    runtime.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from gsb_flight import locked
+
+# Giriş/çıkış sağlığı için yerel metrikler (Prometheus text formatı).
+#
+# Güncellemeler metrik başına kısa, çekişmesiz bir kilitle yapılır; dosyaya
+# yazma ve HTTP sunumu giriş yolunun dışında (flush/serve) kalır. Sayaçlar
+# çalıştırmalar arasında birikir: flush() kalıcı duruma bu sürecin farkını ekler.
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0)
+
+
+def _key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _fmt_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ""
+    body = ",".join('{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"')) for k, v in items)
+    return "{" + body + "}"
+
+
+def _fmt_value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if v != int(v) else str(int(v))
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def snapshot(self, drain: bool = False) -> Dict[LabelKey, float]:
+        with self._lock:
+            values = dict(self._values)
+            if drain:
+                self._values.clear()
+            return values
+
+    def render(self, values: Dict[LabelKey, float]) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, v in sorted(values.items()):
+            lines.append(f"{self.name}{_fmt_labels(key)} {_fmt_value(v)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # etiket -> [bucket sayıları..., +Inf sayısı, toplam]
+        self._values: Dict[LabelKey, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _key(labels)
+        # Kilit dışında kova bul; kilit sadece birkaç toplama için tutulur.
+        idx = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                idx = i
+                break
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = [0.0] * (len(self.buckets) + 2)
+                self._values[key] = row
+            row[idx] += 1
+            row[-1] += value
+
+    def snapshot(self, drain: bool = False) -> Dict[LabelKey, List[float]]:
+        with self._lock:
+            values = {k: list(v) for k, v in self._values.items()}
+            if drain:
+                self._values.clear()
+            return values
+
+    def render(self, values: Dict[LabelKey, List[float]]) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, row in sorted(values.items()):
+            cumulative = 0.0
+            for bound, n in zip(self.buckets + (float("inf"),), row[:-1]):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_fmt_labels(key, ('le', _fmt_value(bound)))} {_fmt_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_fmt_labels(key)} {row[-1]!r}")
+            lines.append(f"{self.name}_count{_fmt_labels(key)} {_fmt_value(cumulative)}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Any] = {}
+        self._flush_lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Counter(name, help_text)
+        return metric
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Histogram(name, help_text, buckets)
+        return metric
+
+    def _merged(self, persisted: Dict[str, Any], drain: bool = False) -> Dict[str, Dict[LabelKey, Any]]:
+        merged: Dict[str, Dict[LabelKey, Any]] = {}
+        for name, metric in self._metrics.items():
+            values: Dict[LabelKey, Any] = {}
+            for raw_key, raw_val in (persisted.get(name) or {}).items():
+                key = _key(json.loads(raw_key))
+                values[key] = list(raw_val) if isinstance(metric, Histogram) else float(raw_val)
+            for key, val in metric.snapshot(drain).items():
+                if isinstance(metric, Histogram):
+                    old = values.get(key)
+                    if old is None or len(old) != len(val):
+                        values[key] = val
+                    else:
+                        values[key] = [a + b for a, b in zip(old, val)]
+                else:
+                    values[key] = values.get(key, 0.0) + val
+            merged[name] = values
+        return merged
+
+    def render(self, persisted: Optional[Dict[str, Any]] = None) -> str:
+        merged = self._merged(persisted or {})
+        lines: List[str] = []
+        for name, metric in self._metrics.items():
+            lines.extend(metric.render(merged[name]))
+        return "\n".join(lines) + "\n"
+
+    def flush(self, state_path: Path, textfile_path: Optional[Path] = None) -> None:
+        """Bu sürecin farkını kalıcı duruma ekle ve textfile-collector dosyasını yaz.
+
+        Giriş, çıkış ve --watch aynı anda flush edebilir: oku-birleştir-yaz
+        süreçler arası dosya kilidi altında yapılır, farklar kaybolmaz.
+        """
+        with self._flush_lock, locked(state_path):
+            persisted = _read_state(state_path)
+            merged = self._merged(persisted, drain=True)
+            state = {
+                name: {json.dumps(dict(k)): v for k, v in values.items()}
+                for name, values in merged.items()
+            }
+            _write_atomic(state_path, json.dumps(state, ensure_ascii=False))
+            if textfile_path is not None:
+                text = self.render(state)
+                _write_atomic(textfile_path, text)
+
+
+def _read_state(path: Path) -> Dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+REGISTRY = Registry()
+
+LOGIN_ATTEMPTS = REGISTRY.counter("gsb_login_attempts_total", "Login POST attempts.")
+LOGIN_OUTCOMES = REGISTRY.counter(
+    "gsb_login_outcomes_total",
+    "Login runs by outcome (success, credential_error, portal_unreachable, portal_error, already_logged_in, "
+    "circuit_open, joined, cancelled).",
+)
+LOGIN_DURATION = REGISTRY.histogram("gsb_login_duration_seconds", "Wall time of a full login run.")
+LOGOUT_OUTCOMES = REGISTRY.counter("gsb_logout_outcomes_total", "Logout runs by outcome.")
+LOGOUT_DURATION = REGISTRY.histogram("gsb_logout_duration_seconds", "Wall time of a full logout run.")
+REQUEST_DURATION = REGISTRY.histogram("gsb_http_request_duration_seconds", "Portal HTTP request latency.")
+RETRIES = REGISTRY.counter("gsb_retries_total", "Retries (transport-level and application-level).")
+HEDGES = REGISTRY.counter("gsb_hedges_total", "Extra racing/hedged connection attempts started.")
+BYTES_RECEIVED = REGISTRY.counter("gsb_bytes_received_total", "Response body bytes received from the portal.")
+BYTES_SENT = REGISTRY.counter("gsb_bytes_sent_total", "Request body bytes sent to the portal.")
+
+
+def metrics_dir(cfg_dir: Path) -> Path:
+    return cfg_dir / "metrics"
+
+
+def textfile_path(cfg_dir: Path) -> Path:
+    env = os.environ.get("GSB_METRICS_TEXTFILE")
+    return Path(env) if env else metrics_dir(cfg_dir) / "gsb.prom"
+
+
+def flush(cfg_dir: Path) -> None:
+    try:
+        REGISTRY.flush(metrics_dir(cfg_dir) / "state.json", textfile_path(cfg_dir))
+    except OSError:
+        # Metrik yazılamaması giriş akışını etkilememeli.
+        pass
+
+
+def observe_response(response: Any, *args: Any, **kwargs: Any) -> Any:
+    """requests 'response' hook'u: süre, byte ve transport retry sayısı."""
+    try:
+        method = getattr(response.request, "method", "") or ""
+        REQUEST_DURATION.observe(response.elapsed.total_seconds(), method=method)
+        BYTES_RECEIVED.inc(len(response.content or b""))
+        body = getattr(response.request, "body", None)
+        if body:
+            BYTES_SENT.inc(len(body))
+        retries = getattr(getattr(response, "raw", None), "retries", None)
+        history = getattr(retries, "history", None)
+        if history:
+            RETRIES.inc(len(history), kind="transport")
+    except Exception:
+        pass
+    return response
+
+
+def instrument_session(session: Any) -> Any:
+    session.hooks.setdefault("response", []).append(observe_response)
+    return session
+
+
+class _Handler(BaseHTTPRequestHandler):
+    state_path: Optional[Path] = None
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        persisted = _read_state(self.state_path) if self.state_path else {}
+        body = REGISTRY.render(persisted).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+
+def serve(port: int, cfg_dir: Optional[Path] = None, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """/metrics'i localhost'ta arka plan thread'inde sun."""
+    handler = type("GSBMetricsHandler", (_Handler,), {
+        "state_path": metrics_dir(cfg_dir) / "state.json" if cfg_dir else None,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="gsb-metrics", daemon=True).start()
+    return server
+
+
+def serve_from_env(cfg_dir: Optional[Path] = None) -> Optional[ThreadingHTTPServer]:
+    port = os.environ.get("GSB_METRICS_PORT", "").strip()
+    if not port.isdigit():
+        return None
+    try:
+        return serve(int(port), cfg_dir)
+    except OSError:
+        return None
+
@@ -0,0 +1,357 @@
+import codecs
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Pattern, Sequence, Tuple, Union
+
+# Portal profilleri: uçlar, form alanları, başarı/hata imzaları, kota alanı
+# etiketleri ve çıkış ipuçları veri olarak tanımlanır.
+#
+# Varsayılan GSB profilidir. Başka bir yurt/hotspot portalı için
+# GSB_Dosyalar\portals\<ad>.json yazıp settings.json'da "portal_profile": "<ad>"
+# demek yeterli; dosya sadece farklı olan anahtarları içerebilir (gerisi
+# GSB'den gelir). Şablon: python gsb_portal.py > portals\yeni.json
+#
+# Yüklenirken her kelime listesi tek bir birleşik regex'e derlenir; bir yanıt
+# tek geçişte taranır ve hangi imza kategorilerinin geçtiği bulunur.
+#
+# Yanıt gövdeleri (is_login_response vb.) çözülmeden, ham byte'lar üzerinde
+# taranır: kelimeler gövdenin karakter kümesine göre byte imzalarına çevrilir.
+# response.text hem tam bir decode (charset yoksa requests'te
+# charset_normalizer tahmini) hem de lower() kopyası demekti. Gövde sadece
+# ASCII uyumlu olmayan kodlamalarda (UTF-16/32) çözülür.
+
+PORTALS_DIR_NAME = "portals"
+
+# Karakter kümesi bilinmiyorsa Türkçe kelimeler bu kodlamaların hepsinde aranır.
+FALLBACK_ENCODINGS = ("utf-8", "cp1254")
+# <meta charset> sadece gövdenin başında aranır (HTML5: ilk 1024 byte).
+META_SNIFF_BYTES = 1024
+
+DEFAULT_PROFILE: Dict[str, Any] = {
+    "name": "gsb",
+    "portal_url": "https://wifi.gsb.gov.tr",
+    "login_page_url": "https://wifi.gsb.gov.tr/login.html",
+    "auth_url": "",  # boşsa form action'dan bulunur
+    "logout_url": "https://wifi.gsb.gov.tr/logout",
+    "ssid_hints": ["GSBWIFI"],
+    "form": {
+        "username": "j_username",
+        "password": "j_password",
+        "extra": {"submit": "Login"},
+        # Sayfada form action yoksa POST edilen yol
+        "action": "/j_spring_security_check",
+    },
+    # Giriş formu hâlâ görünüyorsa giriş olmamıştır.
+    "login_form": {
+        "body": ["j_spring_security_check", "j_username"],
+        "url": ["login.html", "/login"],
+    },
+    # Çıkış denemesinden sonra oturumun kapandığını gösteren izler (giriş formu dahil).
+    "logged_out": {
+        "body": ["login", "giriş"],
+        "url": ["logout=1", "cikisson", "login.html"],
+    },
+    # Çıkış isteğinin kendisinin başarıyla sonuçlandığı son adresler.
+    "logout_done_url": ["logout=1", "cikisson", "cikis"],
+    # Hata cümlesi bu kelimelerin çevresinden alınır.
+    "error_words": ["hatalı", "yanlış", "geçersiz", "başarısız", "invalid", "failed", "error"],
+    # Sadece "sayfada hata var" sinyali (cümle seçilmez).
+    "error_hints": ["kilitl", "deneme"],
+    # Kullanıcı adı/şifre hatası olduğunu düşündüren kelimeler.
+    "credential_hints": [
+        "hatalı", "yanlış", "geçersiz", "invalid", "başarısız", "failed", "kullanıcı", "şifre", "sifre",
+    ],
+    "quota_links": ["kota", "kalan", "kullanım", "kullanim", "internet", "paket"],
+    "logout_links": ["logout", "log out", "çıkış", "cikis", "oturumu kapat", "güvenli çıkış"],
+    "quota_fields": {
+        "remaining": ["Toplam Kalan Kota (MB)", "Toplam Kalan Kota (GB)"],
+        "details": [
+            "Toplam Kalan Kota (MB)",
+            "Toplam Kota (MB)",
+            "Kalan Kota Zamanı",
+            "Sona Erme Tarihi",
+            "Oturum Süresi",
+            "Login Zamanı",
+        ],
+    },
+}
+
+
+def _alternation(words: Iterable[str]) -> str:
+    # Uzun kelime önce: "güvenli çıkış" "çıkış"tan önce denenir.
+    return "|".join(re.escape(w) for w in sorted(set(words), key=len, reverse=True))
+
+
+def _closure(table: Dict[Any, set]) -> Dict[Any, FrozenSet[str]]:
+    # Bir kelimenin kategorilerine içinde geçen kısa kelimelerinkiler de eklenir.
+    return {key: frozenset().union(*(cats for other, cats in table.items() if other in key)) for key in table}
+
+
+def _case_variants(word: str) -> List[str]:
+    """ASCII dışı harfler için küçük/BÜYÜK/Baş harf biçimleri (Türkçe i/İ dahil).
+
+    ASCII harflerin büyük/küçük farkı bytes.lower() ile kalkar; ı/İ/ş/Ş gibi
+    harfler ise byte düzeyinde ayrı yazılmalı.
+    """
+    if word.isascii():
+        return [word]
+    tr_upper = word.replace("i", "İ").replace("ı", "I").upper()
+    return list(dict.fromkeys((word, word.upper(), tr_upper, word[:1].upper() + word[1:], tr_upper[:1] + word[1:])))
+
+
+def _scan(regex: Pattern, table: Dict[Any, FrozenSet[str]], data: Any, stop: Optional[FrozenSet[str]]) -> FrozenSet[str]:
+    found: set = set()
+    m = regex.search(data)
+    while m is not None:
+        found |= table[m.group(0)]
+        if stop is not None and stop <= found:
+            break
+        # Çakışan kelimeler ("/login", "login.html") kaçmasın diye bir sonraki karakterden.
+        m = regex.search(data, m.start() + 1)
+    return frozenset(found)
+
+
+def ascii_compatible(encoding: str) -> bool:
+    return not encoding.replace("_", "-").startswith(("utf-16", "utf-32"))
+
+
+class KeywordMatcher:
+    """Kategori -> kelime listelerini tek regex'te birleştirir.
+
+    scan() metni (str) veya ham gövdeyi (bytes) bir kez tarar ve geçen
+    kategorileri döndürür; aynı kelime birden fazla kategoride olabilir.
+    Eşleşme küçük harfe çevrilmiş metinde yapılır (kelimeler de küçük harfle
+    saklanır). bytes için her (kodlama, stop) çiftine, sadece stop
+    kategorilerinin kelimelerini içeren ayrı bir byte regex'i ilk kullanımda
+    derlenip saklanır; az sayıda imzalı regex gövdeyi çok daha hızlı tarar.
+    """
+
+    def __init__(self, categories: Dict[str, Sequence[str]]) -> None:
+        table: Dict[str, set] = {}
+        for category, words in categories.items():
+            for word in words:
+                word = word.lower()
+                if word:
+                    table.setdefault(word, set()).add(category)
+        self._table = _closure(table)
+        self._regex = re.compile(_alternation(self._table)) if self._table else None
+        self._byte_matchers: Dict[Tuple[str, Optional[FrozenSet[str]]], Tuple[Optional[Pattern], Dict[bytes, FrozenSet[str]]]] = {}
+
+    def _bytes_matcher(
+        self, encoding: str, stop: Optional[FrozenSet[str]]
+    ) -> Tuple[Optional[Pattern], Dict[bytes, FrozenSet[str]]]:
+        matcher = self._byte_matchers.get((encoding, stop))
+        if matcher is None:
+            table: Dict[bytes, set] = {}
+            for word, cats in self._table.items():
+                for variant in _case_variants(word):
+                    for enc in (encoding,) if encoding else FALLBACK_ENCODINGS:
+                        try:
+                            key = variant.encode(enc).lower()
+                        except UnicodeEncodeError:
+                            continue
+                        table.setdefault(key, set()).update(cats)
+            closed = {key: cats for key, cats in _closure(table).items() if stop is None or cats & stop}
+            regex = re.compile(b"|".join(re.escape(k) for k in sorted(closed, key=len, reverse=True))) if closed else None
+            matcher = self._byte_matchers[(encoding, stop)] = (regex, closed)
+        return matcher
+
+    def scan(
+        self, data: Union[str, bytes], stop: Optional[FrozenSet[str]] = None, encoding: str = ""
+    ) -> FrozenSet[str]:
+        """data içinde geçen kategoriler; stop'taki hepsi bulununca erken biter.
+
+        data bytes ise encoding gövdenin karakter kümesidir ("" = bilinmiyor,
+        bkz. response_encoding).
+        """
+        if self._regex is None or not data:
+            return frozenset()
+        if isinstance(data, str):
+            return _scan(self._regex, self._table, data.lower(), stop)
+        if not ascii_compatible(encoding):
+            return _scan(self._regex, self._table, data.decode(encoding, "replace").lower(), stop)
+        regex, table = self._bytes_matcher(encoding, stop)
+        if regex is None:
+            return frozenset()
+        return _scan(regex, table, data.lower(), stop)
+
+    def matches(self, data: Union[str, bytes], category: str, encoding: str = "") -> bool:
+        return category in self.scan(data, frozenset((category,)), encoding)
+
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-z0-9_.:-]+)""", re.IGNORECASE)
+_BOMS = ((codecs.BOM_UTF8, "utf-8"), (codecs.BOM_UTF32_LE, "utf-32"), (codecs.BOM_UTF32_BE, "utf-32"),
+         (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+
+
+def _codec_name(label: str) -> str:
+    try:
+        return codecs.lookup(label.strip("\"' ")).name
+    except LookupError:
+        return ""
+
+
+def response_encoding(response: Any) -> str:
+    """Gövdenin karakter kümesi: BOM, Content-Type charset veya <meta charset>.
+
+    Tahmin yapılmaz; bulunamazsa "" döner (bkz. FALLBACK_ENCODINGS).
+    """
+    content = response.content or b""
+    for bom, name in _BOMS:
+        if content.startswith(bom):
+            return name
+    ctype = response.headers.get("Content-Type", "") or ""
+    for part in ctype.split(";")[1:]:
+        key, _, value = part.strip().partition("=")
+        if key.lower() == "charset" and value:
+            return _codec_name(value)
+    m = _META_CHARSET.search(content, 0, META_SNIFF_BYTES)
+    return _codec_name(m.group(1).decode("ascii")) if m else ""
+
+
+class PortalProfile:
+    """Derlenmiş portal profili (bkz. DEFAULT_PROFILE)."""
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.data = data
+        self.name = str(data.get("name") or "")
+        self.portal_url = str(data.get("portal_url") or "")
+        self.login_page_url = str(data.get("login_page_url") or "")
+        self.auth_url = str(data.get("auth_url") or "")
+        self.logout_url = str(data.get("logout_url") or "")
+        self.ssid_hints: Tuple[str, ...] = tuple(data.get("ssid_hints") or ())
+
+        form = data.get("form") or {}
+        self.username_field = str(form.get("username") or "username")
+        self.password_field = str(form.get("password") or "password")
+        self.extra_fields: Dict[str, str] = dict(form.get("extra") or {})
+        self.form_action = str(form.get("action") or "")
+
+        login_form = data.get("login_form") or {}
+        logged_out = data.get("logged_out") or {}
+        self._body = KeywordMatcher({
+            "login_form": login_form.get("body") or (),
+            "logged_out": list(logged_out.get("body") or ()) + list(login_form.get("body") or ()),
+        })
+        self._url = KeywordMatcher({
+            "login_form": login_form.get("url") or (),
+            "logged_out": logged_out.get("url") or (),
+            "logout_done": data.get("logout_done_url") or (),
+        })
+        error_words = data.get("error_words") or ()
+        self._text = KeywordMatcher({
+            "error": list(error_words) + list(data.get("error_hints") or ()),
+            "credential": data.get("credential_hints") or (),
+        })
+        self._links = KeywordMatcher({
+            "quota": data.get("quota_links") or (),
+            "logout": data.get("logout_links") or (),
+        })
+        self.error_snippet = (
+            re.compile(r"[^.]{0,120}(" + _alternation(w.lower() for w in error_words) + r")[^.]{0,120}")
+            if error_words else None
+        )
+
+        quota = data.get("quota_fields") or {}
+        self.remaining_labels: Tuple[str, ...] = tuple(quota.get("remaining") or ())
+        self.detail_labels: Tuple[str, ...] = tuple(quota.get("details") or ())
+
+    # --- Sınıflandırma ---
+    def is_login_page(self, body: Union[str, bytes], url: str = "", encoding: str = "") -> bool:
+        return self._url.matches(url or "", "login_form") or self._body.matches(body or "", "login_form", encoding)
+
+    def is_logged_out(self, body: Union[str, bytes], url: str = "", encoding: str = "") -> bool:
+        return self._url.matches(url or "", "logged_out") or self._body.matches(body or "", "logged_out", encoding)
+
+    def is_login_response(self, response: Any) -> bool:
+        """is_login_page, gövde çözülmeden (response.content üzerinde)."""
+        return self.is_login_page(response.content, response.url, response_encoding(response))
+
+    def is_logged_out_response(self, response: Any) -> bool:
+        return self.is_logged_out(response.content, response.url, response_encoding(response))
+
+    def logout_confirmed(self, url: str) -> bool:
+        return self._url.matches(url or "", "logout_done")
+
+    def text_signals(self, text: str) -> FrozenSet[str]:
+        """Görünen metinde "error" / "credential" imzaları (tek geçiş)."""
+        return self._text.scan(text)
+
+    def link_kinds(self, label: str) -> FrozenSet[str]:
+        """Bağlantı/düğme etiketinin "quota" / "logout" eylemi olup olmadığı."""
+        return self._links.scan(label)
+
+    # --- Form ve alanlar ---
+    def credentials(self, username: str, password: str) -> Dict[str, str]:
+        payload = dict(self.extra_fields)
+        payload[self.username_field] = username
+        payload[self.password_field] = password
+        return payload
+
+    def ssid_matches(self, ssid: str) -> bool:
+        ssid_l = (ssid or "").lower()
+        return bool(ssid_l) and any(h.lower() in ssid_l for h in self.ssid_hints)
+
+    def remaining_quota(self, fields: Dict[str, str]) -> Tuple[str, str]:
+        """(kalan kota değeri, birim); birim etiketteki parantezden alınır."""
+        for label in self.remaining_labels:
+            value = fields.get(label)
+            if value:
+                m = re.search(r"\(\s*([^)]+?)\s*\)", label)
+                return value, m.group(1) if m else ""
+        return "", ""
+
+
+def _merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+DEFAULT = PortalProfile(DEFAULT_PROFILE)
+
+
+def profile_path(cfg_dir: Optional[Path], name_or_path: str) -> Path:
+    path = Path(name_or_path)
+    if path.suffix.lower() != ".json":
+        path = path.with_name(path.name + ".json")
+    if not path.is_absolute() and cfg_dir is not None and len(path.parts) == 1:
+        path = cfg_dir / PORTALS_DIR_NAME / path
+    return path
+
+
+def load_profile(cfg_dir: Optional[Path], name_or_path: Optional[str]) -> PortalProfile:
+    """Ad (GSB_Dosyalar\\portals\\<ad>.json) veya yol ile profil yükle.
+
+    Boş ad veya "gsb" varsayılanı döndürür. Dosya okunamazsa varsayılana
+    düşülür ve stderr'e not düşülür.
+    """
+    if not name_or_path or name_or_path == DEFAULT.name:
+        return DEFAULT
+    path = profile_path(cfg_dir, name_or_path)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(data, dict):
+            raise ValueError("JSON nesnesi değil")
+    except (OSError, ValueError) as exc:
+        print(f"[gsb] portal profili okunamadı ({path}): {exc}", file=sys.stderr)
+        return DEFAULT
+    return PortalProfile(_merge(DEFAULT_PROFILE, data))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Profilin (varsayılan: GSB) birleşmiş halini JSON olarak yaz."""
+    args = sys.argv[1:] if argv is None else argv
+    profile = load_profile(Path.cwd(), args[0] if args else None)
+    print(json.dumps(profile.data, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, NamedTuple, Optional, TextIO
+
+
+class ProgressEvent(NamedTuple):
+    phase: str
+    detail: str
+    started: float  # çalıştırma başından itibaren saniye
+    duration: Optional[float]  # faz bittiyse süresi, sürüyorsa None
+
+
+class ProgressChannel:
+    """Worker'dan UI'a (veya stderr'e) faz olaylarını taşıyan kanal.
+
+    publish() yeni bir faz başlatır ve bir önceki fazı kapatır. Dinleyiciler
+    publish eden thread'de çağrılır; bu yüzden bloklamamalıdırlar (gsb_ui
+    kuyruğa bir mesaj bırakıp Tk thread'ini socketpair üzerinden uyandırır).
+    """
+
+    def __init__(self, echo: Optional[bool] = None, stream: Optional[TextIO] = None) -> None:
+        if echo is None:
+            echo = bool(os.environ.get("GSB_TRACE"))
+        self._echo = echo
+        self._stream = stream
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self._events: List[ProgressEvent] = []
+        self._listeners: List[Callable[[ProgressEvent], None]] = []
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._t0
+
+    def subscribe(self, listener: Callable[[ProgressEvent], None]) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[ProgressEvent], None]) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def publish(self, phase: str, detail: str = "") -> ProgressEvent:
+        now = self.elapsed()
+        with self._lock:
+            if self._events and self._events[-1].duration is None:
+                last = self._events[-1]
+                self._events[-1] = last._replace(duration=now - last.started)
+                self._emit(self._events[-1])
+            event = ProgressEvent(phase, detail, now, None)
+            self._events.append(event)
+            self._emit(event)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception:
+                pass
+        return event
+
+    def finish(self) -> None:
+        """Süren fazı kapat (ör. görev bittiğinde)."""
+        now = self.elapsed()
+        with self._lock:
+            if self._events and self._events[-1].duration is None:
+                last = self._events[-1]
+                self._events[-1] = last._replace(duration=now - last.started)
+                self._emit(self._events[-1])
+
+    @contextmanager
+    def phase(self, phase: str, detail: str = "") -> Iterator[ProgressEvent]:
+        event = self.publish(phase, detail)
+        try:
+            yield event
+        finally:
+            self.finish()
+
+    def latest(self) -> Optional[ProgressEvent]:
+        with self._lock:
+            return self._events[-1] if self._events else None
+
+    def events(self) -> List[ProgressEvent]:
+        with self._lock:
+            return list(self._events)
+
+    def format_trace(self) -> str:
+        lines: List[str] = []
+        for ev in self.events():
+            took = f"{ev.duration * 1000:7.0f} ms" if ev.duration is not None else "   sürüyor"
+            detail = f" ({ev.detail})" if ev.detail else ""
+            lines.append(f"+{ev.started:6.2f}s {took}  {ev.phase}{detail}")
+        return "\n".join(lines)
+
+    def _emit(self, ev: ProgressEvent) -> None:
+        # Kilit altında çağrılır: faz başlarken ve biterken birer satır.
+        if not self._echo:
+            return
+        stream = self._stream or sys.stderr
+        detail = f" ({ev.detail})" if ev.detail else ""
+        if ev.duration is None:
+            line = f"[gsb] +{ev.started:6.2f}s  >  {ev.phase}{detail}"
+        else:
+            line = f"[gsb] +{ev.started:6.2f}s {ev.duration * 1000:7.0f} ms  {ev.phase}{detail}"
+        try:
+            print(line, file=stream, flush=True)
+        except Exception:
+            pass
@@ -0,0 +1,81 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+# Anahtar başına tek zamanlanmış iş tutan min-heap zamanlayıcı.
+#
+# Aynı anahtar yeniden zamanlanınca eski kayıt heap'te kalır ama sıra numarası
+# eşleşmediği için atlanır (tembel silme); ekleme/iptal O(log n). İşler küçük
+# bir thread havuzunda çalışır; böylece bir hesabın yavaş girişi diğerlerini
+# geciktirmez.
+
+# Bekleme bu süreyle bölünür: Ctrl+C ve saat değişiklikleri geç kalmadan fark edilir.
+MAX_WAIT = 5.0
+
+
+class Scheduler:
+    def __init__(self, workers: int = 4, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._jobs: Dict[Hashable, Tuple[float, int, Callable[[], None]]] = {}
+        self._seq = itertools.count()
+        self._stopped = False
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gsb-sched")
+
+    def schedule(self, key: Hashable, when: float, fn: Callable[[], None]) -> None:
+        with self._cond:
+            seq = next(self._seq)
+            self._jobs[key] = (when, seq, fn)
+            heapq.heappush(self._heap, (when, seq, key))
+            self._cond.notify()
+
+    def cancel(self, key: Hashable) -> None:
+        with self._cond:
+            self._jobs.pop(key, None)
+
+    def due_at(self, key: Hashable) -> Optional[float]:
+        with self._cond:
+            job = self._jobs.get(key)
+            return job[0] if job else None
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._jobs)
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._pool.shutdown(wait=False)
+
+    def _pop_due(self) -> Optional[Callable[[], None]]:
+        """Kilit altında: vakti gelen ilk işi döndür, yoksa uygun süre bekle."""
+        while self._heap:
+            when, seq, key = self._heap[0]
+            job = self._jobs.get(key)
+            if job is None or job[1] != seq:
+                heapq.heappop(self._heap)  # iptal edilmiş/yeniden zamanlanmış
+                continue
+            delay = when - self._clock()
+            if delay > 0:
+                self._cond.wait(min(delay, MAX_WAIT))
+                return None
+            heapq.heappop(self._heap)
+            del self._jobs[key]
+            return job[2]
+        self._cond.wait(MAX_WAIT)
+        return None
+
+    def run(self) -> None:
+        """stop() çağrılana kadar işleri çalıştır (çağıran thread'i bloklar)."""
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                fn = self._pop_due()
+            if fn is not None:
+                self._pool.submit(fn)
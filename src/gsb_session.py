@@ -0,0 +1,171 @@
+import json
+import os
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional
+
+from gsb_flight import locked
+
+# Portal oturumunun ne zaman biteceğinin tahmini.
+#
+# Kota sayfasındaki "Login Zamanı", "Oturum Süresi", "Kalan Kota Zamanı" ve
+# "Sona Erme Tarihi" alanları zaman damgalarına çevrilir; gelecekteki en
+# yakın bitiş anı oturumun bitişi sayılır. Son giriş bilgileri
+# GSB_Dosyalar\sessions.json'a yazılır; --watch modu buradan yeniden giriş
+# zamanlar (bkz. gsb_scheduler). Dosyayı birden çok süreç yazar (GUI girişi,
+# --watch, --refresh-state): güncelleme sessions.json.lock altında yapılır.
+
+SESSIONS_NAME = "sessions.json"
+
+DATETIME_FORMATS = (
+    "%d.%m.%Y %H:%M:%S",
+    "%d.%m.%Y %H:%M",
+    "%d.%m.%Y",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%Y",
+    "%d-%m-%Y %H:%M:%S",
+    "%d-%m-%Y %H:%M",
+)
+
+# Süre birimleri (Türkçe kısaltmalar dahil), saniye cinsinden
+_UNITS = (
+    (("gün", "gun", "day", "days"), 86400),
+    (("saat", "sa", "hour", "hours", "h"), 3600),
+    (("dakika", "dk", "dak", "min", "minute", "minutes", "m"), 60),
+    (("saniye", "sn", "sec", "second", "seconds"), 1),
+)
+
+
+class SessionTimes(NamedTuple):
+    login_at: Optional[float]
+    expires_at: Optional[float]
+
+
+def _unit_seconds(word: str) -> Optional[int]:
+    word = word.lower().strip(".")
+    for names, seconds in _UNITS:
+        if word in names:
+            return seconds
+    return None
+
+
+def parse_datetime(text: str) -> Optional[float]:
+    """Portal tarih/saatini (yerel saat) epoch saniyesine çevir."""
+    if not text:
+        return None
+    value = re.sub(r"\s+", " ", text.strip())
+    value = re.sub(r"\.\d+$", "", value)  # milisaniye
+    for fmt in DATETIME_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_duration(text: str, default_unit: Optional[int] = None) -> Optional[float]:
+    """"02:15:30", "1 gün 3 saat", "90 dk" gibi süreleri saniyeye çevir.
+
+    Birimsiz sayı sadece default_unit (alan adındaki "(dk)" vb.) varsa kabul edilir.
+    """
+    if not text:
+        return None
+    value = text.strip().lower()
+    m = re.fullmatch(r"(\d+):(\d{1,2})(?::(\d{1,2}))?", value)
+    if m:
+        h, mnt, sec = int(m.group(1)), int(m.group(2)), int(m.group(3) or 0)
+        return float(h * 3600 + mnt * 60 + sec)
+
+    total = 0.0
+    found = False
+    for number, unit in re.findall(r"(\d+(?:[.,]\d+)?)\s*([a-zçğıöşü]+)", value):
+        seconds = _unit_seconds(unit)
+        if seconds is None:
+            continue
+        total += float(number.replace(",", ".")) * seconds
+        found = True
+    if found:
+        return total
+
+    m = re.fullmatch(r"\d+(?:[.,]\d+)?", value)
+    if m and default_unit:
+        return float(value.replace(",", ".")) * default_unit
+    return None
+
+
+def _field(fields: Dict[str, str], prefix: str) -> Optional[str]:
+    for key, value in fields.items():
+        if key.lower().startswith(prefix):
+            return value
+    return None
+
+
+def _label_unit(fields: Dict[str, str], prefix: str) -> Optional[int]:
+    for key in fields:
+        if key.lower().startswith(prefix):
+            m = re.search(r"\(([^)]+)\)", key)
+            return _unit_seconds(m.group(1)) if m else None
+    return None
+
+
+def session_times(fields: Dict[str, str], now: Optional[float] = None) -> SessionTimes:
+    """Kota alanlarından (giriş anı, tahmini oturum bitişi).
+
+    "Oturum Süresi" geçen süre ise giriş + süre şimdiye eşit çıkar ve elenir;
+    bu yüzden sadece gelecekteki adaylar arasından en yakını alınır.
+    """
+    now = time.time() if now is None else now
+    login_at = parse_datetime(_field(fields, "login zaman") or "")
+    session_len = parse_duration(
+        _field(fields, "oturum süre") or "", _label_unit(fields, "oturum süre")
+    )
+    remaining = parse_duration(
+        _field(fields, "kalan kota zaman") or "", _label_unit(fields, "kalan kota zaman")
+    )
+    hard_end = parse_datetime(_field(fields, "sona erme") or "")
+
+    candidates = []
+    if login_at is not None and session_len:
+        candidates.append(login_at + session_len)
+    if remaining:
+        candidates.append(now + remaining)
+    if hard_end is not None:
+        candidates.append(hard_end)
+    future = [c for c in candidates if c > now]
+    return SessionTimes(login_at, min(future) if future else None)
+
+
+def read_sessions(cfg_dir: Path) -> Dict[str, Dict[str, Any]]:
+    try:
+        data = json.loads((cfg_dir / SESSIONS_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def record_session(cfg_dir: Path, account_id: int, times: SessionTimes) -> None:
+    """Hesabın son oturum bilgisini sessions.json'a yaz (bitiş bilinmiyorsa sil)."""
+    path = cfg_dir / SESSIONS_NAME
+    key = str(account_id)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with locked(path):
+            data = read_sessions(cfg_dir)
+            if times.expires_at is None:
+                if key not in data:
+                    return
+                data.pop(key)
+            else:
+                data[key] = {"login_at": times.login_at, "expires_at": times.expires_at, "updated": time.time()}
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp, path)
+    except OSError:
+        pass
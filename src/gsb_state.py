@@ -0,0 +1,211 @@
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from gsb_flight import locked
+from gsb_layout import cfg_dir
+
+# Son bilinen portal durumu (anlık "durum" komutu için).
+#
+# Her giriş, çıkış ve kota örneği GSB_Dosyalar\state.json'daki tek kaydı
+# günceller: hangi hesap, oturum açık mı, son kota, zaman damgaları ve son
+# hata. Portal oturumu cihaza bağlı olduğundan kayıt hesap başına değil,
+# cihaz başına tektir. Dosya sabit anahtarlı küçük bir JSON'dur ve atomik
+# yazılır (tmp + os.replace); okuyan taraf yarım dosya görmez. Birden çok
+# süreç (--watch, GUI girişi, çıkış, --refresh) yazabildiğinden güncelleme
+# state.json.lock kilidi altında okunup birleştirilir.
+#
+# Hesap başına son kota satırı ("quotas") da burada tutulur: GUI giriş
+# onaylanınca bunu yaşıyla hemen gösterir, güncel kota arka planda gelir.
+#
+# "GSB_Giriş --status" bu dosyayı ağa çıkmadan okuyup basar. Bu modül
+# yalnızca stdlib + gsb_layout/gsb_flight kullanır: HTTP/HTML modülleri
+# yüklenmez.
+# --refresh ile aynı giriş noktası arka planda --refresh-state ile başlatılır
+# ve durumu portaldan yeniden doğrular (bkz. gsb_login_runtime_template).
+
+STATE_NAME = "state.json"
+
+# Kaydın sabit düzeni ve varsayılanları
+STATE_FIELDS: Dict[str, Any] = {
+    "account": None,
+    "logged_in": False,
+    "remaining_mb": None,
+    "total_mb": None,
+    "login_at": None,
+    "expires_at": None,
+    "quota_at": None,
+    "updated": None,
+    "source": "",
+    "error": "",
+    # hesap -> {"headline": "Kalan Kota: ...", "at": epoch, QUOTA_FIELDS...}
+    "quotas": None,
+}
+
+# Hesaba ait alanlar: kayıt başka hesaba geçince bunlar o hesabın son
+# okumasından (quotas) gelir ya da boşalır, önceki hesabınki kalmaz.
+QUOTA_FIELDS = ("remaining_mb", "total_mb", "login_at", "expires_at", "quota_at")
+
+DATETIME_FORMAT = "%d.%m.%Y %H:%M"
+
+# Windows: arka plan süreci konsolsuz ve ana süreçten bağımsız başlasın.
+DETACHED_PROCESS = 0x00000008
+CREATE_NEW_PROCESS_GROUP = 0x00000200
+
+
+def read_state(cfg_dir: Path) -> Dict[str, Any]:
+    state = dict(STATE_FIELDS)
+    try:
+        data = json.loads((cfg_dir / STATE_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return state
+    if isinstance(data, dict):
+        state.update((key, data[key]) for key in STATE_FIELDS if key in data)
+    return state
+
+
+def update_state(cfg_dir: Path, source: str, quota_headline: str = "", **changes: Any) -> None:
+    """Kaydı changes ile güncelle (bilinmeyen anahtarlar yok sayılır).
+
+    quota_headline verilirse kaydın hesabı için son kota satırı (ve
+    QUOTA_FIELDS) saklanır. account değişip bu alanlar verilmezse yeni
+    hesabın saklı değerleri kullanılır.
+    """
+    path = cfg_dir / STATE_NAME
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with locked(path):
+            state = read_state(cfg_dir)
+            previous = state.get("account")
+            state.update((key, value) for key, value in changes.items() if key in STATE_FIELDS)
+            state.update(source=source, updated=time.time())
+            account = state.get("account")
+            if account is not None and str(account) != str(previous):
+                saved = (state.get("quotas") or {}).get(str(account)) or {}
+                for key in QUOTA_FIELDS:
+                    if key not in changes:
+                        state[key] = saved.get(key)
+            if quota_headline and account is not None:
+                quotas = dict(state.get("quotas") or {})
+                entry = {"headline": quota_headline, "at": state["updated"]}
+                entry.update((key, state.get(key)) for key in QUOTA_FIELDS)
+                quotas[str(account)] = entry
+                state["quotas"] = quotas
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(state), encoding="utf-8")
+            os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def sample_fields(sample: Any) -> Dict[str, Any]:
+    """gsb_history.QuotaSample -> kayıt alanları (oturum açık sayılır)."""
+    return {
+        "account": sample.account,
+        "logged_in": True,
+        "remaining_mb": sample.remaining_mb,
+        "total_mb": sample.total_mb,
+        "login_at": sample.login_at,
+        "expires_at": sample.expires_at,
+        "quota_at": sample.ts,
+    }
+
+
+def cached_quota(cfg_dir: Path, account_id: int) -> Optional[Tuple[str, float]]:
+    """Hesabın son bilinen kota satırı ve zamanı (yoksa None)."""
+    entry = (read_state(cfg_dir).get("quotas") or {}).get(str(account_id))
+    try:
+        return str(entry["headline"]), float(entry["at"])
+    except (TypeError, KeyError, ValueError):
+        return None
+
+
+def _when(ts: Optional[float]) -> str:
+    return datetime.fromtimestamp(ts).strftime(DATETIME_FORMAT) if ts else "?"
+
+
+def format_age(seconds: float) -> str:
+    if seconds < 90:
+        return f"{seconds:.0f} sn önce"
+    if seconds < 5400:
+        return f"{seconds / 60:.0f} dk önce"
+    if seconds < 2 * 86400:
+        return f"{seconds / 3600:.0f} saat önce"
+    return f"{seconds / 86400:.0f} gün önce"
+
+
+def is_active(state: Dict[str, Any], now: Optional[float] = None) -> bool:
+    """Oturum açık görünüyor ve tahmini bitişi geçmemiş mi."""
+    now = time.time() if now is None else now
+    expires_at = state.get("expires_at")
+    return bool(state.get("logged_in")) and (not expires_at or float(expires_at) > now)
+
+
+def format_state(state: Dict[str, Any], now: Optional[float] = None) -> str:
+    now = time.time() if now is None else now
+    if not state.get("updated"):
+        return "Durum bilinmiyor: henüz giriş/çıkış yapılmadı."
+    account = state.get("account")
+    lines = []
+    if is_active(state, now):
+        lines.append(f"Oturum açık (hesap {account})" if account else "Oturum açık")
+    elif state.get("logged_in"):
+        lines.append("Oturum süresi dolmuş olabilir")
+    else:
+        lines.append("Oturum kapalı")
+    if state.get("remaining_mb") is not None:
+        total = state.get("total_mb")
+        quota = f"Kalan Kota: {state['remaining_mb']:.0f} MB" + (f" / {total:.0f} MB" if total else "")
+        lines.append(f"{quota} ({format_age(now - float(state.get('quota_at') or now))})")
+    if state.get("login_at") or state.get("expires_at"):
+        lines.append(f"Giriş: {_when(state.get('login_at'))}  Bitiş: {_when(state.get('expires_at'))}")
+    if state.get("error"):
+        lines.append(f"Son hata: {state['error']}")
+    lines.append(f"Güncelleme: {format_age(now - float(state['updated']))} ({state.get('source') or '?'})")
+    return "\n".join(lines)
+
+
+def spawn_refresh() -> bool:
+    """Aynı giriş noktasını arka planda --refresh-state ile başlat."""
+    import subprocess
+
+    if getattr(sys, "frozen", False):
+        command = [sys.executable, "--refresh-state"]
+    else:
+        command = [sys.executable, os.path.abspath(sys.argv[0]), "--refresh-state"]
+    options: Dict[str, Any] = {}
+    if sys.platform == "win32":
+        options["creationflags"] = DETACHED_PROCESS | CREATE_NEW_PROCESS_GROUP
+    else:
+        options["start_new_session"] = True
+    try:
+        subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            **options,
+        )
+    except OSError:
+        return False
+    return True
+
+
+def main(argv: Sequence[str]) -> int:
+    """--status [--json] [--refresh]: durumu ağa çıkmadan göster.
+
+    Çıkış kodu: 0 = oturum açık, 1 = kapalı/bilinmiyor.
+    """
+    state = read_state(cfg_dir())
+    if "--json" in argv:
+        print(json.dumps(state, ensure_ascii=False))
+    else:
+        print(format_state(state))
+    if "--refresh" in argv and spawn_refresh() and "--json" not in argv:
+        print("(arka planda yenileniyor)")
+    return 0 if is_active(state) else 1
@@ -0,0 +1,93 @@
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+import gsb_http
+from gsb_breaker import CircuitBreaker
+from gsb_latency import LatencyModel
+from gsb_metrics import instrument_session
+
+# HTTP backend seçimi: "requests" (varsayılan) veya "lite" (gsb_http).
+#
+# İki backend de aynı oturum arayüzünü (get/post/headers/hooks) ve aynı
+# retry, gecikme modeli, devre kesici ve metrik davranışını sağlar. "lite"
+# seçildiğinde requests/urllib3 hiç import edilmez.
+BACKENDS = ("requests", "lite")
+
+# Tarayıcı benzeri başlıklar (portal bazı isteklerde bunlara bakıyor)
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7",
+    "Connection": "keep-alive",
+}
+
+# urllib3 Retry(total=5, connect=5, read=3, backoff_factor=0.4, ...) karşılığı;
+# settings.json ile değiştirilebilir (bkz. TRANSPORT_SETTINGS)
+MAX_RETRIES = 5
+READ_RETRIES = 3
+BACKOFF_FACTOR = 0.4
+STATUS_FORCELIST = (429, 500, 502, 503, 504)
+
+TRANSPORT_SETTINGS = {
+    "max_retries": int,
+    "read_retries": int,
+    "backoff_factor": float,
+}
+
+# Tür ipuçları için: requests.Session veya gsb_http.LiteSession
+HTTPSession = Any
+
+
+def request_errors() -> Tuple[type, ...]:
+    """Etkin backend(ler)in temel hata sınıfları (except ifadesinde kullanılır)."""
+    errors: Tuple[type, ...] = (gsb_http.RequestException,)
+    requests = sys.modules.get("requests")
+    if requests is not None:
+        errors += (requests.RequestException,)
+    return errors
+
+
+def build_session(
+    backend: str = "requests",
+    model: Optional[LatencyModel] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> HTTPSession:
+    headers = DEFAULT_HEADERS if headers is None else headers
+    if backend == "lite":
+        session = gsb_http.LiteSession(
+            max_retries=MAX_RETRIES,
+            backoff_factor=BACKOFF_FACTOR,
+            status_forcelist=STATUS_FORCELIST,
+            model=model,
+            breaker=breaker,
+            connect_retries=MAX_RETRIES,
+            read_retries=READ_RETRIES,
+        )
+        session.headers.update(headers)
+        return instrument_session(session)
+
+    import requests
+
+    from gsb_adapters import CancellableRetry, mount
+
+    session = requests.Session()
+    retries = CancellableRetry(
+        total=MAX_RETRIES,
+        connect=MAX_RETRIES,
+        read=READ_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=list(STATUS_FORCELIST),
+        allowed_methods=["GET", "POST"],
+    )
+    if model is not None:
+        mount(session, model, breaker, max_retries=retries, pool_connections=10, pool_maxsize=10)
+    else:
+        adapter = requests.adapters.HTTPAdapter(max_retries=retries, pool_connections=10, pool_maxsize=10)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+    # Windows proxy/env ayarlarını bypass eder (bazı ağlarda gecikmeyi azaltır)
+    session.trust_env = False
+    session.headers.update(headers)
+    return instrument_session(session)
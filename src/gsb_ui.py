@@ -1,8 +1,16 @@
+import os
+import queue
+import socket
+import sys
 import threading
+import time
 import tkinter as tk
-import sys
 from pathlib import Path
 
+from gsb_cancel import Cancelled, CancelToken
+from gsb_layout import icon_path
+from gsb_progress import ProgressChannel
+
 # ── Renk paleti (tüm ekranlar) ─────────────────────────────────────────────
 BG     = "#0f172a"
 PANEL  = "#111827"
@@ -14,6 +22,26 @@ BTN_FG = "#f1f5f9"
 ERR_FG = "#f87171"
 # ──────────────────────────────────────────────────────────────────────────
 
+# Worker thread'leri Tk'ye hiç dokunmaz: mesajlarını bir queue.Queue'ya
+# bırakır ve bir socketpair'e tek bayt yazar. Okuma ucu Tk'nin olay döngüsüne
+# createfilehandler ile bağlıdır; Tk thread'i bayt gelir gelmez uyanıp
+# kuyruğu boşaltır. Başka thread'den event_generate, mainloop olayı işleyene
+# kadar worker'ı bekletir (mainloop yoksa hata verir); burada worker hiç
+# beklemez. createfilehandler olmayan yerde (Windows Tk'si) kuyruk
+# UI_POLL_MS'te bir yoklanır.
+UI_POLL_MS = 50
+# Kuyruk mesajları
+TASK_DONE = "done"
+PROGRESS = "progress"
+# İptalden sonra worker'ın çözülmesi en fazla bu kadar beklenir; sonra pencere
+# yine kapanır (worker daemon thread, süreç çıkışını bekletmez).
+CANCEL_GRACE_MS = 1000
+
+# Süreç boyunca tek gizli Tk kökü: tüm pencereler bunun Toplevel'ı olur,
+# böylece Tcl/Tk ve ikon tıklama başına sadece bir kez yüklenir.
+_root: "tk.Tk | None" = None
+TK_INIT_SECONDS = 0.0
+
 
 def center_window(win: tk.Misc, width: int, height: int) -> None:
     win.update_idletasks()
@@ -24,61 +52,69 @@ def center_window(win: tk.Misc, width: int, height: int) -> None:
     win.geometry(f"{width}x{height}+{x}+{y}")
 
 
-def _get_icon_path() -> "Path | None":
-    """Find favicon.png or icon.ico in standard locations."""
-    if getattr(sys, 'frozen', False):
-        base = Path(sys.executable).parent
+def _get_icon_path(refresh: bool = False) -> "Path | None":
+    """Kurulum manifest'indeki ikon yolunu döndür (bkz. gsb_layout)."""
+    return icon_path(refresh=refresh)
+
+
+def _apply_icon(win: tk.Misc, icon_p: Path, default: bool = False) -> None:
+    if str(icon_p).endswith('.ico'):
+        # Use iconbitmap for ICO files (most reliable on Windows)
+        if default:
+            win.iconbitmap(default=str(icon_p))
+        else:
+            win.iconbitmap(str(icon_p))
     else:
-        base = Path(__file__).resolve().parent
-
-    # Check GSB standard locations - prioritize ICO (more reliable)
-    # Layout A: EXE is Desktop\GSB\GSB.exe  -> icons at Desktop\GSB_Sistem\GSB_Dosyalar\icons\
-    # Layout B: EXE is Desktop\GSB_Sistem\Uygulama\*.exe -> icons at Desktop\GSB_Sistem\GSB_Dosyalar\icons\
-    candidates = [
-        base / "icons" / "icon.ico",                                              # same-dir ICO
-        base / "icons" / "favicon.png",                                           # same-dir PNG
-        base / "GSB_Dosyalar" / "icons" / "icon.ico",                             # subfolder ICO
-        base / "GSB_Dosyalar" / "icons" / "favicon.png",                          # subfolder PNG
-        base.parent / "GSB_Dosyalar" / "icons" / "icon.ico",                      # Layout B: Uygulama/../GSB_Dosyalar
-        base.parent / "GSB_Dosyalar" / "icons" / "favicon.png",                   # Layout B: PNG
-        base.parent / "GSB_Dosyalar" / "icons" / "GSB_Giris.ico",                 # Layout B: fallback ICO
-        base.parent.parent / "GSB_Sistem" / "GSB_Dosyalar" / "icons" / "icon.ico",# Layout A: GSB/../GSB_Sistem
-        base.parent.parent / "GSB_Sistem" / "GSB_Dosyalar" / "icons" / "favicon.png",
-        base.parent / "GSB_Sistem" / "GSB_Dosyalar" / "icons" / "icon.ico",       # Layout A alt
-        base.parent / "GSB_Sistem" / "GSB_Dosyalar" / "icons" / "favicon.png",
-        base.parent / "assets" / "icons" / "icon.ico",                            # dev env ICO
-        base.parent / "assets" / "icons" / "icon.png",                            # dev env PNG
-    ]
-    
-    for c in candidates:
-        if c.exists():
-            return c
-    return None
+        # Use iconphoto for PNG files
+        img = tk.PhotoImage(file=str(icon_p))
+        win.iconphoto(True, img)
+        # Keep a reference to avoid garbage collection
+        win._icon_ref = img
+
+
+def get_root() -> tk.Tk:
+    """Gizli ortak Tk kökünü döndür (yoksa oluştur)."""
+    global _root, TK_INIT_SECONDS
+    if _root is not None:
+        try:
+            _root.winfo_exists()
+            return _root
+        except tk.TclError:
+            _root = None
+
+    t0 = time.perf_counter()
+    root = tk.Tk()
+    root.withdraw()
+
+    # İkon bir kez köke "default" olarak verilir; Toplevel'lar onu devralır.
+    icon_p = _get_icon_path()
+    if icon_p:
+        try:
+            _apply_icon(root, icon_p, default=True)
+        except Exception:
+            # Manifest'teki ikon artık yoksa düzeni bir kez yeniden çöz.
+            try:
+                icon_p = _get_icon_path(refresh=True)
+                if icon_p:
+                    _apply_icon(root, icon_p, default=True)
+            except Exception:
+                pass
+
+    TK_INIT_SECONDS = time.perf_counter() - t0
+    if os.environ.get("GSB_TRACE"):
+        print(f"[gsb_ui] Tk init: {TK_INIT_SECONDS * 1000:.1f} ms", file=sys.stderr)
+
+    _root = root
+    return root
 
 
 def _make_dark_win(title: str, width: int, height: int,
-                   parent: "tk.Misc | None" = None) -> "tk.Tk | tk.Toplevel":
+                   parent: "tk.Misc | None" = None) -> tk.Toplevel:
     if parent is None:
-        win = tk.Tk()
+        win = tk.Toplevel(get_root())
     else:
         win = tk.Toplevel(parent)
         win.transient(parent)
-    
-    # Set Icon for ALL windows (both Tk and Toplevel)
-    try:
-        icon_p = _get_icon_path()
-        if icon_p:
-            if str(icon_p).endswith('.ico'):
-                # Use iconbitmap for ICO files (most reliable on Windows)
-                win.iconbitmap(str(icon_p))
-            else:
-                # Use iconphoto for PNG files
-                img = tk.PhotoImage(file=str(icon_p))
-                win.iconphoto(True, img)
-                # Keep a reference to avoid garbage collection
-                win._icon_ref = img 
-    except Exception:
-        pass
 
     win.title(title)
     win.resizable(False, False)
@@ -87,6 +123,102 @@ def _make_dark_win(title: str, width: int, height: int,
     return win
 
 
+def _wait_window(win: tk.Toplevel, parent: "tk.Misc | None") -> None:
+    """Pencere kapanana kadar olay döngüsünü çalıştır.
+
+    Ebeveynsiz durumda gizli kök mainloop() ile çalıştırılır ve pencere
+    kapanınca quit() ile döner.
+    """
+    if parent is not None:
+        parent.wait_window(win)
+        return
+
+    root = get_root()
+
+    def _on_destroy(event) -> None:
+        if event.widget is win:
+            root.quit()
+
+    win.bind("<Destroy>", _on_destroy, add="+")
+    root.mainloop()
+
+
+class _Inbox:
+    """Worker -> Tk thread mesaj kutusu (put() her thread'den çağrılabilir).
+
+    Mesajlar Tk thread'inde handlers[mesaj]() ile işlenir. Pencere kapanınca
+    dosya işleyicisi ve soketler bırakılır.
+    """
+
+    def __init__(self, win: tk.Misc, handlers: dict) -> None:
+        self._win = win
+        self._handlers = handlers
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._reader: "socket.socket | None" = None
+        self._writer: "socket.socket | None" = None
+        try:
+            self._reader, self._writer = socket.socketpair()
+            self._reader.setblocking(False)
+            self._writer.setblocking(False)
+            win.tk.createfilehandler(self._reader.fileno(), tk.READABLE, self._on_readable)
+        except (AttributeError, OSError, tk.TclError):
+            self._close_sockets()
+            win.after(UI_POLL_MS, self._poll)
+        win.bind("<Destroy>", self._on_destroy, add="+")
+
+    def put(self, message: str) -> None:
+        self._queue.put(message)
+        writer = self._writer
+        if writer is None:
+            return
+        try:
+            writer.send(b"\0")
+        except OSError:
+            # Tampon dolu (uyandırma zaten bekliyor) veya pencere kapandı.
+            pass
+
+    def _on_readable(self, _fd: int, _mask: int) -> None:
+        try:
+            while self._reader is not None and self._reader.recv(4096):
+                pass
+        except OSError:
+            pass
+        self._drain()
+
+    def _poll(self) -> None:
+        if self._drain():
+            self._win.after(UI_POLL_MS, self._poll)
+
+    def _drain(self) -> bool:
+        """Bekleyen mesajları işle; pencere hâlâ açıksa True."""
+        try:
+            while self._win.winfo_exists():
+                handler = self._handlers.get(self._queue.get_nowait())
+                if handler is not None:
+                    handler()
+            return False
+        except queue.Empty:
+            return True
+        except tk.TclError:
+            return False
+
+    def _on_destroy(self, event) -> None:
+        if event.widget is not self._win or self._reader is None:
+            return
+        try:
+            self._win.tk.deletefilehandler(self._reader.fileno())
+        except (AttributeError, tk.TclError):
+            pass
+        self._close_sockets()
+
+    def _close_sockets(self) -> None:
+        reader, writer = self._reader, self._writer
+        self._reader = self._writer = None
+        for sock in (reader, writer):
+            if sock is not None:
+                sock.close()
+
+
 def _dark_panel(parent_win: tk.Misc) -> tk.Frame:
     """1 px kenarlıklı koyu iç panel."""
     outer = tk.Frame(parent_win, bg=BORDER)
@@ -108,19 +240,19 @@ def _dark_button(panel: tk.Frame, text: str, command) -> tk.Button:
 
 # ── Yükleniyor ekranı ─────────────────────────────────────────────────────
 def run_with_status(title: str, status_text: str, task_fn,
-                    parent: "tk.Misc | None" = None):
-    done = {"ok": False, "error": None, "result": None}
-
-    def worker():
-        try:
-            done["result"] = task_fn()
-            done["ok"] = True
-        except Exception as exc:  # noqa: BLE001
-            done["error"] = exc
-
-    t = threading.Thread(target=worker, daemon=True)
-
-    win = _make_dark_win(title, 400, 170, parent)
+                    parent: "tk.Misc | None" = None,
+                    progress: "ProgressChannel | None" = None,
+                    cancel: "CancelToken | None" = None):
+    """task_fn'i arka planda çalıştırırken durum penceresi göster.
+
+    progress verilirse worker'ın yayınladığı fazlar (ve süreleri) canlı olarak
+    alt satırlarda gösterilir. cancel verilirse "İptal" düğmesi (ve pencereyi
+    kapatma) jetonu iptal eder; task_fn jeton etkinken çalışır, süren
+    istekler kesilir ve None döner.
+    """
+    done = {"ok": False, "error": None, "result": None, "cancelled": False}
+
+    win = _make_dark_win(title, 400, 200 if cancel is not None else 170, parent)
     panel = _dark_panel(win)
 
     lbl_main = tk.Label(
@@ -136,22 +268,91 @@ def run_with_status(title: str, status_text: str, task_fn,
     )
     lbl_sub.pack()
 
+    lbl_trace = tk.Label(
+        panel, text="",
+        font=("Segoe UI", 8), fg=MUTED, bg=PANEL,
+    )
+    lbl_trace.pack(pady=(4, 0))
+
+    def on_cancel(_event=None):
+        if cancel is None or cancel.cancelled:
+            return
+        cancel.cancel()
+        lbl_main.configure(text="İptal ediliyor...")
+        btn_cancel.configure(state="disabled")
+        win.after(CANCEL_GRACE_MS, finish)
+
+    if cancel is not None:
+        btn_cancel = _dark_button(panel, "İptal", on_cancel)
+        btn_cancel.pack(pady=(10, 0))
+
+    def worker():
+        try:
+            if cancel is not None:
+                with cancel.activate():
+                    done["result"] = task_fn()
+            else:
+                done["result"] = task_fn()
+            done["ok"] = True
+        except Cancelled:
+            done["cancelled"] = True
+        except Exception as exc:  # noqa: BLE001
+            done["error"] = exc
+        inbox.put(TASK_DONE)
+
+    t = threading.Thread(target=worker, daemon=True)
+
     dots = {"i": 0}
+    # Worker her publish'te kuyruğa yazmaz; bekleyen bir mesaj varsa birleştirir.
+    pending = {"progress": False}
+
+    def render_progress():
+        pending["progress"] = False
+        if progress is None:
+            return
+        events = progress.events()
+        if not events:
+            return
+        current = events[-1]
+        if current.duration is None:
+            running = progress.elapsed() - current.started
+            detail = f" {current.detail}" if current.detail else ""
+            lbl_sub.configure(text=f"{current.phase}{detail} · {running:.1f} s" + "." * dots["i"])
+        finished = [ev for ev in events if ev.duration is not None]
+        if finished:
+            last = finished[-1]
+            lbl_trace.configure(text=f"Önceki: {last.phase} {last.duration:.2f} s")
+
+    def on_progress(_ev) -> None:
+        # Worker thread'de çağrılır: sadece kuyruğa bırak, beklemeden dön.
+        if pending["progress"]:
+            return
+        pending["progress"] = True
+        inbox.put(PROGRESS)
 
     def animate():
-        if done["ok"] or done["error"] is not None:
+        if done["ok"] or done["error"] is not None or done["cancelled"]:
             return
         dots["i"] = (dots["i"] + 1) % 4
-        lbl_sub.configure(text="Lütfen bekleyin" + "." * dots["i"])
+        if progress is not None and progress.latest() is not None:
+            render_progress()
+        else:
+            lbl_sub.configure(text="Lütfen bekleyin" + "." * dots["i"])
         win.after(280, animate)
 
-    def poll():
-        if done["ok"] or done["error"] is not None:
+    def finish():
+        try:
             win.destroy()
-            return
-        win.after(120, poll)
+        except Exception:
+            pass
 
-    win.protocol("WM_DELETE_WINDOW", lambda: None)
+    if progress is not None:
+        progress.subscribe(on_progress)
+    if cancel is not None:
+        win.protocol("WM_DELETE_WINDOW", on_cancel)
+        win.bind("<Escape>", on_cancel)
+    else:
+        win.protocol("WM_DELETE_WINDOW", lambda: None)
 
     try:
         if parent is not None:
@@ -159,14 +360,18 @@ def run_with_status(title: str, status_text: str, task_fn,
     except Exception:
         pass
 
+    inbox = _Inbox(win, {TASK_DONE: finish, PROGRESS: render_progress})
     t.start()
-    win.after(120, poll)
     win.after(280, animate)
 
-    if parent is None:
-        win.mainloop()
-    else:
-        parent.wait_window(win)
+    _wait_window(win, parent)
+
+    if progress is not None:
+        progress.unsubscribe(on_progress)
+
+    if not done["ok"] and cancel is not None and cancel.cancelled:
+        # Kullanıcı iptal etti: hata penceresi gösterme.
+        return None
 
     if done["error"] is not None:
         show_error(title, f"Hata: {done['error']}", parent=parent)
@@ -217,14 +422,12 @@ def _show_dialog(title: str, headline: str, details: str = "",
     except Exception:
         pass
 
-    if parent is None:
-        win.mainloop()
-    else:
+    if parent is not None:
         try:
             win.grab_set()
         except Exception:
             pass
-        parent.wait_window(win)
+    _wait_window(win, parent)
 
 
 def show_info(title: str, text: str, parent: "tk.Misc | None" = None) -> None:
@@ -236,9 +439,15 @@ def show_error(title: str, text: str, parent: "tk.Misc | None" = None) -> None:
 
 
 def show_rich_info(title: str, headline: str, details: str = "",
-                   parent: "tk.Misc | None" = None) -> None:
-    """Büyük başlık + kota satırı — giriş/çıkış başarı ekranı."""
-    has_details = bool(details and details.strip())
+                   parent: "tk.Misc | None" = None,
+                   pending=None) -> None:
+    """Büyük başlık + kota satırı — giriş/çıkış başarı ekranı.
+
+    pending verilirse (-> (ok, başlık, alt satır)) arka planda çalıştırılır;
+    dönünce pencere yeniden çizilir (ok=False ise başlık hata renginde).
+    Böylece eski kota hemen gösterilip güncel değer gelince yenilenir.
+    """
+    has_details = bool(details and details.strip()) or pending is not None
     height = 220 if has_details else 180
 
     win = _make_dark_win(title, 460, height, parent)
@@ -268,6 +477,24 @@ def show_rich_info(title: str, headline: str, details: str = "",
         except Exception:
             pass
 
+    if pending is not None:
+        update = {"result": None}
+
+        def worker():
+            try:
+                update["result"] = pending()
+            except Exception as exc:  # noqa: BLE001
+                update["result"] = (False, headline, f"Hata: {exc}")
+            inbox.put(TASK_DONE)
+
+        def render():
+            ok, new_headline, new_details = update["result"]
+            lbl_head.configure(text=new_headline, fg=FG if ok else ERR_FG)
+            lbl_sub.configure(text=new_details)
+
+        inbox = _Inbox(win, {TASK_DONE: render})
+        threading.Thread(target=worker, daemon=True).start()
+
     btn = _dark_button(actions, "Tamam", close)
     btn.pack(side="right")
     win.protocol("WM_DELETE_WINDOW", close)
@@ -276,11 +503,9 @@ def show_rich_info(title: str, headline: str, details: str = "",
     except Exception:
         pass
 
-    if parent is None:
-        win.mainloop()
-    else:
+    if parent is not None:
         try:
             win.grab_set()
         except Exception:
             pass
-        parent.wait_window(win)
+    _wait_window(win, parent)
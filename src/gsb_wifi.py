@@ -0,0 +1,622 @@
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+# Bağlı Wi-Fi ağının SSID'si (ön kontrol için).
+#
+# Sağlayıcılar önce alt süreç açmadan okur: Windows'ta wlanapi.dll (ctypes),
+# Linux'ta nl80211 (generic netlink). Olmazsa netsh / iw / nmcli'ye düşülür.
+# Sonuç kısa bir süre önbelleğe alınır (GSB_Dosyalar\wifi.json; exe her
+# tıklamada yeni süreç) ve bağlantı durumu özeti (sysfs operstate/carrier,
+# yerel IP'ler) değişince geçersiz sayılır. Uzun ömürlü süreçte (--watch)
+# ağ olayları önbelleği anında düşürür ve otomatik girişi tetikler (bkz.
+# start_link_watcher): Linux'ta rtnetlink, Windows'ta WLAN bildirimleri;
+# ikisi de yoksa bağlantı özeti aralıklarla yoklanır.
+#
+# ssid(): None = bilinmiyor, "" = Wi-Fi'a bağlı değil.
+
+WIFI_NAME = "wifi.json"
+
+SSID_CACHE_SECONDS = 30.0
+# Olay kaynağı olmayan sistemlerde (ve Windows'ta IP gelişi için) yoklama aralığı
+LINK_POLL_SECONDS = 2.0
+
+WIFI_SETTINGS = {
+    "ssid_cache_seconds": float,
+    "link_poll_seconds": float,
+}
+
+SYS_CLASS_NET = Path("/sys/class/net")
+
+
+def run_hidden(
+    argv: List[str], timeout: float = 3.0, env: Optional[Dict[str, str]] = None
+) -> Tuple[int, str, str]:
+    import subprocess
+
+    creationflags = 0
+    startupinfo = None
+    try:
+        creationflags = subprocess.CREATE_NO_WINDOW
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        startupinfo.wShowWindow = 0
+    except Exception:
+        pass
+
+    p = subprocess.run(
+        argv,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        creationflags=creationflags,
+        startupinfo=startupinfo,
+        env=env,
+    )
+    return p.returncode, p.stdout or "", p.stderr or ""
+
+
+class StaticProvider:
+    """Sabit SSID döndürür (testler / SSID'yi zorlamak için)."""
+
+    name = "static"
+
+    def __init__(self, ssid: Optional[str]) -> None:
+        self.value = ssid
+        self.calls = 0
+
+    def ssid(self) -> Optional[str]:
+        self.calls += 1
+        return self.value
+
+
+class ChainProvider:
+    """Sırayla dener; ilk kesin cevabı (None olmayan) döndürür."""
+
+    name = "chain"
+
+    def __init__(self, providers: Sequence) -> None:
+        self.providers = list(providers)
+
+    def ssid(self) -> Optional[str]:
+        for provider in self.providers:
+            try:
+                value = provider.ssid()
+            except Exception:
+                value = None
+            if value is not None:
+                return value
+        return None
+
+
+# --- Windows ------------------------------------------------------------------
+
+
+class NetshProvider:
+    name = "netsh"
+
+    def ssid(self) -> Optional[str]:
+        code, out, _ = run_hidden(["netsh", "wlan", "show", "interfaces"], timeout=2.5)
+        if code != 0:
+            return None
+        for line in out.splitlines():
+            line_s = line.strip()
+            # SSID satırı (BSSID değil)
+            if line_s.lower().startswith("ssid") and not line_s.lower().startswith("bssid"):
+                parts = line_s.split(":", 1)
+                if len(parts) == 2:
+                    return parts[1].strip()
+        return ""
+
+
+class WlanApiProvider:
+    """Native Wifi API: WlanEnumInterfaces + WlanQueryInterface(current_connection)."""
+
+    name = "wlanapi"
+
+    WLAN_INTERFACE_STATE_CONNECTED = 1
+    WLAN_INTF_OPCODE_CURRENT_CONNECTION = 7
+
+    def ssid(self) -> Optional[str]:
+        import ctypes
+        from ctypes import wintypes
+
+        class GUID(ctypes.Structure):
+            _fields_ = [
+                ("Data1", wintypes.DWORD),
+                ("Data2", wintypes.WORD),
+                ("Data3", wintypes.WORD),
+                ("Data4", ctypes.c_ubyte * 8),
+            ]
+
+        class InterfaceInfo(ctypes.Structure):
+            _fields_ = [("guid", GUID), ("description", ctypes.c_wchar * 256), ("state", ctypes.c_uint)]
+
+        class InterfaceInfoList(ctypes.Structure):
+            _fields_ = [("count", wintypes.DWORD), ("index", wintypes.DWORD), ("items", InterfaceInfo * 1)]
+
+        class Dot11Ssid(ctypes.Structure):
+            _fields_ = [("length", wintypes.ULONG), ("ssid", ctypes.c_ubyte * 32)]
+
+        class ConnectionAttributes(ctypes.Structure):
+            # Sadece baştaki alanlar; kalanı (BSSID, güvenlik) okunmuyor.
+            _fields_ = [
+                ("state", ctypes.c_uint),
+                ("mode", ctypes.c_uint),
+                ("profile", ctypes.c_wchar * 256),
+                ("ssid", Dot11Ssid),
+            ]
+
+        try:
+            wlan = ctypes.windll.wlanapi
+        except (AttributeError, OSError):
+            return None
+        handle = wintypes.HANDLE()
+        version = wintypes.DWORD()
+        if wlan.WlanOpenHandle(2, None, ctypes.byref(version), ctypes.byref(handle)) != 0:
+            return None
+        try:
+            iface_list = ctypes.POINTER(InterfaceInfoList)()
+            if wlan.WlanEnumInterfaces(handle, None, ctypes.byref(iface_list)) != 0:
+                return None
+            try:
+                items = ctypes.cast(
+                    ctypes.addressof(iface_list.contents.items), ctypes.POINTER(InterfaceInfo)
+                )
+                for i in range(iface_list.contents.count):
+                    if items[i].state != self.WLAN_INTERFACE_STATE_CONNECTED:
+                        continue
+                    size = wintypes.DWORD()
+                    data = ctypes.c_void_p()
+                    kind = ctypes.c_uint()
+                    rc = wlan.WlanQueryInterface(
+                        handle,
+                        ctypes.byref(items[i].guid),
+                        self.WLAN_INTF_OPCODE_CURRENT_CONNECTION,
+                        None,
+                        ctypes.byref(size),
+                        ctypes.byref(data),
+                        ctypes.byref(kind),
+                    )
+                    if rc != 0:
+                        continue
+                    try:
+                        attrs = ctypes.cast(data, ctypes.POINTER(ConnectionAttributes)).contents
+                        n = min(int(attrs.ssid.length), 32)
+                        return bytes(attrs.ssid.ssid[:n]).decode("utf-8", "replace")
+                    finally:
+                        wlan.WlanFreeMemory(data)
+                return ""
+            finally:
+                wlan.WlanFreeMemory(iface_list)
+        finally:
+            wlan.WlanCloseHandle(handle, None)
+
+
+def _local_addresses() -> str:
+    try:
+        return ",".join(sorted(socket.gethostbyname_ex(socket.gethostname())[2]))
+    except OSError:
+        return ""
+
+
+# --- Linux --------------------------------------------------------------------
+
+
+def wireless_interfaces() -> List[str]:
+    try:
+        names = sorted(p.name for p in SYS_CLASS_NET.iterdir())
+    except OSError:
+        return []
+    return [n for n in names if (SYS_CLASS_NET / n / "wireless").exists() or (SYS_CLASS_NET / n / "phy80211").exists()]
+
+
+def _sysfs(name: str, attr: str) -> str:
+    try:
+        return (SYS_CLASS_NET / name / attr).read_text().strip()
+    except OSError:  # carrier, arayüz kapalıyken EINVAL verir
+        return ""
+
+
+def _linux_signature() -> str:
+    return ";".join(f"{n}:{_sysfs(n, 'operstate')}:{_sysfs(n, 'carrier')}" for n in wireless_interfaces())
+
+
+NETLINK_GENERIC = 16
+NETLINK_ROUTE = 0
+GENL_ID_CTRL = 0x10
+CTRL_CMD_GETFAMILY = 3
+CTRL_ATTR_FAMILY_ID = 1
+CTRL_ATTR_FAMILY_NAME = 2
+NL80211_CMD_GET_INTERFACE = 5
+NL80211_ATTR_IFINDEX = 3
+NL80211_ATTR_SSID = 52
+NLM_F_REQUEST = 1
+NLM_F_DUMP = 0x300
+NLMSG_ERROR = 2
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+RTM_GETADDR = 22
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+IFF_UP = 0x1
+IFF_RUNNING = 0x40
+
+
+def _nla(kind: int, payload: bytes) -> bytes:
+    length = 4 + len(payload)
+    return struct.pack("=HH", length, kind) + payload + b"\0" * (-length % 4)
+
+
+def _parse_attrs(data: bytes) -> Dict[int, bytes]:
+    attrs: Dict[int, bytes] = {}
+    i = 0
+    while i + 4 <= len(data):
+        length, kind = struct.unpack_from("=HH", data, i)
+        if length < 4:
+            break
+        attrs[kind & 0x3FFF] = data[i + 4 : i + length]
+        i += (length + 3) & ~3
+    return attrs
+
+
+class Nl80211Provider:
+    """nl80211 GET_INTERFACE ile SSID (root gerekmez, alt süreç yok)."""
+
+    name = "nl80211"
+
+    def __init__(self) -> None:
+        self._seq = 0
+
+    def _request(self, sock: socket.socket, family: int, cmd: int, attrs: bytes) -> Dict[int, bytes]:
+        self._seq += 1
+        payload = struct.pack("=BBH", cmd, 1, 0) + attrs
+        sock.send(struct.pack("=IHHII", 16 + len(payload), family, NLM_F_REQUEST, self._seq, 0) + payload)
+        data = sock.recv(65536)
+        length, kind = struct.unpack_from("=IH", data)
+        if kind == NLMSG_ERROR:
+            (err,) = struct.unpack_from("=i", data, 16)
+            raise OSError(-err, os.strerror(-err))
+        return _parse_attrs(data[20:length])  # nlmsghdr (16) + genlmsghdr (4)
+
+    def ssid(self) -> Optional[str]:
+        if not hasattr(socket, "AF_NETLINK"):
+            return None
+        names = wireless_interfaces()
+        if not names:
+            return ""
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_GENERIC)
+        except OSError:
+            return None
+        try:
+            sock.settimeout(1.0)
+            sock.bind((0, 0))
+            family = self._request(
+                sock, GENL_ID_CTRL, CTRL_CMD_GETFAMILY, _nla(CTRL_ATTR_FAMILY_NAME, b"nl80211\0")
+            )
+            (family_id,) = struct.unpack("=H", family[CTRL_ATTR_FAMILY_ID][:2])
+            for name in names:
+                try:
+                    index = socket.if_nametoindex(name)
+                    reply = self._request(
+                        sock, family_id, NL80211_CMD_GET_INTERFACE, _nla(NL80211_ATTR_IFINDEX, struct.pack("=I", index))
+                    )
+                except OSError:
+                    continue
+                if NL80211_ATTR_SSID in reply:
+                    return reply[NL80211_ATTR_SSID].decode("utf-8", "replace")
+            return ""
+        except (OSError, KeyError, struct.error):
+            return None
+        finally:
+            sock.close()
+
+
+class IwProvider:
+    name = "iw"
+
+    def ssid(self) -> Optional[str]:
+        names = wireless_interfaces()
+        if not names:
+            return ""
+        # Bir arayüz okunamazsa sıradakine geçilir; SSID bulunamadıysa ve bir
+        # arayüz okunamadıysa sonuç bilinmiyor (None), hepsi okunduysa "".
+        unknown = False
+        for name in names:
+            try:
+                code, out, _ = run_hidden(["iw", "dev", name, "link"], timeout=2.0)
+            except (OSError, ValueError):
+                unknown = True
+                continue
+            if code != 0:
+                unknown = True
+                continue
+            for line in out.splitlines():
+                line_s = line.strip()
+                if line_s.startswith("SSID:"):
+                    return line_s[5:].strip()
+        return None if unknown else ""
+
+
+class NmcliProvider:
+    name = "nmcli"
+
+    def ssid(self) -> Optional[str]:
+        env = dict(os.environ, LC_ALL="C")
+        try:
+            code, out, _ = run_hidden(["nmcli", "-t", "-f", "ACTIVE,SSID", "dev", "wifi"], timeout=3.0, env=env)
+        except (OSError, ValueError):
+            return None
+        if code != 0:
+            return None
+        for line in out.splitlines():
+            if line.startswith("yes:"):
+                return line[4:].replace("\\:", ":")
+        return ""
+
+
+def default_provider() -> ChainProvider:
+    if sys.platform == "win32":
+        return ChainProvider([WlanApiProvider(), NetshProvider()])
+    if sys.platform.startswith("linux"):
+        return ChainProvider([Nl80211Provider(), IwProvider(), NmcliProvider()])
+    return ChainProvider([])
+
+
+def link_signature() -> str:
+    """Bağlantı durumunun ucuz özeti; değişirse önbellekteki SSID geçersizdir."""
+    if sys.platform.startswith("linux"):
+        return _linux_signature()
+    return _local_addresses()
+
+
+class CacheEntry(NamedTuple):
+    ssid: Optional[str]
+    at: float
+    signature: str
+
+
+class SSIDCache:
+    def __init__(
+        self,
+        provider=None,
+        signature: Callable[[], str] = link_signature,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.provider = provider if provider is not None else default_provider()
+        self._signature = signature
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entry: Optional[CacheEntry] = None
+        self.path: Optional[Path] = None
+
+    def load(self, path: Path) -> None:
+        self.path = path
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            entry = CacheEntry(data.get("ssid"), float(data["at"]), str(data["signature"]))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return
+        with self._lock:
+            if self._entry is None or entry.at > self._entry.at:
+                self._entry = entry
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entry = None
+        if self.path is not None:
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+
+    def _save(self, entry: CacheEntry) -> None:
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(entry._asdict()), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def ssid(self) -> Optional[str]:
+        now = self._clock()
+        signature = self._signature()
+        with self._lock:
+            entry = self._entry
+        if entry is not None and 0 <= now - entry.at < SSID_CACHE_SECONDS and entry.signature == signature:
+            return entry.ssid
+        try:
+            value = self.provider.ssid()
+        except Exception:
+            value = None
+        entry = CacheEntry(value, now, signature)
+        with self._lock:
+            self._entry = entry
+        if value is not None:
+            self._save(entry)
+        return value
+
+
+WLAN_NOTIFICATION_SOURCE_ACM = 0x8
+WLAN_ACM_CONNECTION_COMPLETE = 10
+
+# WLAN geri çağrısı ve tutamağı süreç boyunca yaşamalı (ctypes çağrıyı serbest bırakmasın).
+_wlan_registrations: List[object] = []
+
+
+class LinkTracker:
+    """rtnetlink mesajlarından yalnızca "bağlantı geldi" olaylarını süzer.
+
+    Bir arayüzün IFF_RUNNING'e geçmesi veya yeni bir IPv4 adresi alması
+    olaydır. Kopma, RTM_DELADDR, sürücünün her arka plan taramasında
+    gönderdiği (durumu değiştirmeyen) RTM_NEWLINK ve aynı adresin DHCP
+    yenilemesi olay değildir. own_pid'den gelen mesajlar (başlangıçtaki
+    adres dökümü) durumu doldurur ama olay sayılmaz.
+    """
+
+    def __init__(self, running: Optional[Dict[int, bool]] = None) -> None:
+        self.running: Dict[int, bool] = dict(running or {})
+        self.addresses: Set[Tuple[int, bytes]] = set()
+
+    def feed(self, data: bytes, own_pid: int = -1) -> bool:
+        up = False
+        i = 0
+        while i + 16 <= len(data):
+            length, kind, _flags, _seq, pid = struct.unpack_from("=IHHII", data, i)
+            if length < 16:
+                break
+            body = data[i + 16 : i + length]
+            i += (length + 3) & ~3
+            if kind in (RTM_NEWLINK, RTM_DELLINK) and len(body) >= 16:
+                _family, _pad, _type, index, flags, _change = struct.unpack_from("=BBHiII", body)
+                running = kind == RTM_NEWLINK and bool(flags & IFF_RUNNING)
+                was = self.running.get(index, False)
+                self.running[index] = running
+                if running and not was and pid != own_pid:
+                    up = True
+            elif kind in (RTM_NEWADDR, RTM_DELADDR) and len(body) >= 8:
+                _family, _prefix, _flags, _scope, index = struct.unpack_from("=BBBBi", body)
+                attrs = _parse_attrs(body[8:])
+                key = (index, attrs.get(IFA_LOCAL) or attrs.get(IFA_ADDRESS) or b"")
+                if kind == RTM_DELADDR:
+                    self.addresses.discard(key)
+                elif key not in self.addresses:
+                    self.addresses.add(key)
+                    if pid != own_pid:
+                        up = True
+        return up
+
+
+def _running_links() -> Dict[int, bool]:
+    """ifindex -> IFF_RUNNING, sysfs'ten (izleyici başlarken).
+
+    sysfs "flags" IFF_RUNNING'i içermez; çekirdek onu netlink'te IFF_UP ve
+    operstate'ten (up/unknown) türetir, burada da öyle yapılır.
+    """
+    running: Dict[int, bool] = {}
+    try:
+        names = [p.name for p in SYS_CLASS_NET.iterdir()]
+    except OSError:
+        return running
+    for name in names:
+        try:
+            up = bool(int(_sysfs(name, "flags"), 16) & IFF_UP)
+            running[int(_sysfs(name, "ifindex"))] = up and _sysfs(name, "operstate") in ("up", "unknown")
+        except ValueError:
+            continue
+    return running
+
+
+def _watch_rtnetlink(on_change: Callable[[], None]) -> bool:
+    if not hasattr(socket, "AF_NETLINK"):
+        return False
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+        sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR))
+        own_pid = sock.getsockname()[0]
+    except OSError:
+        return False
+    tracker = LinkTracker(_running_links())
+    try:
+        # Mevcut adresler: yenilenmeleri yeni adres sayılmasın.
+        payload = struct.pack("=BBBBi", socket.AF_INET, 0, 0, 0, 0)
+        sock.send(struct.pack("=IHHII", 16 + len(payload), RTM_GETADDR, NLM_F_REQUEST | NLM_F_DUMP, 1, 0) + payload)
+    except OSError:
+        pass
+
+    def loop() -> None:
+        while True:
+            try:
+                data = sock.recv(65536)
+            except OSError:
+                return
+            if tracker.feed(data, own_pid):
+                on_change()
+
+    threading.Thread(target=loop, name="gsb-link-watch", daemon=True).start()
+    return True
+
+
+def _watch_wlanapi(on_change: Callable[[], None]) -> bool:
+    """Windows: WlanRegisterNotification ile bağlanma/kopma bildirimleri."""
+    if sys.platform != "win32":
+        return False
+    import ctypes
+    from ctypes import wintypes
+
+    class NotificationData(ctypes.Structure):
+        _fields_ = [
+            ("source", wintypes.DWORD),
+            ("code", wintypes.DWORD),
+            ("guid", ctypes.c_ubyte * 16),
+            ("size", wintypes.DWORD),
+            ("data", ctypes.c_void_p),
+        ]
+
+    callback_type = ctypes.WINFUNCTYPE(None, ctypes.POINTER(NotificationData), ctypes.c_void_p)
+
+    def callback(data, _context) -> None:  # type: ignore[no-untyped-def]
+        try:
+            if data and data.contents.code == WLAN_ACM_CONNECTION_COMPLETE:
+                on_change()
+        except Exception:
+            pass
+
+    try:
+        wlan = ctypes.windll.wlanapi
+    except (AttributeError, OSError):
+        return False
+    handle = wintypes.HANDLE()
+    version = wintypes.DWORD()
+    if wlan.WlanOpenHandle(2, None, ctypes.byref(version), ctypes.byref(handle)) != 0:
+        return False
+    func = callback_type(callback)
+    if wlan.WlanRegisterNotification(handle, WLAN_NOTIFICATION_SOURCE_ACM, True, func, None, None, None) != 0:
+        wlan.WlanCloseHandle(handle, None)
+        return False
+    _wlan_registrations.append((handle, func))
+    return True
+
+
+def _watch_poll(on_change: Callable[[], None]) -> None:
+    def loop() -> None:
+        last = link_signature()
+        while True:
+            time.sleep(LINK_POLL_SECONDS)
+            current = link_signature()
+            if current != last:
+                last = current
+                on_change()
+
+    threading.Thread(target=loop, name="gsb-link-poll", daemon=True).start()
+
+
+def start_link_watcher(on_change: Callable[[], None]) -> str:
+    """Ağ bağlantısı gelince on_change'i çağır (daemon thread'lerde).
+
+    Linux: rtnetlink'te bir arayüzün çalışır hale gelmesi veya yeni IPv4
+    adresi (bağlanma ve DHCP sonrası; bkz. LinkTracker). Windows: WLAN
+    bağlantı tamamlandı bildirimi; IP'nin gelişi ayrıca yoklanır.
+    Diğerleri: bağlantı özeti (link_signature) LINK_POLL_SECONDS'ta bir
+    yoklanır. Kullanılan kaynakların adını döndürür.
+    """
+    if _watch_rtnetlink(on_change):
+        return "rtnetlink"
+    _watch_poll(on_change)
+    if _watch_wlanapi(on_change):
+        return "wlanapi+poll"
+    return "poll"
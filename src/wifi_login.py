@@ -1,27 +1,55 @@
 import os
 import re
 import socket
+import tempfile
 import time
-from typing import Dict, List
-from urllib.parse import urljoin
+from pathlib import Path
+from typing import Dict, Iterator, List, Set, Tuple
+from urllib.parse import urljoin, urlsplit
 
 import requests
 from bs4 import BeautifulSoup
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from gsb_adapters import mount as mount_latency
+from gsb_endpoints import EndpointBook
+from gsb_latency import LatencyModel
+from gsb_portal import load_profile, response_encoding
+
 USERNAME = os.getenv("WIFI_USERNAME", "14933986294")
 PASSWORD = os.getenv("WIFI_PASSWORD", "Ahmet+100")
 
+# Portal profili: ad (./portals/<ad>.json) veya JSON yolu; boşsa GSB (bkz. gsb_portal)
+PORTAL = load_profile(Path.cwd(), os.getenv("WIFI_PORTAL_PROFILE", ""))
+
 # Login sayfası (GET) ve form post endpoint'i (POST)
-LOGIN_PAGE_URL = os.getenv("WIFI_LOGIN_PAGE_URL", "https://wifi.gsb.gov.tr/login.html")
-AUTH_URL = os.getenv("WIFI_AUTH_URL", "")
+LOGIN_PAGE_URL = os.getenv("WIFI_LOGIN_PAGE_URL", PORTAL.login_page_url)
+AUTH_URL = os.getenv("WIFI_AUTH_URL", PORTAL.auth_url)
 QUOTA_URL = os.getenv("WIFI_QUOTA_URL", "")
 
+# Ölçüm yokken kullanılan zaman aşımları; sonrası gecikme modelinden (gsb_latency).
 CONNECT_TIMEOUT = 4
 READ_TIMEOUT = 8
 MAX_LOGIN_ATTEMPT = 4
 
+# Gecikme modeli çalıştırmalar arasında burada saklanır.
+LATENCY_FILE = Path(os.getenv("WIFI_LATENCY_FILE", str(Path(tempfile.gettempdir()) / "gsb_wifi_latency.json")))
+LATENCY = LatencyModel()
+
+# Kotayı veren sayfa (adres, yöntem, desen) profil başına öğrenilir; sonraki
+# çalıştırmada tarama yerine önce o denenir (bkz. gsb_endpoints).
+QUOTA_FILE = Path(os.getenv("WIFI_QUOTA_FILE", str(Path(tempfile.gettempdir()) / "gsb_wifi_quota.json")))
+ENDPOINTS = EndpointBook()
+ENDPOINT_PROFILE = PORTAL.name or LOGIN_PAGE_URL
+QUOTA_MAX_CANDIDATES = 8
+
+QUOTA_NOT_FOUND = "Kota bilgisi HTML içinde otomatik bulunamadı."
+QUOTA_PATTERNS = [
+	r"(kalan\s*kota[^\d]{0,20}\d+[\.,]?\d*\s*(?:mb|gb))",
+	r"(kota[^\d]{0,20}\d+[\.,]?\d*\s*(?:mb|gb))",
+	r"(kullan[ıi]m[^\d]{0,20}\d+[\.,]?\d*\s*(?:mb|gb))",
+]
+
 
 def build_session() -> requests.Session:
 	session = requests.Session()
@@ -34,9 +62,7 @@ def build_session() -> requests.Session:
 		status_forcelist=[429, 500, 502, 503, 504],
 		allowed_methods=["GET", "POST"],
 	)
-	adapter = HTTPAdapter(max_retries=retries, pool_connections=10, pool_maxsize=10)
-	session.mount("http://", adapter)
-	session.mount("https://", adapter)
+	mount_latency(session, LATENCY, max_retries=retries, pool_connections=10, pool_maxsize=10)
 
 	# Windows proxy/env ayarlarını bypass eder (bazı ağlarda gecikmeyi azaltır)
 	session.trust_env = False
@@ -67,36 +93,40 @@ def resolve_auth_url(html_text: str, fallback_url: str) -> str:
 	soup = BeautifulSoup(html_text, "html.parser")
 	form = soup.find("form")
 	if not form:
-		return urljoin(fallback_url, "/j_spring_security_check")
+		return urljoin(fallback_url, PORTAL.form_action)
 
 	action = (form.get("action") or "").strip()
 	if not action:
-		return urljoin(fallback_url, "/j_spring_security_check")
+		return urljoin(fallback_url, PORTAL.form_action)
 
 	return urljoin(fallback_url, action)
 
 
-def extract_quota_info(html_text: str) -> str:
+def match_quota(html_text: str, preferred: int = 0) -> Tuple[str, int]:
+	"""(kota metni, eşleşen desenin sırası); yoksa ("", -1). preferred önce denenir."""
 	soup = BeautifulSoup(html_text, "html.parser")
 	plain_text = " ".join(soup.stripped_strings)
 
-	patterns = [
-		r"(kalan\s*kota[^\d]{0,20}\d+[\.,]?\d*\s*(?:mb|gb))",
-		r"(kota[^\d]{0,20}\d+[\.,]?\d*\s*(?:mb|gb))",
-		r"(kullan[ıi]m[^\d]{0,20}\d+[\.,]?\d*\s*(?:mb|gb))",
-	]
+	order = list(range(len(QUOTA_PATTERNS)))
+	if 0 < preferred < len(order):
+		order.remove(preferred)
+		order.insert(0, preferred)
 
-	for pattern in patterns:
-		match = re.search(pattern, plain_text, flags=re.IGNORECASE)
+	for index in order:
+		match = re.search(QUOTA_PATTERNS[index], plain_text, flags=re.IGNORECASE)
 		if match:
-			return match.group(1)
+			return match.group(1), index
 
-	return "Kota bilgisi HTML içinde otomatik bulunamadı."
+	return "", -1
+
+
+def extract_quota_info(html_text: str) -> str:
+	text, _ = match_quota(html_text)
+	return text or QUOTA_NOT_FOUND
 
 
 def discover_quota_urls(html_text: str, base_url: str) -> List[str]:
 	soup = BeautifulSoup(html_text, "html.parser")
-	keywords = ("kota", "kalan", "kullanım", "kullanim", "internet", "paket")
 	urls: List[str] = []
 
 	def add_url(raw_url: str) -> None:
@@ -109,19 +139,19 @@ def discover_quota_urls(html_text: str, base_url: str) -> List[str]:
 			urls.append(full)
 
 	for link in soup.find_all("a", href=True):
-		label = f"{link.get_text(' ', strip=True)} {link.get('href', '')}".lower()
-		if any(word in label for word in keywords):
+		label = f"{link.get_text(' ', strip=True)} {link.get('href', '')}"
+		if "quota" in PORTAL.link_kinds(label):
 			add_url(link.get("href", ""))
 
 	for form in soup.find_all("form"):
 		action = form.get("action", "")
-		label = f"{form.get_text(' ', strip=True)} {action}".lower()
-		if any(word in label for word in keywords):
+		label = f"{form.get_text(' ', strip=True)} {action}"
+		if "quota" in PORTAL.link_kinds(label):
 			add_url(action)
 
 	for element in soup.find_all(attrs={"onclick": True}):
 		onclick = element.get("onclick", "")
-		if any(word in onclick.lower() for word in keywords):
+		if "quota" in PORTAL.link_kinds(onclick):
 			match = re.search(r"['\"]([^'\"]+)['\"]", onclick)
 			if match:
 				add_url(match.group(1))
@@ -129,34 +159,58 @@ def discover_quota_urls(html_text: str, base_url: str) -> List[str]:
 	return urls
 
 
-def print_quota_info(session: requests.Session, login_response_text: str, current_url: str) -> None:
-	print("\n--- Kota Bilgisi ---")
-	initial = extract_quota_info(login_response_text)
-	print(initial)
-
-	candidate_urls: List[str] = []
+def quota_candidates(login_response_text: str, current_url: str) -> Iterator[Tuple[str, int]]:
+	"""(adres, tercih edilen desen) sırası: öğrenilmişler, QUOTA_URL, tarama,
+	en son düşürülmüş öğrenilmişler. Sayfa ancak gerekirse taranır."""
+	learned = ENDPOINTS.ranked(ENDPOINT_PROFILE, "quota")
+	for ep in learned:
+		if not ep.demoted:
+			yield ep.url, ep.layout
 	if QUOTA_URL:
-		candidate_urls.append(QUOTA_URL)
+		yield QUOTA_URL, 0
+	print("Aday kota sayfaları kontrol ediliyor...")
+	for url in discover_quota_urls(login_response_text, current_url):
+		yield url, 0
+	for ep in learned:
+		if ep.demoted:
+			yield ep.url, ep.layout
 
-	candidate_urls.extend(discover_quota_urls(login_response_text, current_url))
 
-	if initial == "Kota bilgisi HTML içinde otomatik bulunamadı." and candidate_urls:
-		print("Aday kota sayfaları kontrol ediliyor...")
-
-	for candidate in candidate_urls[:8]:
+def print_quota_info(session: requests.Session, login_response_text: str, current_url: str) -> None:
+	print("\n--- Kota Bilgisi ---")
+	initial, _ = match_quota(login_response_text)
+	if initial:
+		print(initial)
+		return
+	print(QUOTA_NOT_FOUND)
+
+	known = {ep.url for ep in ENDPOINTS.ranked(ENDPOINT_PROFILE, "quota")}
+	seen: Set[str] = set()
+	for candidate, layout in quota_candidates(login_response_text, current_url):
+		if candidate in seen:
+			continue
+		if len(seen) >= QUOTA_MAX_CANDIDATES:
+			break
+		seen.add(candidate)
+		parsed = ""
 		try:
 			quota_resp = session.get(
 				candidate,
-				timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+				timeout=request_timeout(candidate),
 				allow_redirects=True,
 			)
 			quota_resp.raise_for_status()
-			parsed = extract_quota_info(quota_resp.text)
-			if parsed != "Kota bilgisi HTML içinde otomatik bulunamadı.":
-				print(f"Kota bulundu ({candidate}): {parsed}")
-				return
+			parsed, layout = match_quota(quota_resp.text, layout)
 		except Exception as exc:
 			print(f"Kota adayı okunamadı ({candidate}): {exc}")
+		if parsed:
+			ep = ENDPOINTS.hit(ENDPOINT_PROFILE, "quota", candidate, "GET", layout)
+			print(f"Kota bulundu ({candidate}, isabet {ep.hits}): {parsed}")
+			return
+		if candidate in known:
+			missed = ENDPOINTS.miss(ENDPOINT_PROFILE, "quota", candidate)
+			state = f"art arda {missed.misses} ıska" if missed else "unutuldu"
+			print(f"Öğrenilmiş kota adresi ıskaladı ({candidate}, {state})")
 
 
 def login_once(session: requests.Session) -> bool:
@@ -167,7 +221,7 @@ def login_once(session: requests.Session) -> bool:
 
 	login_page = session.get(
 		LOGIN_PAGE_URL,
-		timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+		timeout=request_timeout(LOGIN_PAGE_URL),
 		allow_redirects=True,
 	)
 	login_page.raise_for_status()
@@ -175,18 +229,12 @@ def login_once(session: requests.Session) -> bool:
 	auth_url = resolve_auth_url(login_page.text, LOGIN_PAGE_URL)
 
 	payload = extract_hidden_inputs(login_page.text)
-	payload.update(
-		{
-			"j_username": USERNAME,
-			"j_password": PASSWORD,
-			"submit": "Login",
-		}
-	)
+	payload.update(PORTAL.credentials(USERNAME, PASSWORD))
 
 	response = session.post(
 		auth_url,
 		data=payload,
-		timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+		timeout=request_timeout(auth_url),
 		allow_redirects=True,
 		headers={"Referer": LOGIN_PAGE_URL, "Content-Type": "application/x-www-form-urlencoded"},
 	)
@@ -194,8 +242,7 @@ def login_once(session: requests.Session) -> bool:
 	elapsed = time.perf_counter() - start
 
 	# Basit başarı kontrolü: login formu tekrar görünmüyorsa başarılı kabul et
-	body_lower = response.text.lower()
-	login_form_back = "j_spring_security_check" in body_lower or "j_username" in body_lower
+	login_form_back = PORTAL.is_login_page(response.content, encoding=response_encoding(response))
 	success = response.status_code in (200, 302, 303) and not login_form_back
 
 	print(f"Durum: {response.status_code} | Süre: {elapsed:.2f}s | POST: {auth_url}")
@@ -204,9 +251,13 @@ def login_once(session: requests.Session) -> bool:
 	return success
 
 
+def request_timeout(url: str) -> Tuple[float, float]:
+	return LATENCY.timeout(url, (CONNECT_TIMEOUT, READ_TIMEOUT))
+
+
 def dns_precheck(url: str) -> None:
-	host = url.split("//", 1)[-1].split("/", 1)[0]
-	socket.getaddrinfo(host, 443)
+	# Port içeren URL'lerde (yerel simülatör) host yalnızca adres kısmıdır.
+	socket.getaddrinfo(urlsplit(url).hostname or "", 443)
 
 
 def fast_login() -> None:
@@ -227,10 +278,16 @@ def fast_login() -> None:
 		except Exception as exc:
 			print(f"❌ Hata: {exc}")
 
-		time.sleep(min(0.6 * attempt, 2.0))
+		time.sleep(LATENCY.retry_sleep(attempt, LOGIN_PAGE_URL))
 
 	print("⛔ Maksimum deneme sayısına ulaşıldı.")
 
 
 if __name__ == "__main__":
-	fast_login()
\ No newline at end of file
+	LATENCY.load(LATENCY_FILE)
+	ENDPOINTS.load(QUOTA_FILE)
+	try:
+		fast_login()
+	finally:
+		LATENCY.save()
+		ENDPOINTS.save()
\ No newline at end of file
@@ -1,23 +1,35 @@
 import os
 import re
 import socket
+import tempfile
 import time
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlsplit
 
 import requests
 from bs4 import BeautifulSoup
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
-PORTAL_URL = os.getenv("WIFI_PORTAL_URL", "https://wifi.gsb.gov.tr")
-LOGIN_PAGE_URL = os.getenv("WIFI_LOGIN_PAGE_URL", "https://wifi.gsb.gov.tr/login.html")
-LOGOUT_URL = os.getenv("WIFI_LOGOUT_URL", "https://wifi.gsb.gov.tr/logout")
+from gsb_adapters import mount as mount_latency
+from gsb_latency import LatencyModel
+from gsb_portal import load_profile
 
+# Portal profili: ad (./portals/<ad>.json) veya JSON yolu; boşsa GSB (bkz. gsb_portal)
+PORTAL = load_profile(Path.cwd(), os.getenv("WIFI_PORTAL_PROFILE", ""))
+
+PORTAL_URL = os.getenv("WIFI_PORTAL_URL", PORTAL.portal_url)
+LOGIN_PAGE_URL = os.getenv("WIFI_LOGIN_PAGE_URL", PORTAL.login_page_url)
+LOGOUT_URL = os.getenv("WIFI_LOGOUT_URL", PORTAL.logout_url)
+
+# Ölçüm yokken kullanılan zaman aşımları; sonrası gecikme modelinden (gsb_latency).
 CONNECT_TIMEOUT = 4
 READ_TIMEOUT = 8
 MAX_ATTEMPT = 4
-LOGOUT_SUCCESS_HINTS = ("logout=1", "cikisson", "login.html")
+
+# Gecikme modeli çalıştırmalar arasında burada saklanır.
+LATENCY_FILE = Path(os.getenv("WIFI_LATENCY_FILE", str(Path(tempfile.gettempdir()) / "gsb_wifi_latency.json")))
+LATENCY = LatencyModel()
 
 
 def build_session() -> requests.Session:
@@ -31,9 +43,7 @@ def build_session() -> requests.Session:
         status_forcelist=[429, 500, 502, 503, 504],
         allowed_methods=["GET", "POST"],
     )
-    adapter = HTTPAdapter(max_retries=retries, pool_connections=10, pool_maxsize=10)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
+    mount_latency(session, LATENCY, max_retries=retries, pool_connections=10, pool_maxsize=10)
 
     session.trust_env = False
     session.headers.update(
@@ -47,9 +57,13 @@ def build_session() -> requests.Session:
     return session
 
 
+def request_timeout(url: str) -> Tuple[float, float]:
+    return LATENCY.timeout(url, (CONNECT_TIMEOUT, READ_TIMEOUT))
+
+
 def dns_precheck(url: str) -> None:
-    host = url.split("//", 1)[-1].split("/", 1)[0]
-    socket.getaddrinfo(host, 443)
+    # Port içeren URL'lerde (yerel simülatör) host yalnızca adres kısmıdır.
+    socket.getaddrinfo(urlsplit(url).hostname or "", 443)
 
 
 def hidden_inputs(form) -> Dict[str, str]:
@@ -61,7 +75,6 @@ def hidden_inputs(form) -> Dict[str, str]:
 
 def discover_logout_actions(html_text: str, base_url: str) -> List[Tuple[str, str, Dict[str, str]]]:
     soup = BeautifulSoup(html_text, "html.parser")
-    keywords = ("logout", "log out", "çıkış", "cikis", "oturumu kapat", "güvenli çıkış")
     actions: List[Tuple[str, str, Dict[str, str]]] = []
 
     def add_action(url: str, method: str = "GET", payload: Optional[Dict[str, str]] = None) -> None:
@@ -76,16 +89,16 @@ def discover_logout_actions(html_text: str, base_url: str) -> List[Tuple[str, st
             actions.append(item)
 
     for link in soup.find_all("a", href=True):
-        label = f"{link.get_text(' ', strip=True)} {link.get('href', '')}".lower()
-        if any(word in label for word in keywords):
+        label = f"{link.get_text(' ', strip=True)} {link.get('href', '')}"
+        if "logout" in PORTAL.link_kinds(label):
             add_action(link.get("href", ""), "GET")
 
     for button in soup.find_all(["button", "input"]):
         text_blob = (
             f"{button.get_text(' ', strip=True)} "
             f"{button.get('value', '')} {button.get('id', '')} {button.get('name', '')}"
-        ).lower()
-        if any(word in text_blob for word in keywords):
+        )
+        if "logout" in PORTAL.link_kinds(text_blob):
             form = button.find_parent("form")
             if form:
                 action = form.get("action", "")
@@ -97,16 +110,15 @@ def discover_logout_actions(html_text: str, base_url: str) -> List[Tuple[str, st
 
     for form in soup.find_all("form"):
         action = form.get("action", "")
-        text_blob = f"{form.get_text(' ', strip=True)} {action}".lower()
-        if any(word in text_blob for word in keywords):
+        text_blob = f"{form.get_text(' ', strip=True)} {action}"
+        if "logout" in PORTAL.link_kinds(text_blob):
             method = form.get("method", "POST")
             payload = hidden_inputs(form)
             add_action(action, method, payload)
 
     for item in soup.find_all(attrs={"onclick": True}):
         onclick = item.get("onclick", "")
-        onclick_l = onclick.lower()
-        if any(word in onclick_l for word in keywords):
+        if "logout" in PORTAL.link_kinds(onclick):
             match = re.search(r"['\"]([^'\"]+)['\"]", onclick)
             if match:
                 add_action(match.group(1), "GET")
@@ -119,23 +131,15 @@ def try_logout(session: requests.Session, method: str, url: str, payload: Dict[s
         resp = session.post(
             url,
             data=payload,
-            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+            timeout=request_timeout(url),
             allow_redirects=True,
             headers={"Referer": PORTAL_URL, "Content-Type": "application/x-www-form-urlencoded"},
         )
     else:
-        resp = session.get(url, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), allow_redirects=True)
+        resp = session.get(url, timeout=request_timeout(url), allow_redirects=True)
 
     code_ok = resp.status_code in (200, 302, 303)
-    final_url = resp.url.lower()
-    body = resp.text.lower()
-    looks_logged_out = (
-        "j_spring_security_check" in body
-        or "j_username" in body
-        or "login" in body
-        or "giriş" in body
-        or any(hint in final_url for hint in LOGOUT_SUCCESS_HINTS)
-    )
+    looks_logged_out = PORTAL.is_logged_out_response(resp)
 
     message = f"{method} {url} -> {resp.status_code} | final: {resp.url}"
     return (code_ok and looks_logged_out), message
@@ -160,11 +164,11 @@ def logout_flow() -> None:
                     print("✅ Çıkış başarılı")
                     return
 
-            page = session.get(PORTAL_URL, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), allow_redirects=True)
+            page = session.get(PORTAL_URL, timeout=request_timeout(PORTAL_URL), allow_redirects=True)
             actions = discover_logout_actions(page.text, page.url)
 
             if not actions:
-                page2 = session.get(LOGIN_PAGE_URL, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), allow_redirects=True)
+                page2 = session.get(LOGIN_PAGE_URL, timeout=request_timeout(LOGIN_PAGE_URL), allow_redirects=True)
                 actions = discover_logout_actions(page2.text, page2.url)
 
             if not actions:
@@ -181,10 +185,14 @@ def logout_flow() -> None:
         except Exception as exc:
             print(f"❌ Hata: {exc}")
 
-        time.sleep(min(0.6 * attempt, 2.0))
+        time.sleep(LATENCY.retry_sleep(attempt, PORTAL_URL))
 
     print("⛔ Çıkış yapılamadı. F12 > Network > logout isteğini paylaş, URL'i sabitleyelim.")
 
 
 if __name__ == "__main__":
-    logout_flow()
+    LATENCY.load(LATENCY_FILE)
+    try:
+        logout_flow()
+    finally:
+        LATENCY.save()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Modüller src/ altında düz dosyalardır ve birbirini adıyla import eder.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
@@ -0,0 +1,96 @@
+import pytest
+
+import gsb_breaker
+from gsb_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+URL = "http://portal.example/login"
+HOST = gsb_breaker.endpoint_keys(URL)[0]
+
+
+class FakeTime:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(gsb_breaker, "time", fake)
+    return fake
+
+
+def trip(breaker: CircuitBreaker) -> None:
+    for _ in range(gsb_breaker.BREAKER_FAILURE_THRESHOLD):
+        assert breaker.before_request(URL) is False
+        breaker.record(URL, False)
+
+
+def test_opens_after_threshold_failures(clock):
+    breaker = CircuitBreaker()
+    for _ in range(gsb_breaker.BREAKER_FAILURE_THRESHOLD - 1):
+        breaker.record(URL, False)
+    assert breaker.state(HOST)["state"] == CLOSED
+    breaker.record(URL, False)
+    assert breaker.state(HOST)["state"] == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(URL)
+
+
+def test_half_open_probe_success_closes(clock):
+    breaker = CircuitBreaker()
+    trip(breaker)
+    clock.now += gsb_breaker.BREAKER_OPEN_SECONDS
+    assert breaker.before_request(URL) is True
+    assert breaker.state(HOST)["state"] == HALF_OPEN
+    breaker.record(URL, True, probe=True)
+    assert breaker.state(HOST) == gsb_breaker._empty()
+    assert breaker.before_request(URL) is False
+
+
+def test_half_open_probe_failure_reopens_with_longer_wait(clock):
+    breaker = CircuitBreaker()
+    trip(breaker)
+    clock.now += gsb_breaker.BREAKER_OPEN_SECONDS
+    assert breaker.before_request(URL) is True
+    breaker.record(URL, False, probe=True)
+    entry = breaker.state(HOST)
+    assert entry["state"] == OPEN
+    assert entry["open_seconds"] == 2 * gsb_breaker.BREAKER_OPEN_SECONDS
+    clock.now += gsb_breaker.BREAKER_OPEN_SECONDS
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(URL)
+
+
+def test_only_one_process_gets_the_probe(clock, tmp_path):
+    path = tmp_path / "breaker.json"
+    first, second = CircuitBreaker(path), CircuitBreaker(path)
+    trip(first)
+    clock.now += gsb_breaker.BREAKER_OPEN_SECONDS
+    assert first.before_request(URL) is True
+    with pytest.raises(CircuitOpenError):
+        second.before_request(URL)
+    first.record(URL, True, probe=True)
+    assert second.before_request(URL) is False
+
+
+def _fail_many(path, count):
+    breaker = CircuitBreaker(path)
+    for _ in range(count):
+        breaker.record(URL, False)
+
+
+def test_failures_from_concurrent_processes_are_all_counted(tmp_path, monkeypatch):
+    import multiprocessing
+
+    monkeypatch.setattr(gsb_breaker, "BREAKER_FAILURE_THRESHOLD", 10_000)
+    path = tmp_path / "breaker.json"
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_fail_many, args=(path, 25)) for _ in range(4)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    assert CircuitBreaker(path).state(HOST)["failures"] == 100
@@ -0,0 +1,43 @@
+import types
+
+import pytest
+
+from gsb_config import apply_settings, read_settings, write_settings
+
+KEYS = {"link_login": bool, "connect_timeout": float, "max_tries": int}
+
+
+def module():
+    return types.SimpleNamespace(LINK_LOGIN=True, CONNECT_TIMEOUT=4.0, MAX_TRIES=3)
+
+
+@pytest.mark.parametrize("raw, expected", [
+    (True, True), (False, False), (1, True), (0, False),
+    ("true", True), ("Yes", True), (" ON ", True), ("1", True),
+    ("false", False), ("0", False), ("No", False), ("off", False),
+])
+def test_bool_settings_are_parsed(raw, expected):
+    mod = module()
+    mod.LINK_LOGIN = not expected
+    apply_settings(mod, {"link_login": raw}, KEYS)
+    assert mod.LINK_LOGIN is expected
+
+
+@pytest.mark.parametrize("raw", ["evet", "", 2, None, [], {}])
+def test_unrecognised_bool_keeps_default(raw):
+    mod = module()
+    apply_settings(mod, {"link_login": raw}, KEYS)
+    assert mod.LINK_LOGIN is True
+
+
+def test_numbers_are_cast_and_bad_values_skipped():
+    mod = module()
+    apply_settings(mod, {"connect_timeout": "2.5", "max_tries": "çok", "unknown": 1}, KEYS)
+    assert mod.CONNECT_TIMEOUT == 2.5 and mod.MAX_TRIES == 3
+    assert not hasattr(mod, "UNKNOWN")
+
+
+def test_settings_roundtrip(tmp_path):
+    assert read_settings(tmp_path) == {}
+    write_settings(tmp_path, {"link_login": False})
+    assert read_settings(tmp_path) == {"link_login": False}
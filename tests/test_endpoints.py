@@ -0,0 +1,60 @@
+import gsb_endpoints
+from gsb_endpoints import DEMOTE_MISSES, FORGET_MISSES, EndpointBook
+
+URL = "http://portal/kota"
+
+
+def test_demoted_after_consecutive_misses():
+    book = EndpointBook()
+    book.hit("gsb", "quota", URL, "GET", 1)
+    for _ in range(DEMOTE_MISSES - 1):
+        assert not book.miss("gsb", "quota", URL).demoted
+    assert book.miss("gsb", "quota", URL).demoted
+
+
+def test_hit_resets_miss_streak():
+    book = EndpointBook()
+    book.hit("gsb", "quota", URL)
+    for _ in range(DEMOTE_MISSES):
+        book.miss("gsb", "quota", URL)
+    ep = book.hit("gsb", "quota", URL)
+    assert ep.misses == 0 and ep.hits == 2 and not ep.demoted
+
+
+def test_forgotten_after_forget_misses():
+    book = EndpointBook()
+    book.hit("gsb", "quota", URL)
+    for _ in range(FORGET_MISSES - 1):
+        assert book.miss("gsb", "quota", URL) is not None
+    assert book.miss("gsb", "quota", URL) is None
+    assert book.ranked("gsb", "quota") == []
+
+
+def test_ranked_puts_demoted_last():
+    book = EndpointBook()
+    book.hit("gsb", "quota", URL)
+    book.hit("gsb", "quota", URL)
+    book.hit("gsb", "quota", "http://portal/other")
+    for _ in range(DEMOTE_MISSES):
+        book.miss("gsb", "quota", URL)
+    assert [ep.url for ep in book.ranked("gsb", "quota")] == ["http://portal/other", URL]
+    assert book.ranked("other-portal", "quota") == []
+
+
+def test_save_and_load_round_trip(tmp_path, monkeypatch):
+    path = tmp_path / "endpoints.json"
+    book = EndpointBook()
+    book.load(path)
+    book.hit("gsb", "quota", URL, "GET", 2)
+    book.save()
+
+    loaded = EndpointBook()
+    loaded.load(path)
+    (ep,) = loaded.ranked("gsb", "quota")
+    assert (ep.url, ep.method, ep.layout, ep.hits) == (URL, "GET", 2, 1)
+
+    # Eski kayıtlar yok sayılır.
+    monkeypatch.setattr(gsb_endpoints, "STALE_SECONDS", -1.0)
+    stale = EndpointBook()
+    stale.load(path)
+    assert stale.ranked("gsb", "quota") == []
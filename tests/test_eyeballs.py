@@ -0,0 +1,97 @@
+import socket
+
+import gsb_eyeballs
+from gsb_eyeballs import AddressBook
+
+HOST = "portal.example"
+
+
+def info(ip, family=socket.AF_INET):
+    return (family, socket.SOCK_STREAM, 6, "", (ip, 80))
+
+
+V4A, V4B = info("10.0.0.1"), info("10.0.0.2")
+V6A, V6B = info("fd00::1", socket.AF_INET6), info("fd00::2", socket.AF_INET6)
+
+
+def ips(infos):
+    return [i[4][0] for i in infos]
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+def test_families_are_interleaved_first_family_first():
+    book = AddressBook()
+    assert ips(book.order(HOST, [V6A, V6B, V4A, V4B])) == ["fd00::1", "10.0.0.1", "fd00::2", "10.0.0.2"]
+
+
+def test_last_winner_goes_first_and_failed_address_last():
+    book = AddressBook()
+    book.succeeded(HOST, "10.0.0.2")
+    book.failed(HOST, "fd00::1")
+    assert ips(book.order(HOST, [V6A, V4A, V6B, V4B])) == ["10.0.0.2", "10.0.0.1", "fd00::2", "fd00::1"]
+
+
+def test_penalty_doubles_is_capped_and_expires(monkeypatch):
+    clock = FakeTime()
+    monkeypatch.setattr(gsb_eyeballs, "time", clock)
+    book = AddressBook()
+    penalties = []
+    for _ in range(10):
+        book.failed(HOST, "10.0.0.1")
+        penalties.append(book._stats[HOST]["10.0.0.1"].penalty_until - clock.now)
+    base = gsb_eyeballs.ADDRESS_FAILURE_SECONDS
+    assert penalties[:3] == [base, base * 2, base * 4]
+    assert penalties[-1] == gsb_eyeballs.ADDRESS_FAILURE_MAX_SECONDS
+    assert ips(book.order(HOST, [V4A, V4B])) == ["10.0.0.2", "10.0.0.1"]
+    clock.now += gsb_eyeballs.ADDRESS_FAILURE_MAX_SECONDS + 1
+    assert ips(book.order(HOST, [V4A, V4B])) == ["10.0.0.1", "10.0.0.2"]
+
+
+def test_success_clears_failures():
+    book = AddressBook()
+    book.failed(HOST, "10.0.0.1")
+    book.succeeded(HOST, "10.0.0.1")
+    assert ips(book.order(HOST, [V4B, V4A])) == ["10.0.0.1", "10.0.0.2"]
+    book.failed(HOST, "10.0.0.1")
+    assert book._stats[HOST]["10.0.0.1"].failures == 1
+
+
+def test_save_merges_other_processes_records(tmp_path):
+    path = tmp_path / gsb_eyeballs.ADDRESSES_NAME
+    first, second = AddressBook(), AddressBook()
+    first.load(path)
+    second.load(path)
+    first.failed(HOST, "fd00::1")
+    second.succeeded("other.example", "10.9.9.9")
+    first.save()
+    second.save()
+    loaded = AddressBook()
+    loaded.load(path)
+    assert ips(loaded.order(HOST, [V6A, V4A])) == ["10.0.0.1", "fd00::1"]
+    assert loaded._winners["other.example"][0] == "10.9.9.9"
+
+
+def test_save_does_not_resurrect_cleared_or_replaced_records(tmp_path):
+    path = tmp_path / gsb_eyeballs.ADDRESSES_NAME
+    old = AddressBook()
+    old.load(path)
+    old.succeeded(HOST, "10.0.0.1")
+    old.failed(HOST, "10.0.0.2")
+    old.save()
+    new = AddressBook()
+    new.load(path)
+    new.succeeded(HOST, "10.0.0.2")  # hata kaydını temizler
+    new.failed(HOST, "10.0.0.1")  # eski kazanan artık hatalı
+    new.save()
+    old.save()  # eski kopya yeniden kaydedilse de yeni kayıtlar kalır
+    loaded = AddressBook()
+    loaded.load(path)
+    assert loaded._winners[HOST][0] == "10.0.0.2"
+    assert ips(loaded.order(HOST, [V4A, V4B])) == ["10.0.0.2", "10.0.0.1"]
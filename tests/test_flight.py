@@ -0,0 +1,70 @@
+import threading
+import time
+
+import pytest
+
+from gsb_flight import FileLock, FlightError, single_flight
+
+
+def start_leader(run_dir, value, scope="s", hold=0.3, error=None):
+    """Kilidi alan bir lider başlat; kilidi aldığında dönülür."""
+    started = threading.Event()
+    out = {}
+
+    def fn():
+        started.set()
+        time.sleep(hold)
+        if error:
+            raise RuntimeError(error)
+        return value
+
+    def run():
+        try:
+            out["result"] = single_flight(run_dir, "login1", fn, scope=scope)
+        except Exception as exc:  # noqa: BLE001
+            out["error"] = exc
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    assert started.wait(2.0)
+    return thread, out
+
+
+def test_waiter_shares_running_flight(tmp_path):
+    thread, out = start_leader(tmp_path, "leader")
+    calls = []
+    result = single_flight(tmp_path, "login1", lambda: calls.append(1) or "own", scope="s")
+    thread.join()
+    assert result.value == "leader" and result.shared
+    assert out["result"].value == "leader" and not out["result"].shared
+    assert calls == []
+
+
+def test_waiter_gets_leader_error(tmp_path):
+    thread, _ = start_leader(tmp_path, None, error="portal kapalı")
+    with pytest.raises(FlightError, match="portal kapalı"):
+        single_flight(tmp_path, "login1", lambda: "own", scope="s")
+    thread.join()
+
+
+def test_other_scope_runs_its_own_flight(tmp_path):
+    thread, _ = start_leader(tmp_path, "leader", scope="s")
+    result = single_flight(tmp_path, "login1", lambda: "own", scope="other")
+    thread.join()
+    assert result.value == "own" and not result.shared
+
+
+def test_finished_flight_is_not_reused(tmp_path):
+    assert single_flight(tmp_path, "login1", lambda: "first", scope="s").value == "first"
+    result = single_flight(tmp_path, "login1", lambda: "second", scope="s")
+    assert result.value == "second" and not result.shared
+
+
+def test_file_lock_is_exclusive(tmp_path):
+    first, second = FileLock(tmp_path / "x.lock"), FileLock(tmp_path / "x.lock")
+    assert first.acquire()
+    assert not second.acquire()
+    assert not second.wait(0.1)
+    first.release()
+    assert second.wait(0.1)
+    second.release()
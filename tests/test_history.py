@@ -0,0 +1,65 @@
+import time
+from datetime import datetime
+
+from gsb_history import HISTORY_NAME, HistoryBuffer, QuotaSample, compact, connect, quota_values, usage
+
+DAY = 86400.0
+
+
+def sample(ts, remaining, account=1, source="login"):
+    return QuotaSample(account, ts, remaining, 10240.0, None, None, None, source)
+
+
+def insert(conn, rows):
+    with conn:
+        conn.executemany("INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+
+def test_quota_values_converts_gb():
+    fields = {"Toplam Kalan Kota (GB)": "2,5", "Toplam Kota (MB)": "10240"}
+    assert quota_values(fields) == (2560.0, 10240.0)
+
+
+def test_usage_sums_drops_per_day_and_ignores_refills(tmp_path):
+    conn = connect(tmp_path / HISTORY_NAME)
+    day1 = datetime(2026, 10, 5, 9).timestamp()
+    day2 = datetime(2026, 10, 6, 9).timestamp()
+    insert(conn, [
+        sample(day1 - DAY, 1000.0),  # since öncesi: ilk düşüşün tabanı
+        sample(day1, 900.0),
+        sample(day1 + 3600, 700.0),
+        sample(day2, 5000.0),  # yeni paket: kullanım sayılmaz
+        sample(day2 + 3600, 4800.0),
+        sample(day2 + 7200, 1.0, account=2),
+    ])
+    rows = usage(conn, 1, "day", since=day1 - 3600)
+    assert [(r.period, r.used_mb, r.remaining_mb, r.samples) for r in rows] == [
+        ("2026-10-05", 300.0, 700.0, 2),
+        ("2026-10-06", 200.0, 4800.0, 2),
+    ]
+    week = usage(conn, 1, "week", since=day1 - 3600)
+    assert [(r.period, r.used_mb) for r in week] == [("2026-W41", 500.0)]
+
+
+def test_buffer_flush_writes_rows(tmp_path):
+    now = time.time()
+    buffer = HistoryBuffer()
+    buffer.add(sample(now - 60, 10.0))
+    buffer.add(sample(now, 5.0))
+    assert buffer.flush(tmp_path) == 2 and len(buffer) == 0
+    conn = connect(tmp_path / HISTORY_NAME)
+    assert conn.execute("SELECT COUNT(*) FROM samples").fetchone()[0] == 2
+
+
+def test_compact_downsamples_and_frees_pages(tmp_path):
+    conn = connect(tmp_path / HISTORY_NAME)
+    now = 200 * DAY
+    # 100 gün önce, her dakika bir örnek: seyreltmede günde tek satır kalır.
+    insert(conn, [sample(now - 100 * DAY + i * 60, 1000.0 - i, source="sampler" * 20) for i in range(5000)])
+    recent = now - 3600
+    insert(conn, [sample(recent + i, 1.0) for i in range(10)])
+    removed = compact(conn, now=now)
+    assert conn.execute("SELECT COUNT(*) FROM samples WHERE ts >= ?", (recent,)).fetchone()[0] == 10
+    old = conn.execute("SELECT COUNT(*) FROM samples WHERE ts < ?", (recent,)).fetchone()[0]
+    assert removed == 5000 - old and old <= 5
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
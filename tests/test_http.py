@@ -0,0 +1,100 @@
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import gsb_http
+from gsb_http import LiteSession
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = {}
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body=b"", headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        count = self.hits[path] = self.hits.get(path, 0) + 1
+        if path == "/flaky":
+            self._reply(503 if count <= 2 else 200, b"ok")
+        elif path == "/login":
+            self._reply(302, headers=[("Location", "/home"), ("Set-Cookie", "sid=abc; Path=/")])
+        elif path == "/home":
+            self._reply(200, (self.headers.get("Cookie") or "").encode())
+        elif path == "/logout":
+            self._reply(
+                200,
+                headers=[
+                    ("Set-Cookie", "sid=gone; Path=/; Expires=Thu, 01 Jan 1970 00:00:00 GMT"),
+                    ("Set-Cookie", "lang=tr; Path=/; Expires=Fri, 01 Jan 2100 00:00:00 GMT"),
+                ],
+            )
+        elif path == "/gzip":
+            self._reply(200, gzip.compress(b"merhaba"), [("Content-Encoding", "gzip")])
+        elif path == "/broken-gzip":
+            self._reply(200, gzip.compress(b"merhaba" * 50)[:-12], [("Content-Encoding", "gzip")])
+        else:
+            self._reply(404)
+
+
+@pytest.fixture
+def server():
+    Handler.hits = {}
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_status_retries_until_success(server):
+    with LiteSession(max_retries=3, status_forcelist=(503,)) as session:
+        response = session.get(server + "/flaky", timeout=5)
+    assert response.status_code == 200 and response.text == "ok"
+    assert Handler.hits["/flaky"] == 3
+
+
+def test_status_retries_exhausted(server):
+    with LiteSession(max_retries=1, status_forcelist=(503,)) as session:
+        with pytest.raises(gsb_http.RetryError):
+            session.get(server + "/flaky", timeout=5)
+    assert Handler.hits["/flaky"] == 2
+
+
+def test_redirect_carries_new_cookie(server):
+    with LiteSession() as session:
+        response = session.get(server + "/login", timeout=5)
+    assert response.status_code == 200
+    assert [r.status_code for r in response.history] == [302]
+    assert response.text == "sid=abc"
+
+
+def test_expired_cookie_is_dropped(server):
+    with LiteSession() as session:
+        session.get(server + "/login", timeout=5)
+        session.get(server + "/logout", timeout=5)
+        assert session.get(server + "/home", timeout=5).text == "lang=tr"
+
+
+def test_gzip_body_is_decoded(server):
+    with LiteSession() as session:
+        assert session.get(server + "/gzip", timeout=5).text == "merhaba"
+
+
+def test_truncated_gzip_is_a_retried_connection_error(server):
+    with LiteSession(max_retries=2) as session:
+        with pytest.raises(gsb_http.ConnectionError):
+            session.get(server + "/broken-gzip", timeout=5)
+    assert Handler.hits["/broken-gzip"] == 3
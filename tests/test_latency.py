@@ -0,0 +1,73 @@
+import pytest
+
+import gsb_latency
+from gsb_latency import LatencyModel, LatencyStat
+
+URL = "http://portal.example:8080/login.html"
+OTHER = "http://other.example/status"
+
+
+def test_no_samples_uses_default():
+    assert LatencyModel().timeout(URL, (4.0, 9.0)) == (4.0, 9.0)
+
+
+def test_timeout_follows_srtt_plus_four_deviations():
+    model = LatencyModel()
+    for _ in range(50):
+        model.record_url(URL, 1.5, 4.0)
+    connect_t, read_t = model.timeout(URL, (9.0, 9.0))
+    # Sabit ölçümlerde sapma sönümlenir, sınır ortalamaya yaklaşır.
+    assert connect_t == pytest.approx(1.5, abs=0.05)
+    assert read_t == pytest.approx(4.0, abs=0.1)
+
+
+def test_timeout_is_clamped():
+    model = LatencyModel()
+    model.record_url(URL, 0.001, 0.001)
+    assert model.timeout(URL, (9.0, 9.0)) == (gsb_latency.CONNECT_TIMEOUT_FLOOR, gsb_latency.READ_TIMEOUT_FLOOR)
+    model.record_url(OTHER, 60.0, 120.0)
+    assert model.timeout(OTHER, (1.0, 1.0)) == (
+        gsb_latency.CONNECT_TIMEOUT_CEILING,
+        gsb_latency.READ_TIMEOUT_CEILING,
+    )
+
+
+def test_unseen_endpoint_uses_host_read_estimate():
+    model = LatencyModel()
+    model.record_url(URL, None, 6.0)
+    assert model.timeout("http://portal.example:8080/other", (1.0, 1.0))[1] == model.timeout(URL, (1.0, 1.0))[1]
+
+
+def test_stale_samples_are_ignored(monkeypatch):
+    model = LatencyModel()
+    model.record_url(URL, 2.0, 5.0)
+    now = gsb_latency.time.time()
+    monkeypatch.setattr(gsb_latency.time, "time", lambda: now + gsb_latency.STALE_SECONDS + 1)
+    assert model.timeout(URL, (4.0, 9.0)) == (4.0, 9.0)
+
+
+def test_save_merges_other_processes_hosts(tmp_path):
+    path = tmp_path / gsb_latency.LATENCY_NAME
+    first, second = LatencyModel(), LatencyModel()
+    first.load(path)
+    second.load(path)
+    first.record_url(URL, 2.0, 5.0)
+    second.record_url(OTHER, 3.0, 6.0)
+    first.save()
+    second.save()
+    loaded = LatencyModel()
+    loaded.load(path)
+    assert loaded.timeout(URL, (0.0, 0.0)) == first.timeout(URL, (0.0, 0.0))
+    assert loaded.timeout(OTHER, (0.0, 0.0)) == second.timeout(OTHER, (0.0, 0.0))
+
+
+def test_save_keeps_newer_measurement(tmp_path):
+    path = tmp_path / gsb_latency.LATENCY_NAME
+    old, new = LatencyModel(path), LatencyModel(path)
+    old._stats["connect"]["portal.example:8080"] = LatencyStat(9.0, 1.0, 3, 100.0)
+    new._stats["connect"]["portal.example:8080"] = LatencyStat(1.0, 0.1, 5, 200.0)
+    new.save()
+    old.save()
+    loaded = LatencyModel()
+    loaded.load(path)
+    assert loaded._stats["connect"]["portal.example:8080"].srtt == 1.0
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+import gsb_layout
+
+
+@pytest.fixture
+def exe(tmp_path, monkeypatch):
+    exe = tmp_path / "Uygulama"
+    exe.mkdir()
+    monkeypatch.setattr(gsb_layout, "exe_dir", lambda: exe)
+    monkeypatch.setattr(gsb_layout, "_cache", None)
+    return exe
+
+
+class Prober:
+    def __init__(self, root):
+        self.root = root
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.root
+
+
+def test_manifest_miss_probes_and_writes(exe, tmp_path):
+    probe = Prober(tmp_path)
+    layout = gsb_layout.load_layout(probe)
+    assert probe.calls == 1
+    assert layout["cfg_dir"] == str(tmp_path / "GSB_Dosyalar")
+    assert (tmp_path / "GSB_Dosyalar").is_dir()
+    assert json.loads((exe / gsb_layout.MANIFEST_NAME).read_text(encoding="utf-8")) == layout
+
+
+def test_manifest_hit_skips_probe(exe, tmp_path, monkeypatch):
+    gsb_layout.load_layout(Prober(tmp_path))
+    monkeypatch.setattr(gsb_layout, "_cache", None)
+    probe = Prober(tmp_path / "baska")
+    assert gsb_layout.load_layout(probe)["system_root"] == str(tmp_path)
+    assert probe.calls == 0
+
+
+def test_refresh_reprobes_and_rewrites(exe, tmp_path):
+    gsb_layout.load_layout(Prober(tmp_path))
+    moved = tmp_path / "yeni"
+    probe = Prober(moved)
+    assert gsb_layout.load_layout(probe, refresh=True)["system_root"] == str(moved)
+    assert probe.calls == 1
+    assert gsb_layout.read_manifest()["system_root"] == str(moved)
+    assert gsb_layout.load_layout(Prober(tmp_path))["system_root"] == str(moved)  # önbellekten
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "bozuk json",
+        json.dumps({"version": "0", "system_root": "x", "cfg_dir": "y"}),
+        json.dumps({"version": str(gsb_layout.MANIFEST_VERSION), "system_root": "x"}),
+    ],
+)
+def test_invalid_manifest_is_a_miss(exe, tmp_path, content):
+    (exe / gsb_layout.MANIFEST_NAME).write_text(content, encoding="utf-8")
+    probe = Prober(tmp_path)
+    assert gsb_layout.load_layout(probe)["system_root"] == str(tmp_path)
+    assert probe.calls == 1
+
+
+def test_unwritable_manifest_still_returns_layout(exe, tmp_path, monkeypatch):
+    def refuse(*args):
+        raise PermissionError("salt okunur")
+
+    monkeypatch.setattr(gsb_layout.os, "replace", refuse)
+    layout = gsb_layout.load_layout(Prober(tmp_path))
+    assert layout["system_root"] == str(tmp_path)
+    assert gsb_layout.read_manifest() is None
+
+
+def test_pin_layout_does_not_write_manifest(exe, tmp_path):
+    gsb_layout.pin_layout(tmp_path)
+    assert gsb_layout.cfg_dir() == tmp_path / "GSB_Dosyalar"
+    assert not (exe / gsb_layout.MANIFEST_NAME).exists()
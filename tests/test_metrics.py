@@ -0,0 +1,71 @@
+import json
+import multiprocessing
+
+from gsb_metrics import Registry
+
+
+def make_registry():
+    registry = Registry()
+    counter = registry.counter("gsb_test_total", "Test counter.")
+    histogram = registry.histogram("gsb_test_seconds", "Test histogram.", buckets=(0.1, 1.0))
+    return registry, counter, histogram
+
+
+def test_render_counter_and_histogram():
+    registry, counter, histogram = make_registry()
+    counter.inc(outcome="success")
+    counter.inc(2, outcome='a"b')
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(3.0)
+    lines = registry.render().splitlines()
+    assert "# TYPE gsb_test_total counter" in lines
+    assert 'gsb_test_total{outcome="success"} 1' in lines
+    assert 'gsb_test_total{outcome="a\\"b"} 2' in lines
+    assert 'gsb_test_seconds_bucket{le="0.1"} 1' in lines
+    assert 'gsb_test_seconds_bucket{le="1"} 2' in lines
+    assert 'gsb_test_seconds_bucket{le="+Inf"} 3' in lines
+    assert "gsb_test_seconds_sum 3.55" in lines
+    assert "gsb_test_seconds_count 3" in lines
+
+
+def test_flush_adds_this_process_delta_to_persisted_state(tmp_path):
+    state, textfile = tmp_path / "state.json", tmp_path / "gsb.prom"
+    registry, counter, histogram = make_registry()
+    counter.inc(outcome="success")
+    histogram.observe(0.5)
+    registry.flush(state, textfile)
+    # İkinci çalıştırma: yalnızca yeni fark eklenir, ilk değerler iki kez sayılmaz.
+    counter.inc(outcome="success")
+    counter.inc(outcome="cancelled")
+    histogram.observe(2.0)
+    registry.flush(state, textfile)
+    text = textfile.read_text(encoding="utf-8").splitlines()
+    assert 'gsb_test_total{outcome="success"} 2' in text
+    assert 'gsb_test_total{outcome="cancelled"} 1' in text
+    assert 'gsb_test_seconds_bucket{le="1"} 1' in text
+    assert "gsb_test_seconds_count 2" in text
+    # Kalıcı durumu okuyan yeni bir registry aynı toplamları gösterir.
+    fresh, _, _ = make_registry()
+    rendered = fresh.render(json.loads(state.read_text(encoding="utf-8")))
+    assert 'gsb_test_total{outcome="success"} 2' in rendered.splitlines()
+
+
+def _flush_many(state_path, rounds):
+    registry, counter, _ = make_registry()
+    for _ in range(rounds):
+        counter.inc(outcome="success")
+        registry.flush(state_path)
+
+
+def test_concurrent_flushes_lose_no_increments(tmp_path):
+    state = tmp_path / "state.json"
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_flush_many, args=(state, 20)) for _ in range(4)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join(30)
+        assert proc.exitcode == 0
+    data = json.loads(state.read_text(encoding="utf-8"))
+    assert data["gsb_test_total"][json.dumps({"outcome": "success"})] == 80
@@ -0,0 +1,39 @@
+import pytest
+
+from gsb_portal import KeywordMatcher
+
+MATCHER = KeywordMatcher(
+    {
+        "login": ["giriş yap", "şifre", "password"],
+        "quota": ["kalan kota"],
+        "logout": ["çıkış"],
+    }
+)
+
+PAGES = [
+    "<form><label>Şifre</label><button>Giriş Yap</button></form>",
+    "<p>KALAN KOTA: 1200 MB</p><a href='/logout'>Çıkış</a>",
+    "<input type='Password' name='p'>",
+    "<p>Hoş geldiniz</p>",
+    "",
+]
+
+
+@pytest.mark.parametrize("page", PAGES)
+@pytest.mark.parametrize("encoding", ["utf-8", "cp1254"])
+def test_bytes_and_str_scan_agree(page, encoding):
+    expected = MATCHER.scan(page)
+    assert MATCHER.scan(page.encode(encoding), encoding=encoding) == expected
+    # Karakter kümesi bilinmiyorsa yedek kodlamalar denenir.
+    assert MATCHER.scan(page.encode(encoding)) == expected
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_matches_agree_for_each_category(page):
+    for category in ("login", "quota", "logout"):
+        assert MATCHER.matches(page.encode("utf-8"), category, "utf-8") == MATCHER.matches(page, category)
+
+
+def test_utf16_body_is_decoded():
+    page = PAGES[0]
+    assert MATCHER.scan(page.encode("utf-16"), encoding="utf-16") == MATCHER.scan(page) == {"login"}
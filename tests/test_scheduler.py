@@ -0,0 +1,54 @@
+import threading
+import time
+
+from gsb_scheduler import Scheduler
+
+
+def run_until(scheduler: Scheduler, done: threading.Event, timeout: float = 2.0) -> None:
+    thread = threading.Thread(target=scheduler.run, daemon=True)
+    thread.start()
+    done.wait(timeout)
+    scheduler.stop()
+    thread.join(timeout)
+
+
+def test_jobs_run_in_due_order_after_reschedule_and_cancel():
+    scheduler = Scheduler(workers=1)
+    ran = []
+    done = threading.Event()
+
+    def job(key):
+        def fn():
+            ran.append(key)
+            if key == "b":
+                done.set()
+
+        return fn
+
+    now = time.time()
+    scheduler.schedule("a", now + 0.30, job("a"))
+    scheduler.schedule("b", now + 0.15, job("b"))
+    scheduler.schedule("c", now + 0.10, job("c"))
+    scheduler.schedule("a", now + 0.05, job("a"))  # öne alındı
+    scheduler.cancel("c")
+
+    assert len(scheduler) == 2
+    assert scheduler.due_at("c") is None
+    assert scheduler.due_at("a") == now + 0.05
+
+    run_until(scheduler, done)
+    time.sleep(0.35)  # eski "a" kaydı (0.30) çalışmamalı
+    assert ran == ["a", "b"]
+    assert len(scheduler) == 0
+
+
+def test_reschedule_replaces_previous_job():
+    scheduler = Scheduler(workers=1)
+    ran = []
+    done = threading.Event()
+    now = time.time()
+    scheduler.schedule("login", now + 0.05, lambda: ran.append("old"))
+    scheduler.schedule("login", now + 0.10, lambda: (ran.append("new"), done.set()))
+
+    run_until(scheduler, done)
+    assert ran == ["new"]
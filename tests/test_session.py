@@ -0,0 +1,85 @@
+from datetime import datetime
+
+import pytest
+
+from gsb_session import SessionTimes, parse_datetime, parse_duration, read_sessions, record_session, session_times
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("05.03.2024 14:30:15", datetime(2024, 3, 5, 14, 30, 15)),
+        ("05.03.2024  14:30", datetime(2024, 3, 5, 14, 30)),
+        ("2024-03-05T14:30:15", datetime(2024, 3, 5, 14, 30, 15)),
+        ("2024-03-05 14:30:15.123", datetime(2024, 3, 5, 14, 30, 15)),
+        ("05/03/2024", datetime(2024, 3, 5)),
+    ],
+)
+def test_parse_datetime(text, expected):
+    assert parse_datetime(text) == expected.timestamp()
+
+
+@pytest.mark.parametrize("text", ["", "yarın", "32.13.2024"])
+def test_parse_datetime_rejects(text):
+    assert parse_datetime(text) is None
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("02:15:30", 2 * 3600 + 15 * 60 + 30),
+        ("02:15", 2 * 3600 + 15 * 60),
+        ("1 gün 3 saat", 27 * 3600),
+        ("90 dk", 90 * 60),
+        ("1,5 saat", 5400),
+        ("45 sn", 45),
+    ],
+)
+def test_parse_duration(text, expected):
+    assert parse_duration(text) == expected
+
+
+def test_parse_duration_bare_number_needs_unit():
+    assert parse_duration("45") is None
+    assert parse_duration("45", default_unit=60) == 2700
+    assert parse_duration("") is None
+
+
+def test_session_times_picks_nearest_future_end():
+    now = datetime(2024, 3, 5, 12, 0).timestamp()
+    fields = {
+        "Login Zamanı": "05.03.2024 11:00",
+        "Oturum Süresi (dk)": "120",
+        "Kalan Kota Zamanı": "3 saat",
+    }
+    times = session_times(fields, now=now)
+    assert times.login_at == datetime(2024, 3, 5, 11, 0).timestamp()
+    assert times.expires_at == datetime(2024, 3, 5, 13, 0).timestamp()
+
+
+def test_record_session_adds_and_removes(tmp_path):
+    record_session(tmp_path, 1, SessionTimes(1.0, 100.0))
+    record_session(tmp_path, 2, SessionTimes(2.0, 200.0))
+    record_session(tmp_path, 1, SessionTimes(None, None))
+    sessions = read_sessions(tmp_path)
+    assert list(sessions) == ["2"]
+    assert sessions["2"]["expires_at"] == 200.0
+
+
+def _record_many(cfg_dir, account_id):
+    for n in range(30):
+        record_session(cfg_dir, account_id, SessionTimes(float(n), 1000.0 + n))
+
+
+def test_record_session_keeps_concurrent_writers(tmp_path):
+    import multiprocessing
+
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_record_many, args=(tmp_path, i)) for i in range(1, 6)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    sessions = read_sessions(tmp_path)
+    assert sorted(sessions) == ["1", "2", "3", "4", "5"]
+    assert all(entry["expires_at"] == 1029.0 for entry in sessions.values())
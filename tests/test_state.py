@@ -0,0 +1,60 @@
+import json
+import multiprocessing
+
+from gsb_state import STATE_NAME, cached_quota, format_state, read_state, update_state
+
+
+def test_missing_or_corrupt_file_gives_defaults(tmp_path):
+    assert read_state(tmp_path)["account"] is None
+    (tmp_path / STATE_NAME).write_text("{bozuk", encoding="utf-8")
+    assert read_state(tmp_path)["logged_in"] is False
+    assert format_state(read_state(tmp_path)).startswith("Durum bilinmiyor")
+
+
+def test_unknown_keys_are_ignored(tmp_path):
+    update_state(tmp_path, "login", account=1, logged_in=True, bogus=5)
+    data = json.loads((tmp_path / STATE_NAME).read_text(encoding="utf-8"))
+    assert "bogus" not in data and data["source"] == "login"
+
+
+def test_account_switch_restores_saved_quota(tmp_path):
+    update_state(tmp_path, "login", "Kalan Kota: 900 MB", account=1, logged_in=True, remaining_mb=900.0, quota_at=10.0)
+    update_state(tmp_path, "login", "Kalan Kota: 50 MB", account=2, logged_in=True, remaining_mb=50.0, quota_at=20.0)
+    # Geri dönüşte kota verilmedi: hesap 1'in saklı okuması gelir, hesap 2'ninki kalmaz.
+    update_state(tmp_path, "login", account=1, logged_in=True)
+    state = read_state(tmp_path)
+    assert state["remaining_mb"] == 900.0 and state["quota_at"] == 10.0
+    assert cached_quota(tmp_path, 2)[0] == "Kalan Kota: 50 MB"
+
+
+def test_switch_to_unknown_account_clears_quota(tmp_path):
+    update_state(tmp_path, "login", "Kalan Kota: 900 MB", account=1, remaining_mb=900.0, expires_at=99.0)
+    update_state(tmp_path, "login", account=3, logged_in=True)
+    state = read_state(tmp_path)
+    assert state["account"] == 3
+    assert state["remaining_mb"] is None and state["expires_at"] is None
+
+
+def test_same_account_keeps_fields_and_given_values_win(tmp_path):
+    update_state(tmp_path, "login", account=1, remaining_mb=900.0)
+    update_state(tmp_path, "logout", logged_in=False)
+    assert read_state(tmp_path)["remaining_mb"] == 900.0
+    update_state(tmp_path, "login", account=2, remaining_mb=10.0)
+    assert read_state(tmp_path)["remaining_mb"] == 10.0
+
+
+def _write_quota(cfg_dir, account):
+    for i in range(10):
+        update_state(cfg_dir, "sampler", f"Kalan Kota: {i} MB", account=account, remaining_mb=float(i))
+
+
+def test_concurrent_updates_keep_every_accounts_quota(tmp_path):
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_write_quota, args=(tmp_path, account)) for account in range(1, 5)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join(30)
+        assert proc.exitcode == 0
+    for account in range(1, 5):
+        assert cached_quota(tmp_path, account)[0] == "Kalan Kota: 9 MB"
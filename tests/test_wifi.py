@@ -0,0 +1,79 @@
+import gsb_wifi
+from gsb_wifi import SSIDCache, StaticProvider
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_cache(ssid="GSBWIFI"):
+    provider = StaticProvider(ssid)
+    clock = FakeClock()
+    signature = {"value": "wlan0:up:1"}
+    cache = SSIDCache(provider, signature=lambda: signature["value"], clock=clock)
+    return cache, provider, clock, signature
+
+
+def test_ssid_cache_reuses_value_within_ttl():
+    cache, provider, clock, _ = make_cache()
+    assert cache.ssid() == "GSBWIFI"
+    clock.now += gsb_wifi.SSID_CACHE_SECONDS - 1
+    assert cache.ssid() == "GSBWIFI"
+    assert provider.calls == 1
+
+
+def test_ssid_cache_expires_after_ttl():
+    cache, provider, clock, _ = make_cache()
+    cache.ssid()
+    clock.now += gsb_wifi.SSID_CACHE_SECONDS
+    provider.value = "OTHER"
+    assert cache.ssid() == "OTHER"
+    assert provider.calls == 2
+
+
+def test_ssid_cache_invalidated_by_link_signature():
+    cache, provider, _, signature = make_cache()
+    cache.ssid()
+    signature["value"] = "wlan0:down:0"
+    provider.value = ""
+    assert cache.ssid() == ""
+    assert provider.calls == 2
+
+
+def test_ssid_cache_invalidate_forces_refresh():
+    cache, provider, _, _ = make_cache()
+    cache.ssid()
+    cache.invalidate()
+    cache.ssid()
+    assert provider.calls == 2
+
+
+def test_iw_provider_tries_every_interface(monkeypatch):
+    monkeypatch.setattr(gsb_wifi, "wireless_interfaces", lambda: ["wlan0", "wlan1"])
+
+    def run_hidden(cmd, timeout=None, env=None):
+        if cmd[2] == "wlan0":
+            return 1, "", "command failed"
+        return 0, "Connected to 00:11:22:33:44:55 (on wlan1)\n\tSSID: GSBWIFI\n", ""
+
+    monkeypatch.setattr(gsb_wifi, "run_hidden", run_hidden)
+    assert gsb_wifi.IwProvider().ssid() == "GSBWIFI"
+
+
+def test_iw_provider_unknown_only_after_all_interfaces(monkeypatch):
+    monkeypatch.setattr(gsb_wifi, "wireless_interfaces", lambda: ["wlan0", "wlan1"])
+    seen = []
+
+    def run_hidden(cmd, timeout=None, env=None):
+        seen.append(cmd[2])
+        if cmd[2] == "wlan0":
+            raise OSError("iw yok")
+        return 0, "Not connected.\n", ""
+
+    monkeypatch.setattr(gsb_wifi, "run_hidden", run_hidden)
+    assert gsb_wifi.IwProvider().ssid() is None
+    assert seen == ["wlan0", "wlan1"]
@@ -0,0 +1,80 @@
+"""Yanıt sınıflandırma karşılaştırması: response.text üzerinde ve ham byte'larda.
+
+Kullanım:
+    python tools/bench_classify.py --runs 200 --kb 40
+
+Aynı sayfa üç başlıkla denenir: charset bildirilmiş, "text/html" (charset
+yok; requests ISO-8859-1 varsayar) ve Content-Type hiç yok (requests
+charset_normalizer ile tahmin eder). Her biri için giriş sayfası olan ve
+olmayan gövdede is_login_page(resp.text) ile is_login_response(resp)
+süreleri (medyan, µs) raporlanır.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+import requests  # noqa: E402
+
+from gsb_portal import DEFAULT  # noqa: E402
+
+HEADERS = (
+    ("charset=UTF-8", {"Content-Type": "text/html; charset=UTF-8"}),
+    ("charset yok", {"Content-Type": "text/html"}),
+    ("Content-Type yok", {}),
+)
+
+
+def make_page(kb: int, login_form: bool) -> bytes:
+    row = "<tr><td>Toplam Kalan Kota (MB)</td><td>12.345</td><td>Oturum Süresi</td><td>01:23</td></tr>\n"
+    body = row * max(1, kb * 1024 // len(row.encode("utf-8")))
+    form = "<form action='j_spring_security_check'><input name='j_username'></form>" if login_form else ""
+    return f"<html><head><title>GSB WiFi</title></head><body><table>{body}</table>{form}</body></html>".encode()
+
+
+def make_response(content: bytes, headers: dict) -> requests.Response:
+    resp = requests.Response()
+    resp._content = content
+    resp.status_code = 200
+    resp.headers.update(headers)
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+    resp.url = "https://wifi.gsb.gov.tr/index.html"
+    return resp
+
+
+def median_us(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1e6
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=200)
+    ap.add_argument("--kb", type=int, default=40)
+    args = ap.parse_args()
+
+    for label, headers in HEADERS:
+        for login_form in (False, True):
+            resp = make_response(make_page(args.kb, login_form), headers)
+            old = DEFAULT.is_login_page(resp.text, resp.url)
+            new = DEFAULT.is_login_response(resp)
+            assert old == new, (label, login_form)
+            text_us = median_us(lambda: DEFAULT.is_login_page(resp.text, resp.url), args.runs)
+            bytes_us = median_us(lambda: DEFAULT.is_login_response(resp), args.runs)
+            kind = "giriş formu" if login_form else "kota sayfası"
+            print(
+                f"{label:17s} {kind:12s} text={text_us:9.1f} µs  bytes={bytes_us:8.1f} µs  "
+                f"x{text_us / bytes_us:5.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
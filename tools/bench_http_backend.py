@@ -0,0 +1,116 @@
+"""HTTP backend karşılaştırması: requests ve lite (gsb_http).
+
+Kullanım:
+    python tools/bench_http_backend.py --runs 10 --requests 5
+
+Her ölçüm ayrı bir süreçte yapılır: backend'in import + oturum kurulum süresi
+(soğuk başlangıç), localhost'taki küçük bir sunucuya yapılan isteklerin süresi
+ve sürecin en yüksek bellek kullanımı (peak RSS) raporlanır.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import gsb_transport
+session = gsb_transport.build_session(sys.argv[1])
+t1 = time.perf_counter()
+for _ in range(int(sys.argv[3])):
+    session.get(sys.argv[2] + "/login.html", timeout=(4, 8)).text
+t2 = time.perf_counter()
+
+def peak_rss_kb():
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PMC(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        pmc = PMC()
+        pmc.cb = ctypes.sizeof(PMC)
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(pmc), pmc.cb
+        )
+        return pmc.PeakWorkingSetSize // 1024
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+print(json.dumps({
+    "startup": t1 - t0,
+    "requests": t2 - t1,
+    "rss_kb": peak_rss_kb(),
+    "modules": len(sys.modules),
+}))
+"""
+
+PAGE = ("<html><body><form action='/j_spring_security_check'>" + "x" * 4000 + "</form></body></html>").encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=UTF-8")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, format, *args) -> None:  # noqa: A002
+        return
+
+
+def run_once(backend: str, base_url: str, n_requests: int) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, backend, base_url, str(n_requests)],
+        cwd=str(SRC_DIR),
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=10)
+    ap.add_argument("--requests", type=int, default=5)
+    args = ap.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    for backend in ("requests", "lite"):
+        samples = [run_once(backend, base_url, args.requests) for _ in range(args.runs)]
+        startup = statistics.median(s["startup"] for s in samples) * 1000
+        reqs = statistics.median(s["requests"] for s in samples) * 1000
+        rss = statistics.median(s["rss_kb"] for s in samples) / 1024
+        mods = samples[-1]["modules"]
+        print(
+            f"{backend:9s} başlangıç={startup:7.1f} ms  {args.requests} istek={reqs:6.1f} ms  "
+            f"peak RSS={rss:6.1f} MB  modül={mods}"
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Tıklama başına Tk maliyeti: eski (iki tk.Tk) ve yeni (tek gizli kök) akış.
+
+Kullanım:
+    python tools/bench_tk_init.py --runs 10
+
+Her ölçüm ayrı bir süreçte yapılır; böylece Tcl/Tk'nin soğuk yüklenmesi de
+sayıma girer. Görüntü sunucusu (DISPLAY / Windows oturumu) gerekir.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+# Eski akış: durum penceresi için bir tk.Tk, sonuç diyaloğu için ikinci bir tk.Tk.
+OLD_FLOW = """
+import tkinter as tk
+from gsb_ui import _get_icon_path, _apply_icon
+for _ in range(2):
+    win = tk.Tk()
+    icon_p = _get_icon_path()
+    if icon_p:
+        try:
+            _apply_icon(win, icon_p)
+        except Exception:
+            pass
+    win.update_idletasks()
+    win.destroy()
+"""
+
+# Yeni akış: tek gizli kök, iki Toplevel.
+NEW_FLOW = """
+from gsb_ui import _make_dark_win
+for _ in range(2):
+    win = _make_dark_win("bench", 400, 170)
+    win.update_idletasks()
+    win.destroy()
+"""
+
+
+def run_once(code: str) -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=str(SRC_DIR), check=True)
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=10)
+    args = ap.parse_args()
+
+    for name, code in (("iki tk.Tk (eski)", OLD_FLOW), ("tek kök (yeni)", NEW_FLOW)):
+        samples = [run_once(code) for _ in range(args.runs)]
+        print(
+            f"{name:18s} median={statistics.median(samples) * 1000:7.1f} ms  "
+            f"min={min(samples) * 1000:7.1f} ms  max={max(samples) * 1000:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""Yük ve dayanıklılık (soak) testi: çok sayıda istemci yerel portal simülatörüne karşı.
+
+Kullanım:
+    # Kampüs çapında kesinti sonrası: 200 makine aynı anda giriş yapar
+    python tools/loadtest.py --clients 200 --outage 5 --capacity 8
+
+    # Soak: 50 makine 5 dakika boyunca giriş/çıkış yapar
+    python tools/loadtest.py --clients 50 --duration 300 --think 10 --fail-rate 0.02
+
+    # Retry/backoff ayarı dene (settings.json biçimi)
+    python tools/loadtest.py --clients 200 --outage 5 --settings deneme.json --json sonuc.json
+
+Her istemci ayrı bir süreçtir (Linux'ta fork): gerçek kampüste olduğu gibi
+her birinin kendi gecikme modeli, devre kesicisi ve retry durumu olur.
+İstemciler gsb_login_runtime_template.perform_login ve gsb_cikis.do_logout
+akışlarını değiştirilmeden çalıştırır; portal adresleri bir "sim" portal
+profiliyle simülatöre yönlendirilir (bkz. gsb_portal), ayarlar ve dosyalar
+geçici bir GSB_Dosyalar'a yazılır (bkz. gsb_layout.pin_layout).
+
+--settings dosyası settings.json ile aynı anahtarları alır: max_retries, read_retries,
+backoff_factor (transport), max_login_attempt, max_attempt (çıkış),
+retry_sleep_floor/ceiling, connect/read_timeout_*, breaker_* ...
+
+Başlamadan önce simülatör arızasız moddayken bir giriş + çıkış yapılır; bir
+akışın hatasız istek sayısı buradan alınır. Bu ölçüm gecikme modelini de
+ısıtır ve istemciler onu devralır (kalıcı latency.json'u olan makineler gibi).
+
+Rapor: akış başına sonuçlar, throughput, gecikme yüzdelikleri, portalın
+gördüğü istek hızı (ortalama, tepe, saniyelik), retry çarpanı (portal
+istekleri / hatasız akışların isteyeceği istek sayısı) ve istemcilerin
+saydığı retry'lar.
+"""
+import argparse
+import json
+import multiprocessing
+import queue
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from portal_sim import Portal, add_arguments, percentile, portal_from_args, serve
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+import gsb_cikis  # noqa: E402
+import gsb_layout  # noqa: E402
+import gsb_login_runtime_template as runtime  # noqa: E402
+from gsb_config import write_settings  # noqa: E402
+from gsb_metrics import LOGIN_OUTCOMES, LOGOUT_OUTCOMES, RETRIES  # noqa: E402
+from gsb_wifi import SSIDCache, StaticProvider  # noqa: E402
+
+PROFILE_NAME = "sim"
+FLOWS = {"login": ("login",), "logout": ("logout",), "both": ("login", "logout")}
+
+# (akış, sonuç, süre s, başlangıç s)
+Record = Tuple[str, str, float, float]
+
+
+def configure(base_url: str, backend: str, settings: Dict[str, Any], root: Path) -> None:
+    """Geçici GSB_Dosyalar'ı hazırla ve iki modülün ayarlarını gerçek yoldan yükle."""
+    layout = gsb_layout.pin_layout(root)
+    cfg_dir = Path(layout["cfg_dir"])
+    profile = {
+        "name": PROFILE_NAME,
+        "portal_url": base_url,
+        "login_page_url": base_url + "/login.html",
+        "logout_url": base_url + "/logout",
+    }
+    portals = cfg_dir / "portals"
+    portals.mkdir(parents=True, exist_ok=True)
+    (portals / f"{PROFILE_NAME}.json").write_text(json.dumps(profile), encoding="utf-8")
+    write_settings(cfg_dir, dict(settings, portal_profile=PROFILE_NAME, http_backend=backend))
+    # Simülatör GSB ağındaymışız gibi: SSID yoklaması (iw/nmcli) yapılmaz.
+    runtime.WIFI = SSIDCache(StaticProvider(runtime.DEFAULT_PORTAL.ssid_hints[0]))
+    runtime.load_settings()
+    gsb_cikis.load_settings()
+
+
+def run_flow(kind: str, account_id: int) -> str:
+    """Bir akışı çalıştır; sonuç etiketi metrik sayacından okunur."""
+    counter = LOGIN_OUTCOMES if kind == "login" else LOGOUT_OUTCOMES
+    counter.snapshot(drain=True)
+    try:
+        if kind == "login":
+            creds = {"username": f"yuk{account_id}", "password": "sifre"}
+            runtime.perform_login(runtime.build_session(), creds, account_id=account_id)
+        else:
+            gsb_cikis.do_logout()
+    except Exception:  # noqa: BLE001
+        pass
+    outcomes = [dict(key).get("outcome", "other") for key in counter.snapshot(drain=True)]
+    return outcomes[0] if outcomes else "other"
+
+
+def client(index: int, start_at: float, args: argparse.Namespace, root: Path, results: Any) -> None:
+    # Her makinenin kendi GSB_Dosyalar'ı (sessions.json vb.) olsun.
+    gsb_layout.pin_layout(root / f"c{index}")
+    rng = random.Random(index)
+    records: List[Record] = []
+    begin = start_at + (index * args.ramp / args.clients if args.clients else 0.0)
+    time.sleep(max(0.0, begin - time.time()))
+    while True:
+        for kind in FLOWS[args.flow]:
+            t0 = time.time()
+            p0 = time.perf_counter()
+            outcome = run_flow(kind, index + 1)
+            records.append((kind, outcome, time.perf_counter() - p0, t0 - start_at))
+        if args.duration <= 0 or time.time() >= start_at + args.duration:
+            break
+        if args.think > 0:
+            time.sleep(rng.expovariate(1.0 / args.think))
+    retries = {dict(key).get("kind", ""): value for key, value in RETRIES.snapshot().items()}
+    results.put({"records": records, "retries": retries})
+
+
+def calibrate(portal: Portal, flow: str) -> Dict[str, int]:
+    """Arızasız portalda akış başına istek sayısı."""
+    portal.faults = False
+    ideal: Dict[str, int] = {}
+    for kind in FLOWS[flow] if flow != "logout" else ("login", "logout"):
+        portal.reset()
+        outcome = run_flow(kind, 0)
+        if outcome != "success":
+            raise SystemExit(f"kalibrasyon başarısız: {kind} -> {outcome}")
+        ideal[kind] = portal.snapshot()["requests"]
+    RETRIES.snapshot(drain=True)
+    portal.faults = True
+    return ideal
+
+
+def summarize(
+    args: argparse.Namespace, ideal: Dict[str, int], outputs: List[Dict[str, Any]], portal: Dict[str, Any], wall: float
+) -> Dict[str, Any]:
+    flows: Dict[str, Any] = {}
+    for kind in FLOWS[args.flow]:
+        rows = [r for out in outputs for r in out["records"] if r[0] == kind]
+        ok = [r[2] for r in rows if r[1] == "success"]
+        outcomes: Dict[str, int] = {}
+        for r in rows:
+            outcomes[r[1]] = outcomes.get(r[1], 0) + 1
+        seconds = [r[2] for r in rows]
+        flows[kind] = {
+            "runs": len(rows),
+            "success": len(ok),
+            "throughput": len(ok) / wall if wall > 0 else 0.0,
+            "p50": percentile(seconds, 50),
+            "p90": percentile(seconds, 90),
+            "p99": percentile(seconds, 99),
+            "max": max(seconds, default=0.0),
+            "success_p99": percentile(ok, 99),
+            "outcomes": outcomes,
+        }
+    expected = sum(flows[k]["runs"] * ideal.get(k, 0) for k in flows)
+    retries: Dict[str, float] = {}
+    for out in outputs:
+        for kind, value in out["retries"].items():
+            retries[kind] = retries.get(kind, 0.0) + value
+    return {
+        "clients": args.clients,
+        "backend": args.backend,
+        "wall_seconds": wall,
+        "finished_clients": len(outputs),
+        "flows": flows,
+        "ideal_requests": ideal,
+        "amplification": portal["requests"] / expected if expected else 0.0,
+        "client_retries": retries,
+        "portal": portal,
+    }
+
+
+def print_report(report: Dict[str, Any], args: argparse.Namespace) -> None:
+    print(
+        f"istemci={report['clients']} ({report['backend']}, biten {report['finished_clients']})  "
+        f"süre={report['wall_seconds']:.1f} s  portal: kapasite={args.capacity} servis={args.service_ms:.0f} ms "
+        f"kuyruk={args.queue} hata={args.fail_rate:.2f} düşen={args.drop_rate:.2f} kesinti={args.outage:.0f} s"
+    )
+    print(f"{'akış':7s} {'adet':>5s} {'başarılı':>8s} {'akış/s':>7s} {'p50':>7s} {'p90':>7s} {'p99':>7s} {'max':>7s}  sonuçlar")
+    for kind, f in report["flows"].items():
+        outcomes = " ".join(f"{k}={v}" for k, v in sorted(f["outcomes"].items()))
+        print(
+            f"{kind:7s} {f['runs']:5d} {f['success']:8d} {f['throughput']:7.2f} "
+            f"{f['p50']:7.2f} {f['p90']:7.2f} {f['p99']:7.2f} {f['max']:7.2f}  {outcomes}"
+        )
+    p = report["portal"]
+    statuses = " ".join(f"{k}={v}" for k, v in sorted(p["statuses"].items()))
+    print(
+        f"portal: {p['requests']} istek, ortalama {p['rate']:.1f}/s, tepe {p['peak_rate']}/s; {statuses}; "
+        f"en uzun sıra {p['max_waiting']}, sıra bekleme p50={p['queue_wait_p50'] * 1000:.0f} ms "
+        f"p99={p['queue_wait_p99'] * 1000:.0f} ms"
+    )
+    ideal = " ".join(f"{k}={v}" for k, v in report["ideal_requests"].items())
+    retries = " ".join(f"{k}={v:.0f}" for k, v in sorted(report["client_retries"].items())) or "yok"
+    print(f"retry çarpanı: x{report['amplification']:.2f} (hatasız akış: {ideal} istek); istemci retry'ları: {retries}")
+    print("saniyelik istek: " + " ".join(str(n) for n in p["per_second"][:120]))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clients", type=int, default=100)
+    ap.add_argument("--flow", choices=sorted(FLOWS), default="both")
+    ap.add_argument("--duration", type=float, default=0.0, help="soak süresi (s); 0 = her istemci bir tur")
+    ap.add_argument("--think", type=float, default=5.0, help="soak'ta turlar arası ortalama bekleme (s)")
+    ap.add_argument("--ramp", type=float, default=0.0, help="istemcilerin başlangıcı bu süreye yayılır (s)")
+    ap.add_argument("--backend", choices=("requests", "lite"), default="requests")
+    ap.add_argument("--settings", type=Path, default=None, help="settings.json biçiminde ayar dosyası")
+    ap.add_argument("--json", type=Path, default=None, help="raporu JSON olarak da yaz")
+    add_arguments(ap)
+    args = ap.parse_args()
+    if sys.platform != "linux":
+        raise SystemExit("loadtest Linux'ta fork ile çalışır.")
+
+    settings = json.loads(args.settings.read_text(encoding="utf-8")) if args.settings else {}
+    portal = portal_from_args(args)
+    server = serve(portal)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    with tempfile.TemporaryDirectory(prefix="gsb_load_") as tmp:
+        root = Path(tmp)
+        configure(base_url, args.backend, settings, root)
+        ideal = calibrate(portal, args.flow)
+
+        ctx = multiprocessing.get_context("fork")
+        results = ctx.Queue()
+        start_at = time.time() + 1.0
+        procs = [ctx.Process(target=client, args=(i, start_at, args, root, results)) for i in range(args.clients)]
+        for proc in procs:
+            proc.start()
+        time.sleep(max(0.0, start_at - time.time()))
+        portal.reset()
+        portal.start_outage(args.outage)
+
+        outputs: List[Dict[str, Any]] = []
+        deadline = start_at + max(args.duration, 0.0) + args.ramp + 600.0
+        while len(outputs) < len(procs) and time.time() < deadline:
+            try:
+                outputs.append(results.get(timeout=1.0))
+            except queue.Empty:
+                if not any(proc.is_alive() for proc in procs) and results.empty():
+                    break
+        wall = time.time() - start_at
+        snapshot = portal.snapshot()
+        for proc in procs:
+            proc.join(timeout=5.0)
+            if proc.is_alive():
+                proc.terminate()
+    server.shutdown()
+
+    report = summarize(args, ideal, outputs, snapshot, wall)
+    print_report(report, args)
+    if args.json:
+        args.json.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""Yerel GSB portal simülatörü (yük testi için).
+
+Kullanım:
+    python tools/portal_sim.py --port 8080 --capacity 8 --service-ms 40 --fail-rate 0.05
+
+Portalın giriş/kota/çıkış akışını taklit eder: /login.html (form),
+/j_spring_security_check (çerezle oturum açar), / ve /index.html (oturum
+varsa kota tablosu, yoksa login'e yönlendirme) ve /logout.
+
+Sunucu tarafı bir kuyruk modeli uygular: aynı anda en çok --capacity istek
+işlenir, en çok --queue istek sıra bekler; sıra doluysa 503 döner. Her
+isteğin servis süresi ortalaması --service-ms olan üstel dağılımdan çekilir.
+--fail-rate oranında 500, --drop-rate oranında yanıtsız kapanan bağlantı
+üretilir; --outage saniye boyunca (kampüs kesintisi sonrası) her istek 503
+alır. Uzun süreli testte durum /stats'ten JSON olarak okunabilir.
+"""
+import argparse
+import json
+import math
+import random
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+LOGIN_PAGE = """<html><head><meta charset="utf-8"><title>GSB WiFi</title></head><body>
+<form method="post" action="/j_spring_security_check">
+<input type="hidden" name="csrf" value="{csrf}">
+<input name="j_username"><input type="password" name="j_password">
+<button name="submit" value="Login">Giriş</button>
+</form>{error}</body></html>"""
+
+QUOTA_PAGE = """<html><head><meta charset="utf-8"><title>GSB WiFi</title></head><body><table>
+<tr><td>Toplam Kalan Kota (MB):</td><td>{remaining}</td></tr>
+<tr><td>Toplam Kota (MB):</td><td>{total}</td></tr>
+<tr><td>Login Zamanı:</td><td>{login_at}</td></tr>
+<tr><td>Sona Erme Tarihi:</td><td>{expires_at}</td></tr>
+</table><a href="/logout">Güvenli Çıkış</a></body></html>"""
+
+DATETIME_FORMAT = "%d.%m.%Y %H:%M:%S"
+SESSION_HOURS = 8
+
+
+def percentile(values: List[float], q: float) -> float:
+    """En yakın sıra yöntemiyle yüzdelik (q: 0-100); liste sıralı olmak zorunda değil."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100.0 * len(ordered)) - 1))]
+
+
+class Portal:
+    """Kuyruk modeli + oturum durumu. İstatistikler reset() ile sıfırlanır."""
+
+    def __init__(
+        self,
+        service_ms: float = 40.0,
+        capacity: int = 8,
+        queue: int = 64,
+        fail_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        outage: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.service_ms = service_ms
+        self.capacity = capacity
+        self.queue = queue
+        self.fail_rate = fail_rate
+        self.drop_rate = drop_rate
+        # Kalibrasyon için arıza/kesinti geçici olarak kapatılabilir.
+        self.faults = True
+        self._rng = random.Random(seed)
+        self._slots = threading.Semaphore(capacity)
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, float] = {}
+        self._outage_until = time.time() + outage
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.time()
+            self.waiting = 0
+            self.max_waiting = 0
+            self.statuses: Dict[str, int] = {}
+            self.per_second: Dict[int, int] = {}
+            self.paths: Dict[str, int] = {}
+            self.queue_waits: List[float] = []
+
+    def start_outage(self, seconds: float) -> None:
+        self._outage_until = time.time() + seconds
+
+    def _count(self, status: str) -> None:
+        with self._lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def _random(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def handle(self, method: str, path: str, cookie: str, body: bytes) -> Optional[Tuple[int, Dict[str, str], str]]:
+        """(durum, başlıklar, gövde); None = bağlantıyı yanıtsız kapat."""
+        now = time.time()
+        route = path.split("?", 1)[0]
+        if route == "/stats":
+            return 200, {"Content-Type": "application/json"}, json.dumps(self.snapshot())
+        with self._lock:
+            second = int(now - self.started)
+            self.per_second[second] = self.per_second.get(second, 0) + 1
+            self.paths[route] = self.paths.get(route, 0) + 1
+
+        if self.faults and now < self._outage_until:
+            self._count("503_outage")
+            return 503, {"Retry-After": "1"}, "outage"
+
+        with self._lock:
+            if self.waiting >= self.queue:
+                self.statuses["503_queue"] = self.statuses.get("503_queue", 0) + 1
+                return 503, {}, "busy"
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+        t0 = time.perf_counter()
+        self._slots.acquire()
+        try:
+            with self._lock:
+                self.waiting -= 1
+                self.queue_waits.append(time.perf_counter() - t0)
+                mean = self.service_ms / 1000.0
+                service = self._rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+            time.sleep(service)
+            if self.faults:
+                roll = self._random()
+                if roll < self.drop_rate:
+                    self._count("dropped")
+                    return None
+                if roll < self.drop_rate + self.fail_rate:
+                    self._count("500")
+                    return 500, {}, "error"
+            status, headers, text = self._route(method, route, cookie, body)
+        finally:
+            self._slots.release()
+        self._count(str(status))
+        return status, headers, text
+
+    def _route(self, method: str, route: str, cookie: str, body: bytes) -> Tuple[int, Dict[str, str], str]:
+        sid = ""
+        for part in cookie.split(";"):
+            key, _, value = part.strip().partition("=")
+            if key == "SID":
+                sid = value
+        with self._lock:
+            logged_in = sid in self._sessions
+
+        if route == "/login.html":
+            return 200, {"Content-Type": "text/html; charset=utf-8"}, LOGIN_PAGE.format(
+                csrf=secrets.token_hex(8), error=""
+            )
+        if route == "/j_spring_security_check" and method == "POST":
+            form = parse_qs(body.decode("utf-8", "replace"))
+            if not form.get("j_username") or not form.get("j_password"):
+                page = LOGIN_PAGE.format(csrf=secrets.token_hex(8), error="<p class='error'>Şifre hatalı.</p>")
+                return 200, {"Content-Type": "text/html; charset=utf-8"}, page
+            sid = secrets.token_hex(16)
+            with self._lock:
+                self._sessions[sid] = time.time()
+            return 302, {"Location": "/index.html", "Set-Cookie": f"SID={sid}; Path=/"}, ""
+        if route in ("/", "/index.html"):
+            if not logged_in:
+                return 302, {"Location": "/login.html"}, ""
+            login_at = datetime.now()
+            page = QUOTA_PAGE.format(
+                remaining=12345,
+                total=40960,
+                login_at=login_at.strftime(DATETIME_FORMAT),
+                expires_at=(login_at + timedelta(hours=SESSION_HOURS)).strftime(DATETIME_FORMAT),
+            )
+            return 200, {"Content-Type": "text/html; charset=utf-8"}, page
+        if route == "/logout":
+            with self._lock:
+                self._sessions.pop(sid, None)
+            return 302, {"Location": "/login.html?logout=1", "Set-Cookie": "SID=; Path=/; Max-Age=0"}, ""
+        return 404, {}, "not found"
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            elapsed = max(1e-9, time.time() - self.started)
+            total = sum(self.per_second.values())
+            return {
+                "elapsed": elapsed,
+                "requests": total,
+                "rate": total / elapsed,
+                "peak_rate": max(self.per_second.values(), default=0),
+                "per_second": [self.per_second.get(i, 0) for i in range(int(elapsed) + 1)],
+                "statuses": dict(self.statuses),
+                "paths": dict(self.paths),
+                "max_waiting": self.max_waiting,
+                "queue_wait_p50": percentile(self.queue_waits, 50),
+                "queue_wait_p99": percentile(self.queue_waits, 99),
+            }
+
+
+def make_handler(portal: Portal) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _serve(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            result = portal.handle(self.command, self.path, self.headers.get("Cookie", ""), body)
+            if result is None:
+                self.close_connection = True
+                return
+            status, headers, text = result
+            data = text.encode("utf-8")
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = _serve  # noqa: N815
+        do_POST = _serve  # noqa: N815
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            return
+
+    return Handler
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Kesinti sonrası eşzamanlı bağlantı fırtınası listen kuyruğuna sığsın.
+    request_queue_size = 1024
+
+
+def serve(portal: Portal, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Simülatörü arka plan thread'inde başlat; adres server.server_address."""
+    server = _Server((host, port), make_handler(portal))
+    threading.Thread(target=server.serve_forever, name="portal-sim", daemon=True).start()
+    return server
+
+
+def add_arguments(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--service-ms", type=float, default=40.0, help="ortalama servis süresi (ms)")
+    ap.add_argument("--capacity", type=int, default=8, help="aynı anda işlenen istek sayısı")
+    ap.add_argument("--queue", type=int, default=64, help="sırada bekleyebilecek istek sayısı")
+    ap.add_argument("--fail-rate", type=float, default=0.0, help="500 dönen isteklerin oranı")
+    ap.add_argument("--drop-rate", type=float, default=0.0, help="yanıtsız kapanan bağlantıların oranı")
+    ap.add_argument("--outage", type=float, default=0.0, help="başlangıçta her şeye 503 dönülen süre (s)")
+    ap.add_argument("--seed", type=int, default=None)
+
+
+def portal_from_args(args: argparse.Namespace) -> Portal:
+    return Portal(
+        service_ms=args.service_ms,
+        capacity=args.capacity,
+        queue=args.queue,
+        fail_rate=args.fail_rate,
+        drop_rate=args.drop_rate,
+        outage=args.outage,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8080)
+    add_arguments(ap)
+    args = ap.parse_args()
+
+    server = serve(portal_from_args(args), args.host, args.port)
+    print(f"portal simülatörü: http://{args.host}:{server.server_address[1]}  (durum: /stats)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()